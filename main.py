@@ -1,14 +1,83 @@
-from src.wizard_logic import load_player_from_config, play_games, winner_list, winning_probabilities
+import time
 
-if __name__ == "__main__":
+# Measured before the heavy imports, so --timing also shows the startup cost
+_start_time = time.perf_counter()
+
+import argparse
+import sys
+
+from src.wizard_logic import (load_player_from_config, play_games, winning_probabilities, export_with_metadata,
+                              enable_profiling, disable_profiling, use_bid_table, number_of_rounds_to_be_played,
+                              DEFAULT_CONFIG_PATH, DEFAULT_CHUNK_SIZE)
+
+MODES = ("simulate", "adaptive", "compare", "sweep")
+
+DEFAULT_CHECKPOINT_PATH = "reports/checkpoint.json"
+
+
+def parse_arguments(argv=None):
     """
-    Entry point for the Wizard game simulation.
-    Handles user input, initializes players, and executes the simulation.
+    Reads the command line options.
+
+    Args:
+        argv (list[str], optional): The arguments, defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: The parsed options.
     """
+    parser = argparse.ArgumentParser(description="Wizard simulation: does aggressive play pay off?")
+    parser.add_argument("-n", "--players", type=int,
+                        help="Number of players (3-6). Asked for interactively if omitted on a terminal.")
+    parser.add_argument("-g", "--games", type=int, default=1000, help="Number of games to simulate.")
+    parser.add_argument("--seed", type=int,
+                        help="Root seed of the chunked, reproducible mode. Without it the games are "
+                             "played one after another on the default generator (seed 42).")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Number of worker processes.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Games per worker task.")
+    parser.add_argument("--config", default=DEFAULT_CONFIG_PATH, help="JSON file with the player profiles.")
+    parser.add_argument("-o", "--output", help="Path of the result CSV (default: a file in 'reports').")
+    parser.add_argument("--mode", choices=MODES, default="simulate",
+                        help="simulate: fixed number of games, adaptive: play until the win rate is "
+                             "precise enough, compare: paired comparison of the styles, sweep: all player "
+                             "counts and seats.")
+    parser.add_argument("--half-width", type=float, default=0.005,
+                        help="Wanted precision of the win rate in adaptive mode (0.005 = +/- 0.5 points).")
+    parser.add_argument("--max-games", type=int,
+                        help="Upper limit of games in adaptive mode (default: the limit of play_until_precision).")
+    parser.add_argument("--engine", choices=("scalar", "batch"), default="scalar",
+                        help="batch plays the games in lockstep with NumPy (simulate mode only).")
+    parser.add_argument("--shard", help="i/k: play only shard i (counted from 0) of k and write its partial "
+                                        "result (merge with python -m src.shards merge).")
+    parser.add_argument("--cache", action="store_true",
+                        help="Reuse cached results of earlier runs with the same configuration and seed.")
+    parser.add_argument("--stats", action="store_true",
+                        help="Also export points, bid accuracy per round and over-/underbidding per player "
+                             "(reports/simulation_statistics_*.csv, scalar engine without --cache).")
+    parser.add_argument("--checkpoint", nargs="?", const=DEFAULT_CHECKPOINT_PATH,
+                        help=f"Save the progress to this file from time to time (default {DEFAULT_CHECKPOINT_PATH}, "
+                             "simulate mode with the scalar engine).")
+    parser.add_argument("--checkpoint-games", type=int, help="Save a checkpoint at least every N games.")
+    parser.add_argument("--checkpoint-seconds", type=float, default=60,
+                        help="Save a checkpoint at least every N seconds (default 60).")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue the run from its checkpoint (implies --checkpoint).")
+    parser.add_argument("--bid-table", help="Folder of a precomputed bid table (python -m src.bid_table build).")
+    parser.add_argument("--profile", action="store_true", help="Print the time spent per phase.")
+    parser.add_argument("--timing", action="store_true", help="Print the startup and run time.")
+    return parser.parse_args(argv)
 
-    # Load all available player profiles from the JSON configuration
-    full_playerlist = load_player_from_config()
 
+def root_seed(args):
+    """
+    The seed of the chunked modes, the config default 42 if none was given.
+    """
+    return 42 if args.seed is None else args.seed
+
+
+def ask_number_of_players():
+    """
+    Asks for the number of players on the console, falls back to 3 on invalid input.
+    """
     try:
         #Request user input for the number of participants
         n = int(input("How many players should participate? (3-6) ?: "))
@@ -21,23 +90,162 @@ if __name__ == "__main__":
         # Fallback if the user enters text instead of a number
         print("Input was not a number. Continue with 3 players.")
         n = 3
+    return n
+
+
+def run_simulation(args, playerlist):
+    """
+    Plays a fixed number of games and exports the win rates.
+    """
+    if args.shard:
+        from src.shards import play_shard, parse_shard
 
-    print(f"Wizard simulation is starting with {n} players.")
-    print("Testo_Torsten is playing aggressive")
+        path = play_shard(args.games, playerlist, parse_shard(args.shard), seed=root_seed(args),
+                          workers=args.workers, chunk_size=args.chunk_size, path=args.output)
+        return f"Partial result of shard {args.shard} written to {path}"
+    if args.engine == "batch":
+        from src.batch_engine import play_games_batch
+        from src.result_sink import CountingSink
+
+        results = play_games_batch(args.games, playerlist, seed=root_seed(args), sink=CountingSink(len(playerlist)))
+    elif args.checkpoint:
+        from src.checkpoint import play_games_checkpointed
+
+        results = play_games_checkpointed(args.games, playerlist, args.checkpoint, workers=args.workers,
+                                          seed=args.seed, chunk_size=args.chunk_size,
+                                          every_games=args.checkpoint_games, every_seconds=args.checkpoint_seconds,
+                                          resume=args.resume)
+    elif args.cache:
+        from src.result_cache import ResultCache
+
+        results = ResultCache().play_games(args.games, playerlist, seed=root_seed(args),
+                                           workers=args.workers, chunk_size=args.chunk_size)
+    elif args.stats:
+        from src.game_statistics import GameStatistics
+        from src.result_sink import CountingSink, MultiSink
+
+        statistics = GameStatistics([player.name for player in playerlist],
+                                    number_of_rounds_to_be_played(len(playerlist)))
+        results = CountingSink(len(playerlist))
+        play_games(args.games, playerlist, workers=args.workers, seed=args.seed, chunk_size=args.chunk_size,
+                   sink=MultiSink(results, statistics))
+        statistics.export(seed=root_seed(args))
+    else:
+        results = play_games(args.games, playerlist, workers=args.workers, seed=args.seed,
+                             chunk_size=args.chunk_size)
+
+    # Calculate statistics based on the win counts collected during play_games
+    return winning_probabilities(results, args.games, playerlist, seed=root_seed(args),
+                                 path=args.output)
+
+
+def run_adaptive(args, playerlist):
+    """
+    Plays until the win rates are known to +/- half_width.
+    """
+    from src.adaptive import play_until_precision, precision_report
+
+    seed = root_seed(args)
+    limit = {} if args.max_games is None else {"max_games": args.max_games}
+    result = play_until_precision(playerlist, half_width=args.half_width, seed=seed, workers=args.workers,
+                                  chunk_size=args.chunk_size, **limit)
+    status = "reached" if result["reached"] else "not reached"
+    print(f"Precision {status} after {result['games']} games ({result['seconds']:.1f} s).")
+    report = precision_report(result)
+    export_with_metadata(report, "adaptive_simulation", seed=seed, path=args.output)
+    return report
+
+
+def run_comparison(args, playerlist):
+    """
+    Compares aggressive with normal play on the same deals.
+    """
+    from src.comparison import compare_styles, comparison_report
+
+    seed = root_seed(args)
+    result = compare_styles(args.games, playerlist, seed=seed, workers=args.workers, chunk_size=args.chunk_size)
+    print(f"Focal player: {result['focal_player']}")
+    report = comparison_report(result)
+    export_with_metadata(report, "style_comparison", seed=seed, path=args.output)
+    return report
+
+
+def run_sweep_mode(args, full_playerlist):
+    """
+    Plays every player count and seat of the aggressive player.
+    """
+    from src.sweep import sweep_cells, run_sweep
+
+    cells = sweep_cells(game_counts=(args.games,))
+    return run_sweep(cells, seed=root_seed(args), workers=args.workers,
+                     chunk_size=args.chunk_size, full_playerlist=full_playerlist, path=args.output)
+
+
+def main(argv=None):
+    """
+    Entry point for the Wizard game simulation.
+    Reads the options, initializes players, and executes the simulation.
+    """
+    args = parse_arguments(argv)
+    if args.stats and (args.engine == "batch" or args.cache or args.mode != "simulate"):
+        print("--stats needs --mode simulate with the scalar engine and without --cache.")
+        return 2
+    if args.resume and not args.checkpoint:
+        args.checkpoint = DEFAULT_CHECKPOINT_PATH
+    if args.checkpoint and (args.engine == "batch" or args.cache or args.stats or args.shard
+                            or args.mode != "simulate"):
+        print("--checkpoint needs --mode simulate with the scalar engine and without --cache, --stats or --shard.")
+        return 2
+    startup_seconds = time.perf_counter() - _start_time
+
+    # Load all available player profiles from the JSON configuration
+    full_playerlist = load_player_from_config(args.config)
+
+    n = args.players
+    if n is None:
+        n = ask_number_of_players() if sys.stdin.isatty() else 3
+    elif not (3 <= n <= 6):
+        print("Invalid number of players. Continue with 3 players.")
+        n = 3
 
     # Select the first n players from the loaded config list.
     playerlist = full_playerlist[:n]
+    aggressive_players = [player.name for player in playerlist if player.playing_style == "aggressive"]
+
+    print(f"Wizard simulation is starting with {n} players ({args.mode}).")
+    if aggressive_players:
+        print(f"{', '.join(aggressive_players)} {'is' if len(aggressive_players) == 1 else 'are'} playing aggressive")
 
-    #Set the scale of the simulation
-    number_of_games = 1000
+    if args.bid_table:
+        use_bid_table(args.bid_table)
+    profiler = enable_profiling() if args.profile else None
+    run_start = time.perf_counter()
 
-    # Start the simulation loop
-    play_games(number_of_games, playerlist)
+    if args.mode == "adaptive":
+        stats = run_adaptive(args, playerlist)
+    elif args.mode == "compare":
+        stats = run_comparison(args, playerlist)
+    elif args.mode == "sweep":
+        stats = run_sweep_mode(args, full_playerlist)
+    else:
+        stats = run_simulation(args, playerlist)
 
-    # Calculate statistics based on the winner_list populated during play_games
-    stats = winning_probabilities(winner_list, number_of_games, playerlist)
+    run_seconds = time.perf_counter() - run_start
+    if profiler is not None:
+        disable_profiling()
 
     # Final output of results
     print("\n Simulation is done.")
     print(100*"-")
-    print(stats)
\ No newline at end of file
+    print(stats)
+
+    if profiler is not None:
+        print(100*"-")
+        print(profiler.summary_table())
+    if args.timing:
+        print(f"Startup: {startup_seconds * 1000:.0f} ms, simulation: {run_seconds:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
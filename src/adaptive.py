@@ -0,0 +1,129 @@
+import math
+import time
+from statistics import NormalDist
+
+from src.result_sink import CountingSink
+from src.wizard_logic import play_games, DEFAULT_CHUNK_SIZE
+
+
+def wilson_interval(wins, games, z):
+    """
+    Wilson score interval for a win rate.
+
+    Args:
+        wins (int): Number of games won.
+        games (int): Number of games played.
+        z (float): Normal quantile of the wanted confidence.
+
+    Returns:
+        tuple[float, float]: Lower and upper bound of the win rate.
+    """
+    if games == 0:
+        return 0.0, 1.0
+    p = wins / games
+    denominator = 1 + z * z / games
+    center = (p + z * z / (2 * games)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / games + z * z / (4 * games * games)) / denominator
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+def sequential_z(confidence, look):
+    """
+    Normal quantile for the k-th look at the data.
+
+    The error probability 1 - confidence is spent over the looks as
+    alpha * 6 / (pi^2 * k^2), which sums up to alpha. The intervals therefore hold
+    simultaneously for every look, and stopping as soon as one is narrow enough
+    keeps the promised confidence.
+
+    Args:
+        confidence (float): Overall confidence, e.g. 0.95.
+        look (int): The number of the look, starting with 1.
+    """
+    alpha = (1 - confidence) * 6 / (math.pi ** 2 * look ** 2)
+    return NormalDist().inv_cdf(1 - alpha / 2)
+
+
+def play_until_precision(playerlist, half_width=0.005, confidence=0.95, tracked_players=None,
+                         batch_size=1000, max_games=10_000_000, seed=42, workers=1,
+                         chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Plays games in batches until the win rate of every tracked player is known to
+    +/- half_width with the given confidence.
+
+    Args:
+        playerlist (list): The list of players participating in the simulation.
+        half_width (float): Wanted precision of the win rate, 0.005 = +/- 0.5 percentage points.
+        confidence (float): Wanted confidence of the intervals.
+        tracked_players (list[str], optional): Names of the players whose win rate must
+            reach the precision. Defaults to the aggressive players (or all players).
+        batch_size (int): Number of games played between two looks at the intervals.
+        max_games (int): Upper limit of games, the run stops there even if the
+            precision is not reached.
+        seed (int): Root seed, batch k plays on the stream (seed, k).
+        workers (int): Number of worker processes per batch.
+        chunk_size (int): Number of games per worker chunk.
+
+    Returns:
+        dict: Games played, wall time, whether the target was reached and per tracked
+        player the win rate with its interval.
+
+    Raises:
+        ValueError: If max_games or batch_size is smaller than 1.
+    """
+    if max_games < 1 or batch_size < 1:
+        raise ValueError(f"max_games and batch_size must be at least 1, got {max_games} and {batch_size}")
+    names = [player.name for player in playerlist]
+    if tracked_players is None:
+        tracked_players = [player.name for player in playerlist if player.playing_style == "aggressive"] or names
+    tracked_seats = [names.index(name) for name in tracked_players]
+
+    sink = CountingSink(len(playerlist))
+    start_time = time.perf_counter()
+    look = 0
+    reached = False
+
+    while sink.games < max_games:
+        look += 1
+        games = min(batch_size, max_games - sink.games)
+        play_games(games, playerlist, workers=workers, seed=[seed, look], chunk_size=chunk_size, sink=sink)
+
+        z = sequential_z(confidence, look)
+        intervals = {seat: wilson_interval(sink.wins[seat], sink.games, z) for seat in tracked_seats}
+        if all((upper - lower) / 2 <= half_width for lower, upper in intervals.values()):
+            reached = True
+            break
+
+    return {
+        "games": sink.games,
+        "seconds": time.perf_counter() - start_time,
+        "confidence": confidence,
+        "half_width": half_width,
+        "reached": reached,
+        "players": {
+            names[seat]: {
+                "win_rate": sink.wins[seat] / sink.games,
+                "lower": lower,
+                "upper": upper,
+            }
+            for seat, (lower, upper) in intervals.items()
+        },
+        "results": sink,
+    }
+
+
+def precision_report(result):
+    """
+    Formats the result of play_until_precision as a table for the console.
+
+    Args:
+        result (dict): The dictionary returned by play_until_precision.
+
+    Returns:
+        pd.DataFrame: Win rate and interval bounds in percent per tracked player.
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(result["players"]).T[["win_rate", "lower", "upper"]] * 100
+    df.index.name = "player"
+    return df.round(2)
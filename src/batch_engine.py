@@ -0,0 +1,407 @@
+import math
+import numpy as np
+
+from src.deck import colors, NO_SUIT, WIZARD, JESTER, DECK, DECK_SIZE, CARD_SUIT, CARD_VALUE, BEATS_MASKS
+
+
+# Number of games that are simulated together in one set of arrays
+DEFAULT_BATCH_SIZE = 10_000
+
+SUIT = np.array(CARD_SUIT, dtype=np.int8)
+VALUE = np.array(CARD_VALUE, dtype=np.int8)
+
+# Priority tiers of choose_smart_card_batch. NumPy scalars keep the keys in int16,
+# a Python int times a bool array would silently widen them to int64.
+_TIER = [np.int16(16 * tier) for tier in range(5)]
+
+
+def play_games_batch(number_of_games, playerlist, seed=42, batch_size=DEFAULT_BATCH_SIZE, sink=None):
+    """
+    Simulates many complete Wizard games in lockstep with NumPy arrays.
+
+    Every phase (dealing, trump choice, bidding, legal moves, card choice and trick
+    resolution) runs for a whole batch of games at once. The rules and the "normal" /
+    "aggressive" policies mirror the scalar engine in wizard_logic.py, which stays the
+    reference; the random streams differ, so both engines agree in distribution only.
+
+    Args:
+        number_of_games (int): How many full games should be simulated.
+        playerlist (list): The list of players participating in the simulation.
+        seed (int): Seed for the random number generator.
+        batch_size (int): Number of games simulated together.
+        sink (ResultSink, optional): Receives the results batch by batch.
+
+    Returns:
+        np.ndarray or ResultSink: The total points of every game as a (games, players)
+        array, or the sink if one was given (memory then stays constant).
+
+    Raises:
+        ValueError: If a player has another style (e.g. "monte_carlo") or own bidding parameters.
+    """
+    if any(player.playing_style not in ("normal", "aggressive") or player.parameters is not None
+           for player in playerlist):
+        raise ValueError("The batch engine only plays the normal and aggressive styles with their default parameters")
+    rng = np.random.default_rng(seed)
+    aggressive = np.array([player.playing_style == "aggressive" for player in playerlist])
+
+    if sink is not None:
+        for start in range(0, number_of_games, batch_size):
+            sink.add_games(_play_batch(min(batch_size, number_of_games - start), aggressive, rng))
+        return sink
+
+    total_points = np.empty((number_of_games, len(playerlist)), dtype=np.int32)
+    for start in range(0, number_of_games, batch_size):
+        stop = min(start + batch_size, number_of_games)
+        total_points[start:stop] = _play_batch(stop - start, aggressive, rng)
+    return total_points
+
+
+def _play_batch(number_of_games, aggressive, rng):
+    """
+    Plays all rounds of a batch of games.
+
+    Args:
+        number_of_games (int): Number of games in the batch.
+        aggressive (np.ndarray): Per seat, True if the player plays aggressive.
+        rng (np.random.Generator): The random number generator.
+
+    Returns:
+        np.ndarray: The (games, players) total points.
+    """
+    number_of_players = len(aggressive)
+    number_of_rounds = DECK_SIZE // number_of_players
+    total_points = np.zeros((number_of_games, number_of_players), dtype=np.int32)
+
+    for current_round in range(1, number_of_rounds + 1):
+        decks = shuffle_cards_batch(number_of_games, rng)
+        total_points += play_round_batch(decks, current_round, aggressive, rng)
+
+    return total_points
+
+
+def shuffle_cards_batch(number_of_games, rng):
+    """
+    Shuffles one copy of the static deck per game.
+
+    Returns:
+        np.ndarray: A (games, 60) array of card ids.
+    """
+    return rng.permuted(np.broadcast_to(DECK, (number_of_games, DECK_SIZE)), axis=1)
+
+
+def distribute_cards_batch(decks, number_of_cards, number_of_players):
+    """
+    Deals the cards one by one to every player, like distribute_cards.
+
+    Args:
+        decks (np.ndarray): The (games, 60) shuffled decks.
+        number_of_cards (int): How many cards each player receives.
+        number_of_players (int): The number of players.
+
+    Returns:
+        tuple: The (games, players, cards) hands in dealing order and the
+        (games,) trump cards (-1 if the deck is empty).
+    """
+    dealt = number_of_cards * number_of_players
+    hands = decks[:, :dealt].reshape(len(decks), number_of_cards, number_of_players).transpose(0, 2, 1)
+    if dealt < DECK_SIZE:
+        trump_cards = decks[:, dealt]
+    else:
+        trump_cards = np.full(len(decks), -1, dtype=decks.dtype)
+    return np.ascontiguousarray(hands), trump_cards
+
+
+def choose_trump_batch(trump_cards, hands, current_round, aggressive, rng):
+    """
+    Determines the trump suit of every game, like choose_trump.
+
+    Returns:
+        np.ndarray: The (games,) trump suits, NO_SUIT if there is no trump.
+    """
+    number_of_games, number_of_players, _ = hands.shape
+    trump = np.full(number_of_games, NO_SUIT, dtype=np.int8)
+
+    has_card = trump_cards >= 0
+    trump[has_card] = SUIT[trump_cards[has_card]]
+
+    # Wizard case: the starting player chooses the trump suit
+    wizard = has_card & (VALUE[np.where(has_card, trump_cards, 0)] == WIZARD)
+    if wizard.any():
+        starting_player = ((current_round % number_of_players) - 1) % number_of_players
+        suits = SUIT[hands[wizard, starting_player]]
+        frequencies = np.stack([(suits == suit).sum(axis=1) for suit in range(len(colors))], axis=1)
+
+        if aggressive[starting_player]:
+            choice = np.argmax(frequencies, axis=1)
+        else:
+            choice = np.argmin(frequencies, axis=1)
+
+        # Fallback: only Wizards/Jesters in hand, pick a random color
+        no_color = frequencies.sum(axis=1) == 0
+        if no_color.any():
+            choice[no_color] = rng.integers(len(colors), size=int(no_color.sum()))
+
+        trump[wizard] = choice
+    return trump
+
+
+def evaluate_cards_batch(hands, trump, current_round, aggressive):
+    """
+    Estimates the bids of all players in all games, like evaluate_cards.
+
+    The win probability of a card only depends on the card, the trump suit, the round
+    and the player count, so it is looked up from a small (trump suit, card) table.
+
+    Returns:
+        np.ndarray: The (games, players) announced tricks.
+    """
+    number_of_games, number_of_players, number_of_cards = hands.shape
+    values = VALUE.astype(np.float64)
+    is_trump = SUIT[None, :] == np.arange(NO_SUIT + 1)[:, None]
+
+    trump_prob = (values / 13) * 0.8
+    if current_round < 5:
+        trump_prob += 0.1
+    trump_prob += np.where(values > 10, 0.15, 0.0)
+
+    normal_prob = (values / 13) * (0.75 ** (number_of_players - 1))
+    if current_round > 5:
+        normal_prob = np.where(values < 8, normal_prob * 0.5, normal_prob)
+
+    prob_table = np.select([values == WIZARD, values == JESTER, is_trump], [0.95, 0.05, trump_prob], normal_prob)
+    prob = prob_table[trump[:, None, None], hands]
+
+    # Add up card by card so the floating point sum matches the scalar engine
+    total_prob = np.zeros((number_of_games, number_of_players))
+    for k in range(number_of_cards):
+        total_prob += prob[:, :, k]
+
+    bids = np.where(aggressive[None, :], np.floor(total_prob + 0.7), np.round(total_prob)).astype(np.int16)
+    if current_round == 1:
+        bids = np.where(total_prob > 0.4, 1, bids)
+    return np.minimum(bids, number_of_cards)
+
+
+def permitted_cards_batch(hand_suits, available, operating_color):
+    """
+    Legal-move mask for the active player of every game, like permitted_cards_for_move.
+
+    Args:
+        hand_suits (np.ndarray): (cards, games) suits of the hand.
+        available (np.ndarray): (cards, games) True for cards not yet played.
+        operating_color (np.ndarray): (games,) led suit, NO_SUIT if none.
+
+    Returns:
+        np.ndarray: (cards, games) mask of the permitted cards.
+    """
+    follows = available & (hand_suits == operating_color)
+    must_follow = (operating_color != NO_SUIT) & follows.any(axis=0)
+    return available & (~must_follow | follows | (hand_suits == NO_SUIT))
+
+
+def _blend(mask, if_true, if_false):
+    """
+    Elementwise mask ? if_true : if_false with integer arithmetic,
+    which is much faster than np.where for small integer arrays.
+    """
+    return if_false + mask * (if_true - if_false)
+
+
+def choose_smart_card_batch(hand, hand_suits, hand_values, permitted, best_card, operating_color,
+                            trump, cards_in_trick, number_of_players, wants_trick, aggressive):
+    """
+    Picks the card to play in every game, like choose_smart_card.
+
+    Every branch of the scalar policy is "the first card with the highest / lowest value
+    inside the first non-empty group", so each card gets a priority key
+    tier * 16 + rank. The key is packed together with the card position, so a single
+    max over the hand picks the card (the first position wins a tie, like min/max on a list).
+
+    Args:
+        hand (np.ndarray): (cards, games) card ids of the active player.
+        hand_suits, hand_values (np.ndarray): (cards, games) suits and values of the hand.
+        permitted (np.ndarray): (cards, games) legal-move mask.
+        best_card (np.ndarray): (games,) card currently leading the trick.
+        operating_color (np.ndarray): (games,) led suit, NO_SUIT if none.
+        trump (np.ndarray): (games,) trump suit, NO_SUIT if none.
+        cards_in_trick (int): Number of cards already played in this trick.
+        number_of_players (int): The number of players.
+        wants_trick (np.ndarray): (games,) True if the player wants to win the trick.
+        aggressive (np.ndarray): (games,) True if the active player plays aggressive.
+
+    Returns:
+        np.ndarray: (cards, games) one-hot mask of the chosen card.
+    """
+    # 1. Categorize cards into those that can win the trick and those that cannot
+    if cards_in_trick == 0:
+        stronger = hand_values > JESTER
+    else:
+        beats = BEATS_MASKS[best_card, operating_color, trump]
+        stronger = ((beats >> hand.astype(np.uint64)) & np.uint64(1)).astype(bool)
+    is_trump = (hand_suits == trump) & (trump != NO_SUIT)
+    high_first = hand_values.astype(np.int16)
+    low_first = np.int16(15) - high_first
+
+    # 2a. Wants the trick: winning cards first (aggressive: highest, leading with a trump
+    #     if possible; normal: lowest), otherwise discard the lowest plain card
+    winner_key = _TIER[3] + _blend(aggressive, high_first, low_first)
+    if cards_in_trick == 0:
+        winner_key += _TIER[1] * (aggressive & is_trump)
+    plain = ~is_trump & (hand_suits != NO_SUIT)
+    wants_key = _blend(stronger, winner_key, _TIER[1] + _TIER[1] * plain + low_first)
+
+    # 2b. Does not want the trick: losing wizard, highest losing trump, highest losing
+    #     card; if every card wins, play low while opponents are left, else high
+    forced_rank = low_first if cards_in_trick < number_of_players - 1 else high_first
+    loser_key = _TIER[2] + _TIER[1] * is_trump + _TIER[2] * (hand_values == WIZARD) + high_first
+    dodge_key = _blend(stronger, _TIER[1] + forced_rank, loser_key)
+
+    # Pack key and position (lower position wins a tie), -1 for illegal cards
+    key = _blend(wants_trick, wants_key, dodge_key)
+    position_rank = (31 - np.arange(len(hand), dtype=np.int16))[:, None]
+    packed = _blend(permitted, key * np.int16(32) + position_rank, np.int16(-1))
+    return packed == packed.max(axis=0)
+
+
+def play_round_batch(decks, current_round, aggressive, rng):
+    """
+    Deals, bids and plays one round in every game of the batch.
+
+    The hands are kept card-major as (players, cards, games) arrays, so every step of
+    a trick works on contiguous rows of games.
+
+    Args:
+        decks (np.ndarray): (games, 60) shuffled decks.
+        current_round (int): The round number (= cards per player).
+        aggressive (np.ndarray): Per seat, True if the player plays aggressive.
+        rng (np.random.Generator): The random number generator.
+
+    Returns:
+        np.ndarray: The (games, players) points of the round.
+    """
+    number_of_games = len(decks)
+    number_of_players = len(aggressive)
+    seats = np.arange(number_of_players)
+
+    hands, trump_cards = distribute_cards_batch(decks, current_round, number_of_players)
+    trump = choose_trump_batch(trump_cards, hands, current_round, aggressive, rng)
+    bids = evaluate_cards_batch(hands, trump, current_round, aggressive).T
+    aggressive = aggressive.astype(np.int8)
+
+    hands = np.ascontiguousarray(hands.transpose(1, 2, 0))
+    hand_suits = SUIT[hands]
+    hand_values = VALUE[hands]
+    available = np.ones(hands.shape, dtype=bool)
+    made = np.zeros((number_of_players, number_of_games), dtype=np.int16)
+
+    # Calculate who starts the round.
+    leader = np.full(number_of_games, ((current_round % number_of_players) - 1) % number_of_players)
+
+    for trick in range(current_round):
+        operating_color = np.full(number_of_games, NO_SUIT, dtype=np.int8)
+        best_card = np.zeros(number_of_games, dtype=hands.dtype)
+        winner = leader
+
+        for i in range(number_of_players):
+            # One-hot mask of the active seat per game, used to gather its hand
+            active = (leader + i) % number_of_players == seats[:, None]
+            hand = (active[:, None, :] * hands).sum(axis=0, dtype=np.int8)
+            suits = (active[:, None, :] * hand_suits).sum(axis=0, dtype=np.int8)
+            values = (active[:, None, :] * hand_values).sum(axis=0, dtype=np.int8)
+            hand_available = (active[:, None, :] & available).any(axis=0)
+
+            permitted = permitted_cards_batch(suits, hand_available, operating_color)
+            wants_trick = (active * (made < bids)).any(axis=0)
+            active_aggressive = (active * aggressive[:, None]).any(axis=0)
+
+            chosen = choose_smart_card_batch(hand, suits, values, permitted, best_card, operating_color,
+                                             trump, i, number_of_players, wants_trick, active_aggressive)
+            played_card = (chosen * hand).sum(axis=0, dtype=np.int8)
+            available &= ~(active[:, None, :] & chosen)
+
+            # Set the led color if it hasn't been set yet, then check for a new leader
+            operating_color = _blend(operating_color == NO_SUIT, SUIT[played_card], operating_color)
+            if i == 0:
+                best_card = played_card
+            else:
+                beats = BEATS_MASKS[best_card, operating_color, trump]
+                takes_lead = ((beats >> played_card.astype(np.uint64)) & np.uint64(1)).astype(bool)
+                best_card = _blend(takes_lead, played_card, best_card)
+                winner = _blend(takes_lead, (leader + i) % number_of_players, winner)
+
+        made += winner == seats[:, None]
+        leader = winner
+
+    # Scoring logic: 20 base points + 10 per trick if correct, else -10 per difference
+    points = _blend(bids == made, 20 + 10 * made, -10 * np.abs(bids - made))
+    return points.T
+
+
+def winner_counts(total_points):
+    """
+    Counts the wins per seat, the first player wins a tie (like winner_of_the_game).
+
+    Args:
+        total_points (np.ndarray): The (games, players) total points.
+
+    Returns:
+        np.ndarray: The number of wins per seat.
+    """
+    return np.bincount(np.argmax(total_points, axis=1), minlength=total_points.shape[1])
+
+
+def _chi2_sf(statistic, degrees_of_freedom):
+    """
+    Survival function of the chi-square distribution for integer degrees of freedom.
+    """
+    x = statistic / 2
+    if degrees_of_freedom % 2 == 0:
+        term = math.exp(-x)
+        total = term
+        for k in range(1, degrees_of_freedom // 2):
+            term *= x / k
+            total += term
+        return total
+    total = math.erfc(math.sqrt(x))
+    term = math.sqrt(x / math.pi) * math.exp(-x) * 2
+    for k in range(1, (degrees_of_freedom + 1) // 2):
+        total += term
+        term *= x / (k + 0.5)
+    return total
+
+
+def engine_equivalence(number_of_games, playerlist, seed=42, workers=1):
+    """
+    Statistical equivalence check of the batch engine against the scalar reference engine.
+
+    Both engines play the same number of games and a chi-square test of homogeneity is
+    applied to the win counts per player.
+
+    Args:
+        number_of_games (int): Number of games per engine.
+        playerlist (list): The list of players participating in the simulation.
+        seed (int): Seed for both engines.
+        workers (int): Worker processes for the scalar engine.
+
+    Returns:
+        dict: Win rates of both engines, the chi-square statistic and the p-value.
+    """
+    from src.wizard_logic import play_games
+
+    scalar_wins = np.array(play_games(number_of_games, playerlist, workers=workers, seed=seed).wins)
+    batch_wins = winner_counts(play_games_batch(number_of_games, playerlist, seed=seed))
+
+    observed = np.stack([scalar_wins, batch_wins]).astype(np.float64)
+    used = observed.sum(axis=0) > 0
+    observed = observed[:, used]
+    expected = observed.sum(axis=1, keepdims=True) * observed.sum(axis=0, keepdims=True) / observed.sum()
+    statistic = float(((observed - expected) ** 2 / expected).sum())
+    degrees_of_freedom = max(observed.shape[1] - 1, 1)
+
+    names = [player.name for player in playerlist]
+    return {
+        "scalar": dict(zip(names, (scalar_wins / number_of_games).tolist())),
+        "batch": dict(zip(names, (batch_wins / number_of_games).tolist())),
+        "chi2": statistic,
+        "p_value": _chi2_sf(statistic, degrees_of_freedom),
+    }
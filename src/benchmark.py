@@ -0,0 +1,383 @@
+import argparse
+import copy
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from src import wizard_logic
+from src.deck import NO_SUIT, CARD_SUIT
+
+
+DEFAULT_THRESHOLD = 0.10
+
+# Bytes a game may leave behind on average before the memory check fails
+DEFAULT_MAX_RETAINED_BYTES = 64
+
+
+def _deal(playerlist, current_round):
+    """
+    Deals one round to a fresh copy of the players (not timed).
+
+    Returns:
+        tuple: (players, trump_color)
+    """
+    players = _empty_hands(playerlist)
+    remaining_cards = wizard_logic.distribute_cards(wizard_logic.shuffle_cards(), current_round, players)
+    return players, wizard_logic.choose_trump(remaining_cards, current_round, players)
+
+
+def _trick_inputs(playerlist, number):
+    inputs = []
+    for i in range(number):
+        current_round = 1 + i % wizard_logic.number_of_rounds_to_be_played(len(playerlist))
+        players, trump_color = _deal(playerlist, current_round)
+        announced_tricks = [(i + seat) % (current_round + 1) for seat in range(len(players))]
+        inputs.append((players, i % len(players), trump_color, current_round, announced_tricks, [0] * len(players)))
+    return inputs
+
+
+def _card_choice_inputs(playerlist, number):
+    inputs = []
+    for i in range(number):
+        players, trump_color = _deal(playerlist, 10)
+        # The first two players have played, the third one decides
+        lead, follow = players[0].cards_in_hand[0], players[1].cards_in_hand[0]
+        operating_color = CARD_SUIT[lead] if CARD_SUIT[lead] != NO_SUIT else CARD_SUIT[follow]
+        best = follow if wizard_logic.is_stronger(follow, lead, operating_color, trump_color) else lead
+        cards = wizard_logic.permitted_cards_for_move(players[2].cards_in_hand, operating_color)
+        trick_cards = {players[0].name: lead, players[1].name: follow}
+        inputs.append((cards, best, trick_cards, operating_color, trump_color, players, i % 2 == 0,
+                       players[2].playing_style))
+    return inputs
+
+
+def _mask_arguments(cards, best, trick_cards, operating_color, trump_color, players, wants_trick, playing_style):
+    """
+    Turns the arguments of choose_smart_card into those of choose_smart_card_mask.
+    """
+    player = players[2]
+    return (player, wizard_logic.permitted_cards_mask(player.hand_mask, operating_color), best, len(trick_cards),
+            operating_color, trump_color, len(players), wants_trick)
+
+
+def micro_benchmarks(playerlist):
+    """
+    The hot paths of the engine with a generator of inputs for each of them.
+
+    The inputs of a repeat are built before the clock starts, so functions that
+    change their arguments (distribute_cards, play_trick) always start from a fresh state.
+
+    Args:
+        playerlist (list): The players used to build the inputs.
+
+    Returns:
+        dict: name -> (function, make_inputs(number) -> list of argument tuples)
+    """
+    n = len(playerlist)
+    return {
+        "shuffle_cards": (wizard_logic.shuffle_cards, lambda number: [()] * number),
+        "distribute_cards": (
+            wizard_logic.distribute_cards,
+            lambda number: [(wizard_logic.shuffle_cards(), 60 // n,
+                             _empty_hands(playerlist)) for _ in range(number)],
+        ),
+        "evaluate_cards": (
+            wizard_logic.evaluate_cards,
+            lambda number: [(players[0].cards_in_hand, trump_color, players, 10, players[0].playing_style)
+                            for players, trump_color in (_deal(playerlist, 10) for _ in range(number))],
+        ),
+        "choose_smart_card": (wizard_logic.choose_smart_card, lambda number: _card_choice_inputs(playerlist, number)),
+        "choose_smart_card_mask": (
+            wizard_logic.choose_smart_card_mask,
+            lambda number: [_mask_arguments(*arguments) for arguments in _card_choice_inputs(playerlist, number)],
+        ),
+        "is_stronger": (
+            wizard_logic.is_stronger,
+            lambda number: [tuple(wizard_logic.rng.integers(0, 60, 2).tolist())
+                            + tuple(wizard_logic.rng.integers(0, 5, 2).tolist()) for _ in range(number)],
+        ),
+        "play_trick": (wizard_logic.play_trick, lambda number: _trick_inputs(playerlist, number)),
+    }
+
+
+def _empty_hands(playerlist):
+    players = copy.deepcopy(playerlist)
+    for player in players:
+        player.cards_in_hand = []
+    return players
+
+
+def time_calls(function, make_inputs, number, repeats, warmups, seed):
+    """
+    Times `number` calls of a function per repeat.
+
+    Args:
+        function (callable): The function under test.
+        make_inputs (callable): Builds the argument tuples of one repeat.
+        number (int): Calls per repeat.
+        repeats (int): Timed repeats.
+        warmups (int): Untimed repeats before the measurement.
+        seed (int): Seed of the module-wide generator, so every run sees the same inputs.
+
+    Returns:
+        list[float]: Calls per second of every timed repeat.
+    """
+    saved_rng = wizard_logic.rng
+    wizard_logic.rng = np.random.default_rng(seed)
+    rates = []
+    try:
+        for repeat in range(warmups + repeats):
+            inputs = make_inputs(number)
+            start_time = time.perf_counter()
+            for arguments in inputs:
+                function(*arguments)
+            elapsed = time.perf_counter() - start_time
+            if repeat >= warmups:
+                rates.append(number / elapsed)
+    finally:
+        wizard_logic.rng = saved_rng
+    return rates
+
+
+def summarize(rates, unit):
+    """
+    Median and spread of repeated measurements.
+
+    Returns:
+        dict: median, min, max and the relative interquartile range of the rates.
+    """
+    median = statistics.median(rates)
+    if len(rates) > 1:
+        lower, _, upper = statistics.quantiles(rates, n=4, method="inclusive")
+    else:
+        lower = upper = median
+    return {
+        "unit": unit,
+        "median": median,
+        "min": min(rates),
+        "max": max(rates),
+        "iqr_relative": (upper - lower) / median,
+        "repeats": len(rates),
+    }
+
+
+def run_benchmarks(playerlist=None, seed=42, repeats=7, warmups=2, number=2000, games=20, only=None):
+    """
+    Runs the micro-benchmarks and the end-to-end games per second for 3 to 6 players.
+
+    Args:
+        playerlist (list, optional): All available players, defaults to the config.
+        seed (int): Seed of the inputs and of the games.
+        repeats (int): Timed repeats per benchmark.
+        warmups (int): Untimed repeats per benchmark.
+        number (int): Calls per repeat of a micro-benchmark.
+        games (int): Games per repeat of an end-to-end benchmark.
+        only (list[str], optional): Names of the benchmarks to run.
+
+    Returns:
+        dict: Environment information and one summary per benchmark.
+    """
+    if playerlist is None:
+        playerlist = wizard_logic.load_player_from_config()
+
+    results = {}
+    for name, (function, make_inputs) in micro_benchmarks(playerlist[:4]).items():
+        if only is None or name in only:
+            results[name] = summarize(time_calls(function, make_inputs, number, repeats, warmups, seed), "calls/s")
+
+    for number_of_players in range(3, 7):
+        name = f"start_game_{number_of_players}p"
+        if only is None or name in only:
+            players = _empty_hands(playerlist[:number_of_players])
+            rates = time_calls(wizard_logic.start_game, lambda count: [(1, players)] * count,
+                               games, repeats, warmups, seed)
+            results[name] = summarize(rates, "games/s")
+
+    return {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "settings": {"seed": seed, "repeats": repeats, "warmups": warmups, "number": number, "games": games},
+        "benchmarks": results,
+        "startup": measure_startup(),
+        "memory": [measure_memory(playerlist[:number_of_players], seed=seed) for number_of_players in (3, 6)],
+    }
+
+
+def measure_memory(playerlist, games=200, seed=42):
+    """
+    Measures the memory the engine allocates per game with tracemalloc.
+
+    Args:
+        playerlist (list): The players of the games.
+        games (int): Number of games played after one warmup game.
+        seed (int): Seed of the games.
+
+    Returns:
+        dict: The peak of traced memory while a game is played, the memory kept per
+        game after all games (should be close to 0) and the garbage collections
+        per 1000 games.
+    """
+    players = _empty_hands(playerlist)
+    saved_rng = wizard_logic.rng
+    wizard_logic.rng = np.random.default_rng(seed)
+    try:
+        wizard_logic.start_game(1, players)
+        gc.collect()
+        collections_before = sum(stats["collections"] for stats in gc.get_stats())
+        tracemalloc.start()
+        try:
+            start_bytes = tracemalloc.get_traced_memory()[0]
+            for i in range(games):
+                wizard_logic.start_game(1, players)
+            current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        collections = sum(stats["collections"] for stats in gc.get_stats()) - collections_before
+    finally:
+        wizard_logic.rng = saved_rng
+
+    return {
+        "players": len(players),
+        "games": games,
+        "peak_bytes": peak_bytes - start_bytes,
+        "retained_bytes_per_game": (current_bytes - start_bytes) / games,
+        "gc_collections_per_1000_games": collections * 1000 / games,
+    }
+
+
+def measure_startup(repeats=5, module="src.wizard_logic"):
+    """
+    Measures how long a new interpreter needs to import the engine, which is what
+    every short run and every spawned worker process pays before the first game.
+
+    Args:
+        repeats (int): Number of fresh interpreters.
+        module (str): The module to import.
+
+    Returns:
+        dict: Median and minimum seconds and whether pandas was imported on the way.
+    """
+    code = f"import sys, time; t = time.perf_counter(); import {module}; " \
+           "print(time.perf_counter() - t, 'pandas' in sys.modules)"
+    seconds = []
+    for i in range(repeats):
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        import_seconds, pandas_loaded = output.split()
+        seconds.append(float(import_seconds))
+    return {
+        "module": module,
+        "median_seconds": statistics.median(seconds),
+        "min_seconds": min(seconds),
+        "pandas_imported": pandas_loaded == "True",
+    }
+
+
+def compare_with_baseline(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares the median throughput of every benchmark with a saved baseline.
+
+    Args:
+        results (dict): The output of run_benchmarks.
+        baseline (dict): A saved output of run_benchmarks.
+        threshold (float): Allowed relative loss of throughput, 0.1 = 10 percent.
+
+    Returns:
+        list[dict]: One row per benchmark found in both runs, with the ratio
+        current / baseline and whether it counts as a regression.
+    """
+    rows = []
+    for name, current in results["benchmarks"].items():
+        previous = baseline["benchmarks"].get(name)
+        if previous is None:
+            continue
+        ratio = current["median"] / previous["median"]
+        rows.append({
+            "benchmark": name,
+            "baseline": previous["median"],
+            "current": current["median"],
+            "ratio": ratio,
+            "regression": ratio < 1 - threshold,
+        })
+    return rows
+
+
+def format_results(results, comparison=None):
+    """
+    Formats benchmark results (and a baseline comparison) as a text table.
+    """
+    ratios = {row["benchmark"]: row for row in comparison or []}
+    lines = [f"{'benchmark':<20}{'median':>14}{'min':>14}{'max':>14}{'IQR':>8}  unit"]
+    for name, summary in results["benchmarks"].items():
+        line = (f"{name:<20}{summary['median']:>14,.0f}{summary['min']:>14,.0f}{summary['max']:>14,.0f}"
+                f"{summary['iqr_relative']:>8.1%}  {summary['unit']}")
+        if name in ratios:
+            row = ratios[name]
+            line += f"  x{row['ratio']:.2f} vs baseline" + ("  REGRESSION" if row["regression"] else "")
+        lines.append(line)
+    if "startup" in results:
+        startup = results["startup"]
+        lines.append(f"startup: import of {startup['module']} takes {startup['median_seconds'] * 1000:.0f} ms"
+                     + (" (pandas imported)" if startup["pandas_imported"] else ""))
+    for memory in results.get("memory", []):
+        lines.append(f"memory {memory['players']}p: peak {memory['peak_bytes']:,} bytes per game, "
+                     f"{memory['retained_bytes_per_game']:.1f} bytes kept per game, "
+                     f"{memory['gc_collections_per_1000_games']:.1f} gc collections per 1000 games")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks of the Wizard engine hot paths.")
+    parser.add_argument("--output", default="reports/benchmark.json", help="Where the results are saved as JSON.")
+    parser.add_argument("--baseline", help="A saved result to compare against.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed relative loss of throughput before the run fails.")
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--warmups", type=int, default=2)
+    parser.add_argument("--number", type=int, default=2000, help="Calls per repeat of a micro-benchmark.")
+    parser.add_argument("--games", type=int, default=20, help="Games per repeat of an end-to-end benchmark.")
+    parser.add_argument("--max-retained-bytes", type=float, default=DEFAULT_MAX_RETAINED_BYTES,
+                        help="Bytes a game may keep allocated on average before the run fails.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="*", help="Names of the benchmarks to run.")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(seed=args.seed, repeats=args.repeats, warmups=args.warmups,
+                             number=args.number, games=args.games, only=args.only)
+
+    comparison = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            comparison = compare_with_baseline(results, json.load(f), args.threshold)
+    print(format_results(results, comparison))
+
+    if args.output:
+        folder = os.path.dirname(args.output)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    regressions = [row["benchmark"] for row in comparison or [] if row["regression"]]
+    if regressions:
+        print(f"Throughput regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    leaks = [memory["players"] for memory in results["memory"]
+             if memory["retained_bytes_per_game"] > args.max_retained_bytes]
+    if leaks:
+        print(f"Memory grows by more than {args.max_retained_bytes:.0f} bytes per game with {leaks} players")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
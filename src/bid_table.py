@@ -0,0 +1,250 @@
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import os
+
+import numpy as np
+
+from src.deck import colors, NO_SUIT, DECK_SIZE, CARD_BITS, WIZARD_MASK, JESTER_MASK
+
+
+DEFAULT_TABLE_DIR = "tables/bids"
+
+# Bits of one suit in a hand mask: card 15 * suit is the Wizard, +1 the Jester, +2.. the values 1 to 13
+_SUIT_BITS = 15
+_VALUE_MASK = (1 << 13) - 1
+
+# Distance of the exact expected number of tricks to a rounding boundary below which
+# a bid is left out of the table, see build_bid_table
+_BOUNDARY_MARGIN = 1e-9
+
+
+def hand_signature(hand_mask, trump_color):
+    """
+    Canonical signature of a hand relative to the trump suit.
+
+    Suits that are not trump are interchangeable, so their 13-bit value masks are
+    sorted (relabeling the suits); the trump suit keeps its own place. Without trump
+    all four suits are sorted. Wizards and Jesters are only counted.
+
+    Layout (53 bits plus 6 bits of counts):
+    bits 0-51: trump value mask, then the other suits' value masks in descending
+    order (without trump: the four masks in descending order), bit 52: trump exists,
+    bits 53-55: Wizards, bits 56-58: Jesters.
+
+    Args:
+        hand_mask (int): Bitmask of the hand (see src/deck.py).
+        trump_color (int): The trump suit (NO_SUIT for none).
+
+    Returns:
+        int: The signature.
+    """
+    suits = [(hand_mask >> (_SUIT_BITS * suit + 2)) & _VALUE_MASK for suit in range(len(colors))]
+    if trump_color == NO_SUIT:
+        masks = sorted(suits, reverse=True)
+        signature = 0
+    else:
+        trump_mask = suits.pop(trump_color)
+        masks = [trump_mask] + sorted(suits, reverse=True)
+        signature = 1 << 52
+    for index, mask in enumerate(masks):
+        signature |= mask << (13 * index)
+    signature |= (hand_mask & WIZARD_MASK).bit_count() << 53
+    signature |= (hand_mask & JESTER_MASK).bit_count() << 56
+    return signature
+
+
+def table_key(signature, number_of_players, playing_style):
+    """
+    Adds the player count and the playing style to a hand signature (62 bits).
+    """
+    return signature | (number_of_players - 3) << 59 | (playing_style == "aggressive") << 61
+
+
+def representative_hand(signature):
+    """
+    A hand with the given signature, trump (if any) is suit 0.
+
+    Returns:
+        tuple: (cards, trump_color)
+    """
+    has_trump = signature >> 52 & 1
+    cards = []
+    for suit in range(len(colors)):
+        mask = signature >> (13 * suit) & _VALUE_MASK
+        cards += [_SUIT_BITS * suit + 2 + value for value in range(13) if mask >> value & 1]
+    cards += [_SUIT_BITS * suit for suit in range(signature >> 53 & 7)]
+    cards += [_SUIT_BITS * suit + 1 for suit in range(signature >> 56 & 7)]
+    return cards, 0 if has_trump else NO_SUIT
+
+
+class BidTable:
+    """
+    Read-only table of bids keyed by table_key, stored as two .npy arrays
+    (sorted int64 keys and int8 bids).
+
+    The arrays are opened as memory maps, so worker processes share the pages of
+    the file instead of each loading a copy.
+    """
+
+    def __init__(self, directory=DEFAULT_TABLE_DIR):
+        """
+        Args:
+            directory (str): Folder written by build_bid_table.
+        """
+        self.directory = directory
+        # Plain ndarray views of the maps skip the np.memmap overhead per lookup
+        self.keys = np.asarray(np.load(os.path.join(directory, "keys.npy"), mmap_mode="r"))
+        self.bids = np.asarray(np.load(os.path.join(directory, "bids.npy"), mmap_mode="r"))
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        # A table of exact_bid only repeats evaluate_cards, looking it up costs more than it saves
+        self.reproduces_heuristic = self.meta.get("bid_function") == exact_bid.__name__
+        self._digest = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def digest(self):
+        """
+        SHA-256 of the keys and bids, computed on first use. Identifies the table by
+        its content, so a rebuilt table in the same folder gets a new digest.
+        """
+        if self._digest is None:
+            h = hashlib.sha256()
+            h.update(np.ascontiguousarray(self.keys, dtype=np.int64).tobytes())
+            h.update(np.ascontiguousarray(self.bids, dtype=np.int8).tobytes())
+            self._digest = h.hexdigest()
+        return self._digest
+
+    def lookup(self, hand_mask, trump_color, number_of_players, playing_style):
+        """
+        The bid for a full hand (the round number equals the number of cards).
+
+        Returns:
+            int or None: The bid, or None if the hand is not in the table.
+        """
+        key = table_key(hand_signature(hand_mask, trump_color), number_of_players, playing_style)
+        keys = self.keys
+        index = int(keys.searchsorted(key))
+        if index < len(keys) and keys[index] == key:
+            return int(self.bids[index])
+        return None
+
+
+def exact_bid(cards, trump_color, number_of_players, playing_style):
+    """
+    The bid of evaluate_cards for a full hand, or None if the exactly summed
+    expected number of tricks lies so close to a rounding boundary that the order
+    of the floating point sum could change the bid.
+    """
+    from src.wizard_logic import hand_win_probability, bid_from_probability
+
+    current_round = len(cards)
+    total_prob = math.fsum(hand_win_probability([card], trump_color, number_of_players, current_round)
+                           for card in cards)
+    # floor(x + 0.7) jumps at x = k + 0.3, round(x) at x = k + 0.5, round 1 has its own threshold
+    shifted = total_prob + (0.7 if playing_style == "aggressive" else 0.5)
+    if abs(shifted - round(shifted)) < _BOUNDARY_MARGIN:
+        return None
+    if current_round == 1 and abs(total_prob - 0.4) < _BOUNDARY_MARGIN:
+        return None
+    return bid_from_probability(total_prob, current_round, len(cards), playing_style)
+
+
+def _enumerate_signatures(max_cards):
+    """
+    Signatures of every hand with up to max_cards cards, with and without trump.
+    """
+    signatures = set()
+    for number_of_cards in range(1, max_cards + 1):
+        for cards in itertools.combinations(range(DECK_SIZE), number_of_cards):
+            hand_mask = sum(CARD_BITS[card] for card in cards)
+            signatures.add(hand_signature(hand_mask, 0))
+            signatures.add(hand_signature(hand_mask, NO_SUIT))
+    return signatures
+
+
+def _sample_signatures(samples, seed):
+    """
+    Signatures of random hands of every size with a random trump suit.
+    """
+    rng = np.random.default_rng(seed)
+    signatures = set()
+    for sample in range(samples):
+        number_of_cards = int(rng.integers(1, DECK_SIZE // 3 + 1))
+        cards = rng.choice(DECK_SIZE, number_of_cards, replace=False).tolist()
+        trump_color = int(rng.integers(0, NO_SUIT + 1))
+        signatures.add(hand_signature(sum(CARD_BITS[card] for card in cards), trump_color))
+    return signatures
+
+
+def build_bid_table(directory=DEFAULT_TABLE_DIR, max_cards=3, samples=100_000, seed=42, bid_function=exact_bid):
+    """
+    Builds a bid table offline and writes it to a folder.
+
+    It holds every hand with up to max_cards cards and the hands of `samples`
+    random deals, for 3 to 6 players and both playing styles. The default
+    bid_function reproduces evaluate_cards and leaves out the rare hands whose bid
+    depends on the order of the floating point sum, so a game played with the table
+    gives exactly the same results. A slower estimator (e.g. Monte Carlo playouts)
+    can be passed instead.
+
+    Args:
+        directory (str): Output folder.
+        max_cards (int): All hands up to this size are included.
+        samples (int): Number of additional random hands.
+        seed (int): Seed of the random hands.
+        bid_function (callable): (cards, trump_color, number_of_players, playing_style) -> bid or None.
+
+    Returns:
+        int: Number of entries.
+    """
+    signatures = _enumerate_signatures(max_cards) | _sample_signatures(samples, seed)
+
+    entries = {}
+    for signature in signatures:
+        cards, trump_color = representative_hand(signature)
+        for number_of_players in range(3, 7):
+            if len(cards) > DECK_SIZE // number_of_players:
+                continue
+            for playing_style in ("normal", "aggressive"):
+                bid = bid_function(cards, trump_color, number_of_players, playing_style)
+                if bid is not None:
+                    entries[table_key(signature, number_of_players, playing_style)] = bid
+
+    # Keys use 62 bits, so they fit into int64, which NumPy compares with Python ints directly
+    keys = np.array(sorted(entries), dtype=np.int64)
+    bids = np.array([entries[key] for key in keys.tolist()], dtype=np.int8)
+
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, "keys.npy"), keys)
+    np.save(os.path.join(directory, "bids.npy"), bids)
+    with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"entries": len(keys), "max_cards": max_cards, "samples": samples, "seed": seed,
+                   "bid_function": bid_function.__name__}, f, indent=2)
+    return len(keys)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect the bid lookup table.")
+    parser.add_argument("command", choices=["build", "info"])
+    parser.add_argument("--dir", default=DEFAULT_TABLE_DIR, help="Folder of the table.")
+    parser.add_argument("--max-cards", type=int, default=3, help="Include every hand up to this size.")
+    parser.add_argument("--samples", type=int, default=100_000, help="Number of additional random hands.")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        entries = build_bid_table(args.dir, args.max_cards, args.samples, args.seed)
+        print(f"Wrote {entries} bids to {args.dir}")
+    else:
+        table = BidTable(args.dir)
+        print(json.dumps(table.meta, indent=2))
+
+
+if __name__ == "__main__":
+    main()
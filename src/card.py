@@ -1,4 +1,6 @@
 class Card:
+    __slots__ = ("color", "value")
+
     def __init__(self, color, value):
         self.color = color
         self.value = value
@@ -0,0 +1,151 @@
+from src.deck import NO_SUIT, CARD_BITS, CARD_SUIT, BEATS, SUIT_MASKS, WIZARD_MASK, JESTER_MASK
+
+# Every card of the deck as a bitmask
+FULL_DECK_MASK = (1 << 60) - 1
+
+
+class CardTracker:
+    """
+    Memory of one round: which cards have been played and which suits every seat has
+    shown void in, updated once per played card by play_trick. It also gives the bids,
+    the tricks won so far, the playing styles and the running trick, so a strategy can
+    rebuild the whole public state of the round (see monte_carlo.RoundState).
+
+    Everything is kept in bitmasks, so every query is a few integer operations no
+    matter how many tricks were played. Queries that take a hand_mask leave the cards
+    of that hand out, e.g. "Wizards still out" from the point of view of a player.
+    Strategies get the tracker of the running round through choose_smart_card_mask.
+    """
+
+    __slots__ = ("trump_color", "played_mask", "void_suits", "cards_played", "bids", "tricks_won", "playing_styles",
+                 "seed", "leader", "trick", "operating_color", "best_card", "winner")
+
+    def __init__(self, number_of_players, trump_color, bids=None, tricks_won=None, playing_styles=None, seed=None):
+        """
+        Args:
+            number_of_players (int): Number of seats at the table.
+            trump_color (int): The trump suit of the round (NO_SUIT for none).
+            bids (list[int], optional): The bid of every seat.
+            tricks_won (list[int], optional): The tricks every seat has won so far; the
+                list of play_round itself, so it is always up to date.
+            playing_styles (list[str], optional): The playing style of every seat,
+                defaults to "normal" for all.
+            seed (list[int], optional): Entropy of the round for strategies that sample,
+                e.g. the position of the game's random stream (see wizard_logic.stream_position).
+        """
+        self.trump_color = trump_color
+        self.played_mask = 0
+        # Per seat a bitset of the suits (bit s for suit s) it could not follow
+        self.void_suits = [0] * number_of_players
+        self.cards_played = 0
+        self.bids = bids if bids is not None else [0] * number_of_players
+        self.tricks_won = tricks_won if tricks_won is not None else [0] * number_of_players
+        self.playing_styles = playing_styles if playing_styles is not None else ["normal"] * number_of_players
+        self.seed = seed
+        # The running trick
+        self.leader = 0
+        self.trick = []
+        self.operating_color = NO_SUIT
+        self.best_card = None
+        self.winner = None
+
+    def start_trick(self, leader):
+        """
+        Args:
+            leader (int): The seat that leads the next trick.
+        """
+        self.leader = leader
+        self.trick = []
+        self.operating_color = NO_SUIT
+        self.best_card = self.winner = None
+
+    @property
+    def to_play(self):
+        """
+        The seat whose turn it is in the running trick.
+        """
+        return (self.leader + len(self.trick)) % len(self.void_suits)
+
+    def record(self, seat, card, operating_color):
+        """
+        Adds a played card.
+
+        Args:
+            seat (int): The seat that played it.
+            card (int): The card id.
+            operating_color (int): The suit that had to be followed when it was played.
+        """
+        self.played_mask |= CARD_BITS[card]
+        self.cards_played += 1
+        suit = CARD_SUIT[card]
+        # Discarding another suit reveals a void; Wizards and Jesters may always be played
+        if operating_color != NO_SUIT and suit != NO_SUIT and suit != operating_color:
+            self.void_suits[seat] |= 1 << operating_color
+
+        # The running trick, by the rules of play_trick
+        self.operating_color = suit if operating_color == NO_SUIT else operating_color
+        if not self.trick or BEATS[card][self.best_card][self.operating_color][self.trump_color]:
+            self.best_card = card
+            self.winner = seat
+        self.trick.append(card)
+
+    def unseen_mask(self, hand_mask=0):
+        """
+        Returns:
+            int: Bitmask of the cards that were neither played nor are in hand_mask.
+        """
+        return FULL_DECK_MASK & ~self.played_mask & ~hand_mask
+
+    def wizards_out(self, hand_mask=0):
+        """
+        Returns:
+            int: Number of Wizards that were not played yet (and are not in hand_mask).
+        """
+        return (WIZARD_MASK & ~self.played_mask & ~hand_mask).bit_count()
+
+    def jesters_out(self, hand_mask=0):
+        """
+        Returns:
+            int: Number of Jesters that were not played yet (and are not in hand_mask).
+        """
+        return (JESTER_MASK & ~self.played_mask & ~hand_mask).bit_count()
+
+    def cards_out(self, suit, hand_mask=0):
+        """
+        Returns:
+            int: Number of cards of a suit that were not played yet (and are not in hand_mask).
+        """
+        return (SUIT_MASKS[suit] & ~self.played_mask & ~hand_mask).bit_count()
+
+    def highest_unseen(self, suit, hand_mask=0):
+        """
+        Args:
+            suit (int): A suit index (not NO_SUIT).
+            hand_mask (int): Cards to leave out, usually the own hand.
+
+        Returns:
+            int or None: The highest card of the suit that was neither played nor is
+            in hand_mask, None if there is none.
+        """
+        # The values of a suit have increasing card ids, so the highest bit is the highest card
+        unseen = SUIT_MASKS[suit] & ~self.played_mask & ~hand_mask
+        return unseen.bit_length() - 1 if unseen else None
+
+    def highest_unseen_trump(self, hand_mask=0):
+        """
+        Returns:
+            int or None: highest_unseen of the trump suit, None without trump.
+        """
+        if self.trump_color == NO_SUIT:
+            return None
+        return self.highest_unseen(self.trump_color, hand_mask)
+
+    def is_void(self, seat, suit):
+        """
+        Returns:
+            bool: True if the seat has shown that it holds no card of the suit.
+        """
+        return bool(self.void_suits[seat] >> suit & 1)
+
+    def was_played(self, card):
+        return bool(self.played_mask & CARD_BITS[card])
@@ -0,0 +1,138 @@
+import json
+import os
+import time
+
+from src import wizard_logic
+from src.result_sink import CountingSink
+from src.score_ledger import ScoreLedger
+from src.shards import run_config
+
+# Marks a checkpoint file and the version of its layout
+CHECKPOINT_FORMAT = "wizard-checkpoint"
+CHECKPOINT_VERSION = 1
+
+DEFAULT_CHECKPOINT_SECONDS = 60
+
+
+def play_games_checkpointed(number_of_games, playerlist, path, workers=1, seed=None,
+                            chunk_size=wizard_logic.DEFAULT_CHUNK_SIZE, every_games=None,
+                            every_seconds=DEFAULT_CHECKPOINT_SECONDS, resume=False):
+    """
+    Like play_games, but saves the progress of the run to a checkpoint file from
+    time to time, so an interrupted run can be continued with resume=True.
+
+    A checkpoint holds the index of the next game, the counts so far and, for the
+    unseeded mode, the state of the module rng. A resumed run therefore ends with the
+    same counts (and the same module rng state) as an uninterrupted one. In the
+    chunked mode (a seed or several workers) checkpoints are taken between chunks.
+
+    Args:
+        number_of_games (int): How many full games should be simulated.
+        playerlist (list): The list of players participating in the simulation.
+        path (str): The checkpoint file.
+        workers (int): Number of worker processes.
+        seed (int or list[int], optional): Root seed of the chunked mode.
+        chunk_size (int): Number of games per chunk in the chunked mode.
+        every_games (int, optional): Save after at least this many games.
+        every_seconds (float, optional): Save after at least this many seconds.
+        resume (bool): Continue from the checkpoint file if it exists.
+
+    Returns:
+        CountingSink: The counts of all games of the run.
+
+    Raises:
+        ValueError: If the checkpoint belongs to a different run.
+    """
+    sequential = workers <= 1 and seed is None
+    if not sequential and seed is None:
+        seed = 42
+    config = dict(run_config(playerlist, seed, number_of_games, chunk_size), sequential=sequential)
+
+    sink = CountingSink(len(playerlist))
+    next_game = 0
+    if resume and os.path.exists(path):
+        checkpoint = read_checkpoint(path)
+        if checkpoint["config"] != config:
+            raise ValueError(f"{path} belongs to a different run")
+        next_game = checkpoint["next_game"]
+        sink.games, sink.ties = checkpoint["games"], checkpoint["ties"]
+        sink.wins = checkpoint["wins"]
+        sink.point_sums = checkpoint["point_sums"]
+        sink.point_squares = checkpoint["point_squares"]
+        if sequential:
+            wizard_logic.rng.bit_generator.state = checkpoint["rng_state"]
+        print(f"Resuming from game {next_game} of {number_of_games} ({path})")
+
+    last_save = {"time": time.monotonic(), "game": next_game}
+
+    def save_if_due(game, force=False):
+        due = (force or (every_games is not None and game - last_save["game"] >= every_games)
+               or (every_seconds is not None and time.monotonic() - last_save["time"] >= every_seconds))
+        if due:
+            rng_state = wizard_logic.rng.bit_generator.state if sequential else None
+            write_checkpoint(path, config, game, sink, rng_state)
+            last_save["time"], last_save["game"] = time.monotonic(), game
+
+    if sequential:
+        # The same games as play_games without a seed, one after another on the module rng
+        ledger = ScoreLedger(1, wizard_logic.number_of_rounds_to_be_played(len(playerlist)),
+                             [player.name for player in playerlist])
+        for game in range(next_game, number_of_games):
+            wizard_logic.start_game(1, playerlist, ledger, 0, sink)
+            save_if_due(game + 1)
+    else:
+        first_chunk = next_game // chunk_size
+        tasks = wizard_logic.chunk_tasks(number_of_games - next_game, playerlist, seed, chunk_size, first_chunk)
+        game = next_game
+        for total_points in wizard_logic.run_chunks(tasks, workers):
+            sink.add_games(total_points)
+            game += len(total_points)
+            save_if_due(game)
+
+    save_if_due(number_of_games, force=True)
+    return sink
+
+
+def write_checkpoint(path, config, next_game, sink, rng_state=None):
+    """
+    Writes a checkpoint atomically, so an interrupted run never leaves a broken one.
+
+    Args:
+        path (str): The checkpoint file.
+        config (dict): The run configuration.
+        next_game (int): Index of the first game that is not counted yet.
+        sink (CountingSink): The counts of the games before it.
+        rng_state (dict, optional): The bit generator state of the unseeded mode.
+    """
+    checkpoint = {
+        "format": CHECKPOINT_FORMAT,
+        "version": CHECKPOINT_VERSION,
+        "config": config,
+        "next_game": next_game,
+        "games": sink.games,
+        "ties": sink.ties,
+        "wins": sink.wins,
+        "point_sums": sink.point_sums,
+        "point_squares": sink.point_squares,
+        "rng_state": rng_state,
+    }
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+
+
+def read_checkpoint(path):
+    """
+    Returns:
+        dict: The content of a checkpoint file.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("format") != CHECKPOINT_FORMAT or checkpoint.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"{path} is not a checkpoint file of version {CHECKPOINT_VERSION}")
+    return checkpoint
@@ -0,0 +1,177 @@
+import copy
+import math
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+from src import wizard_logic
+from src.score_ledger import ScoreLedger
+
+
+STYLES = ("aggressive", "normal")
+
+
+def compare_styles(number_of_games, playerlist, focal_player=None, seed=42, workers=1,
+                   chunk_size=wizard_logic.DEFAULT_CHUNK_SIZE, confidence=0.95):
+    """
+    Paired comparison of "aggressive" against "normal" play with common random numbers.
+
+    Every game is dealt once per seat rotation: the same shuffles (shuffle_cards) and
+    hands (distribute_cards) are replayed with the focal player sitting at every
+    position, once playing aggressive and once playing normal. All other players
+    keep their style. Both styles see exactly the same cards, so the luck of the deal
+    cancels out in the difference, and the rotation removes the seat advantage.
+
+    Args:
+        number_of_games (int): Number of deals (each is played 2 * players times).
+        playerlist (list): The list of players participating in the simulation.
+        focal_player (str, optional): Name of the player whose style is switched.
+            Defaults to the first aggressive player (or the first player).
+        seed (int): Root seed, game g is dealt from game_rng(seed, g) like game g of play_games.
+        workers (int): Number of worker processes.
+        chunk_size (int): Number of games per worker task.
+        confidence (float): Confidence of the reported intervals.
+
+    Returns:
+        dict: Win rate and mean points per style, the paired differences with their
+        variance, standard error and interval, and the variance reduction factor
+        compared with two independent runs that play the same number of games.
+    """
+    if focal_player is None:
+        focal_player = next((player.name for player in playerlist if player.playing_style == "aggressive"),
+                            playerlist[0].name)
+
+    number_of_chunks = math.ceil(number_of_games / chunk_size)
+    tasks = ((seed, chunk * chunk_size, min(chunk_size, number_of_games - chunk * chunk_size),
+              playerlist, focal_player) for chunk in range(number_of_chunks))
+
+    # Running sums of [aggressive win, normal win, aggressive points, normal points],
+    # of their squares per single game and of the paired differences per deal,
+    # so the memory does not grow with the number of games
+    sums = np.zeros(4)
+    single_game_squares = np.zeros(4)
+    difference_sums = np.zeros(2)
+    difference_squares = np.zeros(2)
+
+    def merge(chunk_result):
+        nonlocal sums, single_game_squares, difference_sums, difference_squares
+        observations, squares = chunk_result
+        sums += observations.sum(axis=0)
+        single_game_squares += squares
+        differences = observations[:, [0, 2]] - observations[:, [1, 3]]
+        difference_sums += differences.sum(axis=0)
+        difference_squares += (differences ** 2).sum(axis=0)
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=wizard_logic._init_worker,
+                                 initargs=(wizard_logic.bid_table_directory(),)) as executor:
+            for chunk_result in wizard_logic._ordered_results(executor, _compare_chunk, tasks, 4 * workers):
+                merge(chunk_result)
+    else:
+        for task in tasks:
+            merge(_compare_chunk(task))
+
+    n = number_of_games
+    number_of_players = len(playerlist)
+    means = sums / n
+    # Variance of a single game of one style, as two independent runs would see it
+    single_game_variances = single_game_squares / (n * number_of_players) - means ** 2
+    difference_means = difference_sums / n
+    difference_variances = ((difference_squares - n * difference_means ** 2) / (n - 1)
+                            if n > 1 else np.zeros(2))
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    report = {"games": n, "focal_player": focal_player, "confidence": confidence}
+    for index, measure in enumerate(["win_rate", "points"]):
+        standard_error = math.sqrt(difference_variances[index] / n)
+        # Independent runs with the same budget play each style number_of_players times per deal
+        unpaired_variance = (single_game_variances[2 * index] + single_game_variances[2 * index + 1]) / number_of_players
+        report[measure] = {
+            "aggressive": means[2 * index],
+            "normal": means[2 * index + 1],
+            "difference": difference_means[index],
+            "difference_variance": difference_variances[index],
+            "standard_error": standard_error,
+            "lower": difference_means[index] - z * standard_error,
+            "upper": difference_means[index] + z * standard_error,
+            "variance_reduction": (unpaired_variance / difference_variances[index]
+                                   if difference_variances[index] > 0 else math.inf),
+        }
+    return report
+
+
+def _compare_chunk(task):
+    """
+    Plays a chunk of deals with both styles and every seat rotation (runs inside a worker).
+
+    Args:
+        task (tuple): (seed, first_game, number_of_games, playerlist, focal_player)
+
+    Returns:
+        tuple: Per deal [aggressive win, normal win, aggressive points, normal points],
+        each averaged over the seat rotations, and the sums of their squares over
+        every single game.
+    """
+    seed, first_game, number_of_games, playerlist, focal_player = task
+    number_of_players = len(playerlist)
+    number_of_rounds = wizard_logic.number_of_rounds_to_be_played(number_of_players)
+    focal_index = [player.name for player in playerlist].index(focal_player)
+
+    # One seating order per position of the focal player and one copy of it per style
+    seatings = {}
+    for seat in range(number_of_players):
+        shift = (focal_index - seat) % number_of_players
+        for style in STYLES:
+            seating = copy.deepcopy(playerlist[shift:] + playerlist[:shift])
+            seating[seat].playing_style = style
+            seatings[seat, style] = seating
+    ledgers = {key: ScoreLedger(1, number_of_rounds, [player.name for player in seating])
+               for key, seating in seatings.items()}
+
+    simulation = wizard_logic.Simulation(bid_table=wizard_logic.bid_table)
+    observations = np.zeros((number_of_games, 4))
+    squares = np.zeros(4)
+    for game in range(number_of_games):
+        for (seat, style), seating in seatings.items():
+            # The same stream for every replay reproduces the same deals
+            simulation.rng = wizard_logic.game_rng(seed, first_game + game)
+            ledger = simulation.start_game(1, seating, ledgers[seat, style], 0)
+            total_points = ledger.total_points(0)
+
+            arm = STYLES.index(style)
+            won = int(np.argmax(total_points)) == seat
+            points = int(total_points[seat])
+            observations[game, arm] += won
+            observations[game, 2 + arm] += points
+            squares[arm] += won
+            squares[2 + arm] += points * points
+
+    return observations / number_of_players, squares
+
+
+def comparison_report(result):
+    """
+    Formats the result of compare_styles as a table for the console.
+
+    Args:
+        result (dict): The dictionary returned by compare_styles.
+
+    Returns:
+        pd.DataFrame: One row per measure (win rate in percent, mean points).
+    """
+    import pandas as pd
+
+    rows = {}
+    for measure, scale in [("win_rate", 100), ("points", 1)]:
+        values = result[measure]
+        rows[measure] = {
+            "aggressive": values["aggressive"] * scale,
+            "normal": values["normal"] * scale,
+            "difference": values["difference"] * scale,
+            "lower": values["lower"] * scale,
+            "upper": values["upper"] * scale,
+            "std_error": values["standard_error"] * scale,
+            "variance_reduction": values["variance_reduction"],
+        }
+    return pd.DataFrame(rows).T.round(3)
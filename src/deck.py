@@ -0,0 +1,98 @@
+from src.card import Card
+import numpy as np
+
+
+colors = ["red", "green", "blue", "yellow"]
+
+# Suit index of Wizards and Jesters. Also used for "no color led yet" and "no trump".
+NO_SUIT = len(colors)
+
+WIZARD = 14
+JESTER = 0
+
+DECK_SIZE = 60
+
+
+def _build_encoding():
+    """
+    Numbers the 60 cards in the order the deck has always been built in:
+    per color one Wizard, one Jester and the values 1 to 13.
+    """
+    suits = []
+    values = []
+    for color_index in range(len(colors)):
+        suits.append(NO_SUIT)   # wizard
+        values.append(WIZARD)
+        suits.append(NO_SUIT)   # jester
+        values.append(JESTER)
+        for value in range(13):
+            suits.append(color_index)
+            values.append(value + 1)
+    return suits, values
+
+
+CARD_SUIT, CARD_VALUE = _build_encoding()
+
+# Static deck of card ids 0..59, it is copied and shuffled every round
+DECK = np.arange(DECK_SIZE, dtype=np.int8)
+
+# Card objects only serve as a readable view, e.g. CARDS[card_id] for printing
+CARDS = tuple(Card(colors[suit] if suit != NO_SUIT else "", value) for suit, value in zip(CARD_SUIT, CARD_VALUE))
+
+
+def _build_beats_table():
+    """
+    Precomputes the trick comparison (see is_stronger) for every
+    (new card, leading card, led suit, trump suit) with broadcasting.
+    """
+    suit = np.array(CARD_SUIT)
+    value = np.array(CARD_VALUE)
+    new_suit = suit[:, None, None, None]
+    new_value = value[:, None, None, None]
+    best_suit = suit[None, :, None, None]
+    best_value = value[None, :, None, None]
+    operating_color = np.arange(NO_SUIT + 1)[None, None, :, None]
+    trump_color = np.arange(NO_SUIT + 1)[None, None, None, :]
+
+    higher = new_value > best_value
+    conditions = [
+        best_value == WIZARD,          # 1. The first Wizard played in a trick always wins
+        new_value == WIZARD,
+        new_value == JESTER,           # 2. A Jester never beats a card already leading
+        new_suit == trump_color,       # 3. Trump beats non-trump, higher trump beats lower
+        new_suit == operating_color,   # 4. Led color beats discards, higher beats lower
+    ]
+    choices = [
+        False,
+        True,
+        False,
+        (best_suit != trump_color) | higher,
+        (best_suit != operating_color) | higher,
+    ]
+    shape = (DECK_SIZE, DECK_SIZE, NO_SUIT + 1, NO_SUIT + 1)
+    conditions = [np.broadcast_to(condition, shape) for condition in conditions]
+    choices = [np.broadcast_to(choice, shape) for choice in choices]
+    # 5. Discards do not win
+    return np.select(conditions, choices, default=False)
+
+
+BEATS_TABLE = _build_beats_table()
+
+# Nested lists are faster than NumPy for single lookups from Python code
+BEATS = BEATS_TABLE.tolist()
+
+# Card sets as 64-bit masks: bit c is set if card c is in the set
+CARD_BITS = [1 << card for card in range(DECK_SIZE)]
+
+# SUIT_MASKS[suit] holds every card of a suit, SUIT_MASKS[NO_SUIT] the Wizards and Jesters
+SUIT_MASKS = [sum(CARD_BITS[card] for card in range(DECK_SIZE) if CARD_SUIT[card] == suit)
+              for suit in range(NO_SUIT + 1)]
+WIZARD_MASK = sum(CARD_BITS[card] for card in range(DECK_SIZE) if CARD_VALUE[card] == WIZARD)
+JESTER_MASK = SUIT_MASKS[NO_SUIT] & ~WIZARD_MASK
+
+# BEATS_MASKS[leading card, led suit, trump suit] has bit c set if card c takes the lead
+BEATS_MASKS = (BEATS_TABLE.transpose(1, 2, 3, 0).astype(np.uint64)
+               << np.arange(DECK_SIZE, dtype=np.uint64)).sum(axis=3, dtype=np.uint64)
+
+# The same masks as Python ints in nested lists for the scalar engine
+BEATS_BITS = BEATS_MASKS.tolist()
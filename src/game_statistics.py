@@ -0,0 +1,225 @@
+import numpy as np
+
+from src.result_sink import ResultSink
+from src.score_ledger import BID, MADE, POINTS
+
+
+class RunningStats:
+    """
+    Single-pass mean and variance of a vector of values (Welford), with constant memory.
+
+    Blocks of observations are folded in with the pairwise update of Chan et al.,
+    so two RunningStats (e.g. of two workers) can also be merged exactly.
+    """
+
+    def __init__(self, size):
+        """
+        Args:
+            size (int): Number of values per observation.
+        """
+        self.count = 0
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+        self.minimum = np.full(size, np.inf)
+        self.maximum = np.full(size, -np.inf)
+
+    def add(self, values):
+        """
+        Args:
+            values (sequence[float]): One observation.
+        """
+        values = np.asarray(values, dtype=float)
+        self.count += 1
+        delta = values - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (values - self.mean)
+        np.minimum(self.minimum, values, out=self.minimum)
+        np.maximum(self.maximum, values, out=self.maximum)
+
+    def add_block(self, values):
+        """
+        Args:
+            values (np.ndarray): A (observations, size) block.
+        """
+        if len(values) == 0:
+            return
+        values = np.asarray(values, dtype=float)
+        block = RunningStats(values.shape[1])
+        block.count = len(values)
+        block.mean = values.mean(axis=0)
+        block.m2 = ((values - block.mean) ** 2).sum(axis=0)
+        block.minimum = values.min(axis=0)
+        block.maximum = values.max(axis=0)
+        self.merge(block)
+
+    def merge(self, other):
+        """
+        Adds the observations summarized by another RunningStats.
+        """
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.count / count)
+        self.m2 = self.m2 + other.m2 + delta * delta * (self.count * other.count / count)
+        self.count = count
+        self.minimum = np.minimum(self.minimum, other.minimum)
+        self.maximum = np.maximum(self.maximum, other.maximum)
+        return self
+
+    def variance(self):
+        """
+        Returns:
+            np.ndarray: The sample variance (0 for less than two observations).
+        """
+        if self.count < 2:
+            return np.zeros_like(self.mean)
+        return self.m2 / (self.count - 1)
+
+    def std(self):
+        return np.sqrt(self.variance())
+
+
+class GameStatistics(ResultSink):
+    """
+    Streaming statistics of a run: final points, wins, bid accuracy per round number
+    and the distribution of over- and underbidding, per player.
+
+    Everything is kept in fixed-size counters and RunningStats, so the memory does
+    not grow with the number of games. The sink needs the rounds of every game, so
+    it works with the scalar engine (play_games), not with play_games_batch.
+    """
+
+    wants_rounds = True
+
+    def __init__(self, player_names, number_of_rounds):
+        """
+        Args:
+            player_names (list[str]): The names of the players in seating order.
+            number_of_rounds (int): The number of rounds of each game.
+        """
+        self.player_names = list(player_names)
+        self.number_of_rounds = number_of_rounds
+        number_of_players = len(self.player_names)
+        self.points = RunningStats(number_of_players)
+        self.wins = np.zeros(number_of_players, dtype=np.int64)
+        # Rounds played and bids hit per (round number, seat)
+        self.rounds_played = np.zeros((number_of_rounds, number_of_players), dtype=np.int64)
+        self.bids_hit = np.zeros((number_of_rounds, number_of_players), dtype=np.int64)
+        # Counts of bid - made from -number_of_rounds to +number_of_rounds per seat
+        self.bid_errors = np.zeros((2 * number_of_rounds + 1, number_of_players), dtype=np.int64)
+
+    def add_rounds(self, data):
+        bids = data[:, :, :, BID].astype(np.int64)
+        made = data[:, :, :, MADE].astype(np.int64)
+        self.rounds_played += len(data)
+        self.bids_hit += (bids == made).sum(axis=0)
+
+        # One bincount over (error, seat) pairs instead of a loop over the games
+        errors = (bids - made + self.number_of_rounds) * len(self.player_names) + np.arange(len(self.player_names))
+        self.bid_errors += np.bincount(errors.ravel(), minlength=self.bid_errors.size).reshape(self.bid_errors.shape)
+
+        total_points = data[:, :, :, POINTS].sum(axis=1)
+        self.points.add_block(total_points)
+        self.wins += np.bincount(np.argmax(total_points, axis=1), minlength=len(self.player_names))
+
+    def add_game(self, total_points):
+        # Everything is taken from add_rounds
+        pass
+
+    def add_games(self, total_points):
+        pass
+
+    def merge(self, other):
+        """
+        Adds the statistics of another GameStatistics of the same players.
+        """
+        self.points.merge(other.points)
+        self.wins += other.wins
+        self.rounds_played += other.rounds_played
+        self.bids_hit += other.bids_hit
+        self.bid_errors += other.bid_errors
+        return self
+
+    @property
+    def games(self):
+        return self.points.count
+
+    def player_report(self):
+        """
+        Returns:
+            pd.DataFrame: One row per player with the win rate, mean, standard
+            deviation, minimum and maximum of the final points, the share of bids
+            hit and the shares and mean size of over- and underbids.
+        """
+        import pandas as pd
+
+        errors = np.arange(-self.number_of_rounds, self.number_of_rounds + 1)[:, None]
+        rounds = np.maximum(self.rounds_played.sum(axis=0), 1)
+        overbids = self.bid_errors[errors[:, 0] > 0]
+        underbids = self.bid_errors[errors[:, 0] < 0]
+        games = max(self.games, 1)
+        return pd.DataFrame({
+            "players": len(self.player_names),
+            "games": self.games,
+            "win_rate": self.wins / games,
+            "points_mean": self.points.mean,
+            "points_std": self.points.std(),
+            "points_min": self.points.minimum if self.games else np.nan,
+            "points_max": self.points.maximum if self.games else np.nan,
+            "bid_hit_rate": self.bids_hit.sum(axis=0) / rounds,
+            "overbid_rate": overbids.sum(axis=0) / rounds,
+            "underbid_rate": underbids.sum(axis=0) / rounds,
+            "mean_overbid": (overbids * errors[errors[:, 0] > 0]).sum(axis=0) / np.maximum(overbids.sum(axis=0), 1),
+            "mean_underbid": (underbids * -errors[errors[:, 0] < 0]).sum(axis=0) / np.maximum(underbids.sum(axis=0), 1),
+        }, index=pd.Index(self.player_names, name="player"))
+
+    def round_report(self):
+        """
+        Returns:
+            pd.DataFrame: Share of bids hit per round number, per player and over all players.
+        """
+        import pandas as pd
+
+        rates = self.bids_hit / np.maximum(self.rounds_played, 1)
+        df = pd.DataFrame(rates, columns=self.player_names,
+                          index=pd.RangeIndex(1, self.number_of_rounds + 1, name="round"))
+        df.insert(0, "all", self.bids_hit.sum(axis=1) / np.maximum(self.rounds_played.sum(axis=1), 1))
+        df.insert(0, "players", len(self.player_names))
+        return df
+
+    def bid_error_report(self):
+        """
+        Returns:
+            pd.DataFrame: Share of rounds per bid error (bid - tricks made, positive = overbid) and player.
+        """
+        import pandas as pd
+
+        shares = self.bid_errors / np.maximum(self.rounds_played.sum(axis=0), 1)
+        df = pd.DataFrame(shares, columns=self.player_names,
+                          index=pd.RangeIndex(-self.number_of_rounds, self.number_of_rounds + 1, name="bid_error"))
+        # Errors that never occur for anybody are left out
+        return df[self.bid_errors.sum(axis=1) > 0]
+
+    def export(self, filename="simulation_statistics", seed=42, path=None):
+        """
+        Saves the three reports with the export_with_metadata header.
+
+        Args:
+            filename (str): Base name in 'reports' ({filename}_players.csv, _rounds.csv, _bid_errors.csv).
+            seed (int): The seed of the run.
+            path (str, optional): Base path instead of reports/{filename}.csv, the suffixes are added to it.
+
+        Returns:
+            list[str]: The written files.
+        """
+        from src.wizard_logic import export_with_metadata
+
+        base = path[:-4] if path and path.endswith(".csv") else path
+        written = []
+        for suffix, report in (("players", self.player_report()), ("rounds", self.round_report()),
+                               ("bid_errors", self.bid_error_report())):
+            report_path = f"{base}_{suffix}.csv" if base else f"reports/{filename}_{suffix}.csv"
+            export_with_metadata(report, f"{filename}_{suffix}", seed=seed, path=report_path)
+            written.append(report_path)
+        return written
@@ -0,0 +1,285 @@
+import argparse
+import json
+import struct
+
+import numpy as np
+
+from src import wizard_logic
+from src.deck import CARDS, colors
+from src.player import Player
+from src.score_ledger import ScoreLedger, BID
+
+# First bytes of a trace file
+MAGIC = b"WZTRACE1"
+
+# Footer: file offset of the index and number of games (two little-endian uint64)
+_FOOTER = struct.Struct("<QQ")
+
+
+def record_game(game_index, playerlist, seed=42):
+    """
+    Plays game game_index of a seeded run (see game_rng) and records every round.
+
+    Args:
+        game_index (int): Index of the game in the run.
+        playerlist (list): The players in seating order.
+        seed (int or list[int]): Root seed of the run.
+
+    Returns:
+        list[dict]: Per round the trump color, the dealt hands in seating order,
+        the bids and the seat of every trick winner.
+    """
+    number_of_rounds = wizard_logic.number_of_rounds_to_be_played(len(playerlist))
+    ledger = ScoreLedger(1, number_of_rounds, [player.name for player in playerlist])
+    rounds = []
+
+    simulation = wizard_logic.Simulation(bid_table=wizard_logic.bid_table)
+    simulation.rng = wizard_logic.game_rng(seed, game_index)
+    for current_round in range(1, number_of_rounds + 1):
+        # The same steps as start_game, keeping the hands before they are played
+        cards = simulation.shuffle_cards()
+        remaining_cards = wizard_logic.distribute_cards(cards, current_round, playerlist)
+        trump_color = simulation.choose_trump(remaining_cards, current_round, playerlist)
+        hands = [list(player.cards_in_hand) for player in playerlist]
+        trick_winners = []
+        simulation.play_round(current_round, trump_color, ledger, number_of_rounds, playerlist, 0,
+                              trick_winners=trick_winners)
+        rounds.append({
+            "trump": trump_color,
+            "hands": hands,
+            "bids": ledger.data[0, current_round - 1, :, BID].tolist(),
+            "trick_winners": trick_winners,
+        })
+    return rounds
+
+
+def _round_scores(rounds, number_of_players):
+    """
+    Adds the tricks made and the points of every round (derived from bids and trick winners).
+    """
+    for round_record in rounds:
+        made = [round_record["trick_winners"].count(seat) for seat in range(number_of_players)]
+        round_record["made"] = made
+        round_record["points"] = [20 + 10 * tricks if tricks == bid else -10 * abs(bid - tricks)
+                                  for bid, tricks in zip(round_record["bids"], made)]
+    return rounds
+
+
+class TraceWriter:
+    """
+    Writes games into a binary trace file.
+
+    Layout: MAGIC, the length (uint32) and JSON of the metadata, one record per game,
+    the index and the footer. A game record holds per round one byte for the trump
+    color, the dealt cards seat by seat, one byte per bid and one byte per trick
+    winner; its size follows from the number of players. The index lists
+    (game_index, offset) pairs as uint64, so a reader finds any game with one seek.
+    """
+
+    def __init__(self, path, playerlist, seed=42):
+        """
+        Args:
+            path (str): The trace file.
+            playerlist (list): The players in seating order.
+            seed (int or list[int]): Root seed of the run.
+        """
+        self.path = path
+        self.index = []
+        self._file = open(path, "wb")
+        # Everything record_game needs to play the games again, see TraceReader.playerlist
+        meta = {
+            "players": [[player.name, player.playing_style] for player in playerlist],
+            "parameters": [player.parameters for player in playerlist],
+            "rollouts": [player.rollouts for player in playerlist],
+            "seed": seed,
+            "engine_version": wizard_logic.ENGINE_VERSION,
+        }
+        bid_table_digest = wizard_logic.bid_table_digest()
+        if bid_table_digest is not None:
+            meta["bid_table"] = bid_table_digest
+        meta_bytes = json.dumps(meta).encode("utf-8")
+        self._file.write(MAGIC + struct.pack("<I", len(meta_bytes)) + meta_bytes)
+
+    def write_game(self, game_index, rounds):
+        """
+        Args:
+            game_index (int): Index of the game in the run.
+            rounds (list[dict]): The rounds as returned by record_game.
+        """
+        record = bytearray()
+        for round_record in rounds:
+            record.append(round_record["trump"])
+            for hand in round_record["hands"]:
+                record.extend(hand)
+            record.extend(round_record["bids"])
+            record.extend(round_record["trick_winners"])
+        self.index.append((game_index, self._file.tell()))
+        self._file.write(record)
+
+    def close(self):
+        """
+        Writes the index and the footer.
+        """
+        index_offset = self._file.tell()
+        self._file.write(np.array(self.index, dtype="<u8").reshape(-1, 2).tobytes())
+        self._file.write(_FOOTER.pack(index_offset, len(self.index)))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class TraceReader:
+    """
+    Reads single games from a trace file without reading the rest of it.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): A file written by TraceWriter.
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a Wizard trace file")
+            meta_length, = struct.unpack("<I", f.read(4))
+            self.meta = json.loads(f.read(meta_length).decode("utf-8"))
+            f.seek(-_FOOTER.size, 2)
+            index_offset, number_of_games = _FOOTER.unpack(f.read(_FOOTER.size))
+            f.seek(index_offset)
+            index = np.frombuffer(f.read(16 * number_of_games), dtype="<u8").reshape(-1, 2)
+        self.offsets = dict(zip(index[:, 0].tolist(), index[:, 1].tolist()))
+        self.number_of_players = len(self.meta["players"])
+        self.number_of_rounds = wizard_logic.number_of_rounds_to_be_played(self.number_of_players)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def playerlist(self):
+        """
+        The players of the recorded run, with their bidding parameters and rollouts,
+        so record_game(game_index, reader.playerlist(), reader.meta["seed"]) plays a game again.
+
+        Returns:
+            list[Player]: The players in seating order.
+        """
+        number_of_players = self.number_of_players
+        parameters = self.meta.get("parameters", [None] * number_of_players)
+        rollouts = self.meta.get("rollouts", [None] * number_of_players)
+        players = []
+        for (name, playing_style), player_parameters, player_rollouts in zip(self.meta["players"], parameters,
+                                                                             rollouts):
+            player = Player(name, 0, [], playing_style=playing_style)
+            player.parameters = player_parameters
+            player.rollouts = player_rollouts
+            players.append(player)
+        return players
+
+    def game_indices(self):
+        """
+        Returns:
+            list[int]: The indices of the recorded games in file order.
+        """
+        return list(self.offsets)
+
+    def read_game(self, game_index):
+        """
+        Args:
+            game_index (int): Index of the game in the run.
+
+        Returns:
+            list[dict]: Per round the trump color, hands, bids, trick winners, tricks made and points.
+        """
+        if game_index not in self.offsets:
+            raise KeyError(f"game {game_index} is not in {self.path}")
+        n = self.number_of_players
+        size = sum(1 + n * r + n + r for r in range(1, self.number_of_rounds + 1))
+        with open(self.path, "rb") as f:
+            f.seek(self.offsets[game_index])
+            record = f.read(size)
+
+        rounds = []
+        position = 0
+        for current_round in range(1, self.number_of_rounds + 1):
+            trump_color = record[position]
+            position += 1
+            hands = []
+            for seat in range(n):
+                hands.append(list(record[position:position + current_round]))
+                position += current_round
+            bids = list(record[position:position + n])
+            position += n
+            trick_winners = list(record[position:position + current_round])
+            position += current_round
+            rounds.append({"trump": trump_color, "hands": hands, "bids": bids, "trick_winners": trick_winners})
+        return _round_scores(rounds, n)
+
+    def total_points(self, game_index):
+        """
+        Returns:
+            list[int]: The final points of every seat.
+        """
+        return [sum(points) for points in zip(*(round_record["points"] for round_record in self.read_game(game_index)))]
+
+
+def write_trace(path, game_indices, playerlist, seed=42):
+    """
+    Records the given games of a seeded run into a trace file. Every game is
+    regenerated from game_rng, so the games before it are not played.
+
+    Args:
+        path (str): The trace file.
+        game_indices (iterable[int]): The games to record.
+        playerlist (list): The players in seating order.
+        seed (int or list[int]): Root seed of the run.
+
+    Returns:
+        int: Number of recorded games.
+    """
+    with TraceWriter(path, playerlist, seed) as writer:
+        for game_index in game_indices:
+            writer.write_game(game_index, record_game(game_index, playerlist, seed))
+    return len(writer.index)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record or show games of a seeded run.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="Write games into a trace file.")
+    record_parser.add_argument("output", help="The trace file.")
+    record_parser.add_argument("-n", "--players", type=int, default=3)
+    record_parser.add_argument("-g", "--games", type=int, default=100, help="Number of games.")
+    record_parser.add_argument("--first-game", type=int, default=0, help="Index of the first game.")
+    record_parser.add_argument("--seed", type=int, default=42)
+    record_parser.add_argument("--config", default=wizard_logic.DEFAULT_CONFIG_PATH)
+
+    show_parser = subparsers.add_parser("show", help="Print one game of a trace file.")
+    show_parser.add_argument("trace", help="The trace file.")
+    show_parser.add_argument("game", type=int, help="Index of the game.")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        playerlist = wizard_logic.load_player_from_config(args.config)[:args.players]
+        games = range(args.first_game, args.first_game + args.games)
+        print(f"Recorded {write_trace(args.output, games, playerlist, args.seed)} games in {args.output}")
+        return
+
+    reader = TraceReader(args.trace)
+    names = [name for name, style in reader.meta["players"]]
+    for current_round, round_record in enumerate(reader.read_game(args.game), start=1):
+        trump_color = round_record["trump"]
+        print(f"Round {current_round}, trump {colors[trump_color] if trump_color < len(colors) else 'none'}")
+        for seat, name in enumerate(names):
+            hand = ", ".join(str(CARDS[card]) for card in round_record["hands"][seat])
+            print(f"  {name:<15} hand [{hand}]  bid {round_record['bids'][seat]}  "
+                  f"made {round_record['made'][seat]}  points {round_record['points'][seat]}")
+    print(f"Total: {dict(zip(names, reader.total_points(args.game)))}")
+
+
+if __name__ == "__main__":
+    main()
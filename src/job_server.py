@@ -0,0 +1,366 @@
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from src import wizard_logic
+from src.player import Player
+from src.result_sink import CountingSink
+from src.shards import run_config
+
+# States of a job; the last three are final
+QUEUED, RUNNING, DONE, CANCELLED, FAILED = "queued", "running", "done", "cancelled", "failed"
+FINAL_STATES = (DONE, CANCELLED, FAILED)
+
+# Upper limit of a request body
+MAX_BODY_BYTES = 1024 * 1024
+
+_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            409: "Conflict", 413: "Payload Too Large"}
+
+
+class Job:
+    """
+    One submitted simulation run and its progress.
+    """
+
+    def __init__(self, job_id, key, playerlist, number_of_games, seed, chunk_size):
+        self.id = job_id
+        self.key = key
+        self.playerlist = playerlist
+        self.number_of_games = number_of_games
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.state = QUEUED
+        self.error = None
+        self.sink = CountingSink(len(playerlist))
+        self.result_path = None
+        # Set and replaced on every change, so listeners can wait for the next one
+        self.changed = asyncio.Event()
+
+    def status(self):
+        """
+        Returns:
+            dict: State, progress and interim win rates (in seating order) as plain JSON.
+        """
+        return {
+            "id": self.id,
+            "state": self.state,
+            "players": [[player.name, player.playing_style] for player in self.playerlist],
+            "seed": self.seed,
+            "games": self.number_of_games,
+            "games_done": self.sink.games,
+            "win_rates": self.sink.win_rates() if self.sink.games else None,
+            "error": self.error,
+        }
+
+    def notify(self):
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+
+class JobServer:
+    """
+    Runs submitted simulation jobs one after another on a shared process pool.
+
+    The chunks of the running job fill the pool and are merged in chunk order, so a
+    job gives the same counts as play_games(..., seed=seed, chunk_size=chunk_size).
+    A job with the same configuration, seed and number of games as a queued, running
+    or finished one is not played again; the existing job is returned instead.
+    """
+
+    def __init__(self, workers=1, config_path=wizard_logic.DEFAULT_CONFIG_PATH, output_dir="reports/jobs"):
+        """
+        Args:
+            workers (int): Number of worker processes of the pool.
+            config_path (str): Player profiles for jobs that only give a number of players.
+            output_dir (str): Folder of the result CSVs.
+        """
+        self.workers = max(1, workers)
+        self.config_path = config_path
+        self.output_dir = output_dir
+        self.jobs = {}
+        self._by_key = {}
+        self._ids = itertools.count(1)
+        self._queue = asyncio.Queue()
+        self._pool = None
+        self._runner = None
+
+    def start(self):
+        # Forked workers would inherit the sockets of open connections and keep them from closing
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                         initializer=wizard_logic._init_worker,
+                                         initargs=(wizard_logic.bid_table_directory(),))
+        self._runner = asyncio.create_task(self._run_jobs())
+
+    async def stop(self):
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, spec):
+        """
+        Queues a job, or returns the identical job that already exists.
+
+        Args:
+            spec (dict): "games", optional "seed" (42), "chunk_size" and either
+                "players" as a number of players from the config or as a list of
+                [name, playing_style] pairs in seating order.
+
+        Returns:
+            tuple: (Job, True if an existing job was returned)
+
+        Raises:
+            ValueError: If the spec is invalid.
+        """
+        playerlist = self._players(spec.get("players", 3))
+        number_of_games = spec.get("games")
+        seed = spec.get("seed", 42)
+        chunk_size = spec.get("chunk_size", wizard_logic.DEFAULT_CHUNK_SIZE)
+        for name, value in (("games", number_of_games), ("chunk_size", chunk_size)):
+            if not isinstance(value, int) or value < 1:
+                raise ValueError(f"{name} must be a positive integer")
+        if not isinstance(seed, int):
+            raise ValueError("seed must be an integer")
+
+        config = run_config(playerlist, seed, number_of_games, chunk_size)
+        key = hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()
+        existing = self._by_key.get(key)
+        if existing is not None and existing.state not in (CANCELLED, FAILED):
+            return existing, True
+
+        job = Job(str(next(self._ids)), key, playerlist, number_of_games, seed, chunk_size)
+        self.jobs[job.id] = job
+        self._by_key[key] = job
+        self._queue.put_nowait(job)
+        return job, False
+
+    def cancel(self, job):
+        """
+        Stops a queued or running job; the chunks already sent to the pool still finish.
+
+        Returns:
+            bool: False if the job had already ended.
+        """
+        if job.state in FINAL_STATES:
+            return False
+        job.state = CANCELLED
+        job.notify()
+        return True
+
+    def _players(self, players):
+        if isinstance(players, int):
+            if not 3 <= players <= 6:
+                raise ValueError("players must be between 3 and 6")
+            return wizard_logic.load_player_from_config(self.config_path)[:players]
+        if (not isinstance(players, list) or not 3 <= len(players) <= 6
+                or not all(isinstance(entry, list) and len(entry) == 2 for entry in players)):
+            raise ValueError("players must be a number or a list of 3 to 6 [name, playing_style] pairs")
+        return [Player(name, 0, [], playing_style=style) for name, style in players]
+
+    async def _run_jobs(self):
+        while True:
+            job = await self._queue.get()
+            if job.state != QUEUED:
+                continue
+            job.state = RUNNING
+            job.notify()
+            try:
+                await self._run_job(job)
+                if job.state == RUNNING:
+                    # A failing export fails this job only, the runner goes on with the next one
+                    result_path = os.path.join(self.output_dir, f"job_{job.id}.csv")
+                    wizard_logic.winning_probabilities(job.sink, job.number_of_games, job.playerlist,
+                                                       seed=job.seed, path=result_path)
+                    job.result_path = result_path
+                    job.state = DONE
+            except Exception as error:
+                job.state = FAILED
+                job.error = f"{type(error).__name__}: {error}"
+            job.notify()
+
+    async def _run_job(self, job):
+        """
+        Sends the chunks of a job to the pool, at most two per worker at a time, and
+        adds their results in chunk order.
+        """
+        loop = asyncio.get_running_loop()
+        pending = deque()
+        tasks = wizard_logic.chunk_tasks(job.number_of_games, job.playerlist, job.seed, job.chunk_size)
+
+        async def merge_next():
+            total_points = await pending.popleft()
+            if job.state != RUNNING:
+                return False
+            job.sink.add_games(total_points)
+            job.notify()
+            return True
+
+        try:
+            for task in tasks:
+                pending.append(loop.run_in_executor(self._pool, wizard_logic._play_chunk, task))
+                if len(pending) >= 2 * self.workers and not await merge_next():
+                    return
+            while pending:
+                if not await merge_next():
+                    return
+        finally:
+            # Chunks that did not start yet are dropped after a cancel
+            for future in pending:
+                future.cancel()
+
+    async def handle(self, reader, writer):
+        """
+        Serves one HTTP request:
+
+        POST /jobs (JSON spec, see submit), GET /jobs, GET /jobs/{id},
+        GET /jobs/{id}/events (one JSON status per line until the job ends),
+        GET /jobs/{id}/result (the CSV written by export_with_metadata) and
+        DELETE /jobs/{id} (cancel).
+        """
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if len(request_line) < 2:
+                return
+            method, path = request_line[0], request_line[1].split("?")[0].rstrip("/")
+
+            length = int(headers.get("content-length", 0))
+            if length > MAX_BODY_BYTES:
+                await _respond(writer, 413, {"error": "Request body too large"})
+                return
+            body = await reader.readexactly(length) if length else b""
+            await self._route(method, path.strip("/").split("/"), body, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, parts, body, writer):
+        if parts == ["jobs"]:
+            if method == "GET":
+                await _respond(writer, 200, [job.status() for job in self.jobs.values()])
+            elif method == "POST":
+                try:
+                    job, deduplicated = self.submit(json.loads(body or b"{}"))
+                except (ValueError, AttributeError) as error:
+                    await _respond(writer, 400, {"error": str(error)})
+                    return
+                await _respond(writer, 200 if deduplicated else 202, dict(job.status(), deduplicated=deduplicated))
+            else:
+                await _respond(writer, 405, {"error": f"{method} is not supported on /jobs"})
+            return
+
+        job = self.jobs.get(parts[1]) if len(parts) in (2, 3) and parts[0] == "jobs" else None
+        if job is None:
+            await _respond(writer, 404, {"error": "Unknown path or job"})
+            return
+        action = parts[2] if len(parts) == 3 else None
+
+        if method == "DELETE" and action is None:
+            if self.cancel(job):
+                await _respond(writer, 200, job.status())
+            else:
+                await _respond(writer, 409, dict(job.status(), error="The job has already ended"))
+        elif method != "GET":
+            await _respond(writer, 405, {"error": f"{method} is not supported here"})
+        elif action is None:
+            await _respond(writer, 200, job.status())
+        elif action == "events":
+            await self._stream_events(job, writer)
+        elif action == "result":
+            if job.state != DONE:
+                await _respond(writer, 409, dict(job.status(), error="The job has not finished"))
+                return
+            with open(job.result_path, "rb") as f:
+                await _respond(writer, 200, f.read(), content_type="text/csv; charset=utf-8")
+        else:
+            await _respond(writer, 404, {"error": "Unknown path or job"})
+
+    async def _stream_events(self, job, writer):
+        """
+        Sends the status of a job after every merged chunk as chunked NDJSON.
+        """
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                     b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+        while True:
+            changed = job.changed
+            line = json.dumps(job.status()).encode("utf-8") + b"\n"
+            writer.write(f"{len(line):x}\r\n".encode("ascii") + line + b"\r\n")
+            await writer.drain()
+            if job.state in FINAL_STATES:
+                break
+            await changed.wait()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+async def _respond(writer, status, content, content_type="application/json"):
+    body = content if isinstance(content, bytes) else json.dumps(content).encode("utf-8")
+    writer.write(f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: {content_type}\r\n"
+                 f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body)
+    await writer.drain()
+
+
+async def serve(host="127.0.0.1", port=8765, unix_socket=None, workers=1,
+                config_path=wizard_logic.DEFAULT_CONFIG_PATH, output_dir="reports/jobs"):
+    """
+    Runs the job server until it is interrupted.
+
+    Args:
+        host (str): Address of the HTTP server (local only by default).
+        port (int): Port of the HTTP server.
+        unix_socket (str, optional): Path of a Unix socket to listen on instead of host and port.
+        workers (int): Number of worker processes.
+        config_path (str): Player profiles for jobs that only give a number of players.
+        output_dir (str): Folder of the result CSVs.
+    """
+    job_server = JobServer(workers, config_path, output_dir)
+    job_server.start()
+    if unix_socket:
+        server = await asyncio.start_unix_server(job_server.handle, path=unix_socket)
+        print(f"Job server listening on {unix_socket}")
+    else:
+        server = await asyncio.start_server(job_server.handle, host, port)
+        print(f"Job server listening on http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await job_server.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local server that queues simulation jobs and streams their progress.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Listen on this Unix socket instead of host and port.")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Number of worker processes.")
+    parser.add_argument("--config", default=wizard_logic.DEFAULT_CONFIG_PATH)
+    parser.add_argument("--output-dir", default="reports/jobs", help="Folder of the result CSVs.")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.workers, args.config, args.output_dir))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
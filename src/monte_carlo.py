@@ -0,0 +1,338 @@
+import numpy as np
+
+from src import wizard_logic
+from src.batch_engine import SUIT, VALUE, permitted_cards_batch, choose_smart_card_batch, _blend
+from src.deck import NO_SUIT, DECK_SIZE, CARD_BITS, CARD_SUIT, BEATS, BEATS_MASKS
+
+# Rollouts per decision when a player sets no budget
+DEFAULT_ROLLOUTS = 128
+
+# Part of the seed of every decision (with the tracker's seed), so the strategy does not
+# draw from the game's stream
+MONTE_CARLO_SEED = 20260109
+
+_CARD_SHIFTS = np.arange(DECK_SIZE, dtype=np.uint64)
+_CARD_BITS64 = np.uint64(1) << _CARD_SHIFTS
+
+
+class RoundState:
+    """
+    Compact state of a round in play: the hands as bitmasks, the bids, the tricks made
+    and the cards of the running trick.
+
+    The hand orders keep the order a seat was dealt its cards in. The fixed rules play
+    the first of several cards of equal value in that order, so a rollout only plays
+    like play_round if it knows it. Seats without an order (e.g. sampled hands) break
+    such ties by card id.
+
+    Everything is plain integers and short lists, so fork() is a handful of list copies
+    and many states of the same decision (one per sampled deal) stay cheap.
+    """
+
+    __slots__ = ("hands", "trump_color", "bids", "made", "leader", "trick", "operating_color",
+                 "best_card", "winner", "orders")
+
+    def __init__(self, hands, trump_color, bids, made, leader, trick=(), operating_color=NO_SUIT,
+                 best_card=None, winner=None, orders=None):
+        """
+        Args:
+            hands (list[int]): Bitmask of the hand of every seat.
+            trump_color (int): The trump suit (NO_SUIT for none).
+            bids (list[int]): The bid of every seat.
+            made (list[int]): The tricks every seat has won so far.
+            leader (int): The seat that led the running trick.
+            trick (sequence[int]): The cards of the running trick in playing order.
+            operating_color (int): The suit that must be followed (NO_SUIT if none yet).
+            best_card (int, optional): The card leading the running trick.
+            winner (int, optional): The seat of best_card.
+            orders (list, optional): Per seat its cards in dealt order (played cards may
+                stay in it) or None for increasing card ids.
+        """
+        self.hands = list(hands)
+        self.trump_color = trump_color
+        self.bids = list(bids)
+        self.made = list(made)
+        self.leader = leader
+        self.trick = list(trick)
+        self.operating_color = operating_color
+        self.best_card = best_card
+        self.winner = winner
+        self.orders = list(orders) if orders is not None else [None] * len(self.hands)
+
+    @classmethod
+    def from_tracker(cls, tracker, seat, hand_mask, order=None):
+        """
+        The state as the player at seat sees it: its own hand, the other hands empty.
+
+        Args:
+            tracker (CardTracker): The tracker of the running round.
+            seat (int): The seat of the player.
+            hand_mask (int): The hand of the player.
+            order (sequence[int], optional): The cards of the player in dealt order.
+        """
+        hands = [0] * len(tracker.void_suits)
+        hands[seat] = hand_mask
+        orders = [None] * len(hands)
+        orders[seat] = order
+        return cls(hands, tracker.trump_color, tracker.bids, tracker.tricks_won, tracker.leader, tracker.trick,
+                   tracker.operating_color, tracker.best_card, tracker.winner, orders)
+
+    def fork(self):
+        """
+        Returns:
+            RoundState: An independent copy.
+        """
+        return RoundState(self.hands, self.trump_color, self.bids, self.made, self.leader, self.trick,
+                          self.operating_color, self.best_card, self.winner, self.orders)
+
+    @property
+    def to_play(self):
+        return (self.leader + len(self.trick)) % len(self.hands)
+
+    def legal_mask(self):
+        """
+        Returns:
+            int: Bitmask of the cards the seat to play may play.
+        """
+        return wizard_logic.permitted_cards_mask(self.hands[self.to_play], self.operating_color)
+
+    def play(self, card):
+        """
+        Plays a card for the seat to play, by the rules of play_trick, and closes the
+        trick after the last seat.
+        """
+        seat = self.to_play
+        self.hands[seat] &= ~CARD_BITS[card]
+        if self.operating_color == NO_SUIT:
+            self.operating_color = CARD_SUIT[card]
+        if not self.trick or BEATS[card][self.best_card][self.operating_color][self.trump_color]:
+            self.best_card = card
+            self.winner = seat
+        self.trick.append(card)
+        if len(self.trick) == len(self.hands):
+            self.made[self.winner] += 1
+            self.leader = self.winner
+            self.trick = []
+            self.operating_color = NO_SUIT
+            self.best_card = self.winner = None
+
+    def points(self, seat):
+        """
+        Returns:
+            int: The points of a seat if the round ended now.
+        """
+        bid, made = self.bids[seat], self.made[seat]
+        return 20 + 10 * made if bid == made else -10 * abs(bid - made)
+
+
+def sample_deals(state, seat, tracker, number_of_samples, rng):
+    """
+    Deals the cards the player at seat has not seen to the other seats, consistent
+    with the number of cards they hold and the suits they have shown void in.
+
+    Args:
+        state (RoundState): The state as the player sees it (see RoundState.from_tracker).
+        seat (int): The seat of the player.
+        tracker (CardTracker): The tracker of the running round.
+        number_of_samples (int): Number of deals.
+        rng (np.random.Generator): The random number generator.
+
+    Returns:
+        list[RoundState]: One fork of state per deal.
+    """
+    number_of_players = len(state.hands)
+    hand_size = state.hands[seat].bit_count()
+    played_in_trick = {(state.leader + position) % number_of_players for position in range(len(state.trick))}
+
+    unseen_mask = tracker.unseen_mask(state.hands[seat])
+    unseen = np.array([card for card in range(DECK_SIZE) if unseen_mask >> card & 1], dtype=np.int64)
+    unseen_suits = np.array([CARD_SUIT[card] for card in unseen.tolist()])
+
+    # Every deal is a random order of the unseen cards; each seat takes the first cards
+    # it may hold, the seats with the most voids first
+    keys = rng.random((number_of_samples, len(unseen)))
+    taken = np.zeros(keys.shape, dtype=bool)
+    masks = {}
+    others = sorted((other for other in range(number_of_players) if other != seat),
+                    key=lambda other: -tracker.void_suits[other].bit_count())
+    for other in others:
+        count = hand_size - (other in played_in_trick)
+        if count == 0:
+            masks[other] = np.zeros(number_of_samples, dtype=np.uint64)
+            continue
+        allowed = (tracker.void_suits[other] >> np.minimum(unseen_suits, NO_SUIT - 1) & 1) == 0
+        allowed |= unseen_suits == NO_SUIT
+        seat_keys = np.where(taken | ~allowed, np.inf, keys)
+        chosen = np.argsort(seat_keys, axis=1)[:, :count]
+        # Deals the voids cannot be kept in ignore them for this seat
+        stuck = np.isinf(np.take_along_axis(seat_keys, chosen, axis=1)).any(axis=1)
+        if stuck.any():
+            chosen[stuck] = np.argsort(np.where(taken[stuck], np.inf, keys[stuck]), axis=1)[:, :count]
+        np.put_along_axis(taken, chosen, True, axis=1)
+        masks[other] = np.bitwise_or.reduce(_CARD_BITS64[unseen[chosen]], axis=1)
+
+    deals = []
+    for sample in range(number_of_samples):
+        deal = state.fork()
+        for other, other_masks in masks.items():
+            deal.hands[other] = int(other_masks[sample])
+        deals.append(deal)
+    return deals
+
+
+def rollout_batch(states, aggressive=None):
+    """
+    Plays every state to the end of the round with the rules of the batch engine and
+    returns the points of the round.
+
+    All states must be at the same point of the round (same position in the running
+    trick and the same number of cards left), e.g. the deals of one decision after
+    the same number of moves.
+
+    Args:
+        states (list[RoundState]): The states, one per rollout.
+        aggressive (sequence[bool], optional): Per seat, True if it plays aggressive.
+
+    Returns:
+        np.ndarray: The (players, rollouts) points of the round.
+    """
+    number_of_games = len(states)
+    first = states[0]
+    number_of_players = len(first.hands)
+    seats = np.arange(number_of_players)
+    position = len(first.trick)
+    cards_left = max(hand.bit_count() for hand in first.hands)
+    if aggressive is None:
+        aggressive = np.zeros(number_of_players, dtype=np.int8)
+    aggressive = np.asarray(aggressive, dtype=np.int8)
+
+    # (players, cards, games) hands with the cards in hand order, padded seats
+    # (already played in the running trick) hold a card that is not available
+    hands = np.zeros((number_of_players, cards_left, number_of_games), dtype=np.int8)
+    available = np.zeros(hands.shape, dtype=bool)
+    ranks = {}
+    for seat in range(number_of_players):
+        masks = np.array([state.hands[seat] for state in states], dtype=np.uint64)
+        count = first.hands[seat].bit_count()
+        if count:
+            bits = ((masks[:, None] >> _CARD_SHIFTS) & np.uint64(1)).astype(bool)
+            # Rank of every card in the hand order, cards outside the hand last
+            for state in states:
+                order = state.orders[seat]
+                if id(order) not in ranks:
+                    ranks[id(order)] = _order_ranks(order)
+            seat_ranks = np.array([ranks[id(state.orders[seat])] for state in states])
+            in_order = np.argsort(np.where(bits, seat_ranks, DECK_SIZE), axis=1, kind="stable")
+            hands[seat, :count] = in_order[:, :count].T
+            available[seat, :count] = True
+    hand_suits = SUIT[hands]
+    hand_values = VALUE[hands]
+
+    bids = np.array(first.bids, dtype=np.int16)[:, None]
+    made = np.array([state.made for state in states], dtype=np.int16).T
+    leader = np.array([state.leader for state in states])
+    trump = np.full(number_of_games, first.trump_color, dtype=np.int8)
+
+    if position:
+        operating_color = np.array([state.operating_color for state in states], dtype=np.int8)
+        best_card = np.array([state.best_card for state in states], dtype=np.int8)
+        winner = np.array([state.winner for state in states])
+    else:
+        operating_color = np.full(number_of_games, NO_SUIT, dtype=np.int8)
+        best_card = np.zeros(number_of_games, dtype=np.int8)
+        winner = leader
+
+    while available.any():
+        for i in range(position, number_of_players):
+            # The same steps as play_round_batch
+            active = (leader + i) % number_of_players == seats[:, None]
+            hand = (active[:, None, :] * hands).sum(axis=0, dtype=np.int8)
+            suits = (active[:, None, :] * hand_suits).sum(axis=0, dtype=np.int8)
+            values = (active[:, None, :] * hand_values).sum(axis=0, dtype=np.int8)
+            hand_available = (active[:, None, :] & available).any(axis=0)
+
+            permitted = permitted_cards_batch(suits, hand_available, operating_color)
+            wants_trick = (active * (made < bids)).any(axis=0)
+            active_aggressive = (active * aggressive[:, None]).any(axis=0)
+
+            chosen = choose_smart_card_batch(hand, suits, values, permitted, best_card, operating_color,
+                                             trump, i, number_of_players, wants_trick, active_aggressive)
+            played_card = (chosen * hand).sum(axis=0, dtype=np.int8)
+            available &= ~(active[:, None, :] & chosen)
+
+            operating_color = _blend(operating_color == NO_SUIT, SUIT[played_card], operating_color)
+            if i == 0:
+                best_card = played_card
+                winner = leader
+            else:
+                beats = BEATS_MASKS[best_card, operating_color, trump]
+                takes_lead = ((beats >> played_card.astype(np.uint64)) & np.uint64(1)).astype(bool)
+                best_card = _blend(takes_lead, played_card, best_card)
+                winner = _blend(takes_lead, (leader + i) % number_of_players, winner)
+
+        made += winner == seats[:, None]
+        leader = winner
+        position = 0
+        operating_color = np.full(number_of_games, NO_SUIT, dtype=np.int8)
+
+    return _blend(bids == made, 20 + 10 * made, -10 * np.abs(bids - made))
+
+
+def _order_ranks(order):
+    """
+    Position of every card id in a hand order (None: increasing card ids).
+    """
+    if order is None:
+        return _CARD_SHIFTS.astype(np.int64)
+    ranks = np.full(DECK_SIZE, DECK_SIZE, dtype=np.int64)
+    ranks[list(order)] = np.arange(len(order))
+    return ranks
+
+
+def choose_card_monte_carlo(player, cards, tracker, rollouts=None):
+    """
+    Picks the legal card with the most points on average over sampled deals.
+
+    Every legal card is played in the same sampled deals of the unseen cards (common
+    random numbers), and the rest of the round is rolled out with the rules of the
+    batch engine: aggressive seats play aggressive, all others (this player too) normal.
+
+    Args:
+        player (Player): The active player.
+        cards (int): Bitmask of the valid cards.
+        tracker (CardTracker): The tracker of the running round.
+        rollouts (int, optional): Rollouts for the whole decision, defaults to
+            player.rollouts or DEFAULT_ROLLOUTS.
+
+    Returns:
+        int: The chosen card.
+    """
+    legal = [card for card in player.lowest_first if cards & CARD_BITS[card]]
+    if len(legal) == 1:
+        return legal[0]
+    if rollouts is None:
+        rollouts = player.rollouts or DEFAULT_ROLLOUTS
+
+    seat = tracker.to_play
+    state = RoundState.from_tracker(tracker, seat, player.hand_mask, tuple(player.cards_in_hand))
+    # Seeded from the game and what the player knows, so a decision does not depend on
+    # earlier ones and the same situation in another game samples other deals
+    game_seed = tracker.seed if tracker.seed is not None else []
+    rng = np.random.default_rng([MONTE_CARLO_SEED, *game_seed, tracker.played_mask, player.hand_mask, seat])
+    deals = sample_deals(state, seat, tracker, max(1, rollouts // len(legal)), rng)
+
+    states = []
+    for card in legal:
+        for deal in deals:
+            forked = deal.fork()
+            forked.play(card)
+            states.append(forked)
+    if any(states[0].hands):
+        aggressive = [style == "aggressive" for style in tracker.playing_styles]
+        points = rollout_batch(states, aggressive)[seat]
+    else:
+        points = np.array([state.points(seat) for state in states])
+
+    # The lowest card wins a tie
+    means = points.reshape(len(legal), len(deals)).mean(axis=1)
+    return legal[int(np.argmax(means))]
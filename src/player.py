@@ -1,9 +1,20 @@
 class Player:
+    __slots__ = ("name", "points", "cards_in_hand", "playing_style", "hand_mask", "lowest_first", "highest_first",
+                 "rollouts", "parameters")
+
     def __init__(self, name, points, cards_in_hand, playing_style="normal"):
         self.name = name
         self.points = points
         self.cards_in_hand = cards_in_hand
         self.playing_style = playing_style
+        # Bitmask of the hand and the dealt cards ordered by value, see wizard_logic.index_hand
+        self.hand_mask = 0
+        self.lowest_first = []
+        self.highest_first = []
+        # Rollouts per move of the "monte_carlo" style, None for the default
+        self.rollouts = None
+        # Bidding parameters (see wizard_logic.style_parameters), None for the defaults of the style
+        self.parameters = None
 
 
     def __str__(self):
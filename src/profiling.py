@@ -0,0 +1,107 @@
+import json
+import time
+from collections import Counter, defaultdict
+
+
+# Phases of a round in the order they are measured
+PHASES = ("shuffle", "deal", "trump", "bidding", "trick_play", "scoring", "export")
+
+
+class Profiler:
+    """
+    Collects the time spent per phase of the simulation and counts events.
+
+    The engine measures phases as laps: start() sets the clock at the beginning of
+    a round and every lap(phase) books the time since the previous lap to that phase.
+    Only two perf_counter calls per phase are needed, and nothing at all happens
+    while no profiler is active (see wizard_logic.enable_profiling).
+    """
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.laps = Counter()
+        self.counters = Counter()
+        self._last = None
+
+    def start(self):
+        """Starts the clock for the next lap."""
+        self._last = time.perf_counter()
+
+    def lap(self, phase):
+        """
+        Books the time since the previous lap (or start) to a phase.
+
+        Args:
+            phase (str): Name of the phase that just ended.
+        """
+        now = time.perf_counter()
+        if self._last is not None:
+            self.seconds[phase] += now - self._last
+            self.laps[phase] += 1
+        self._last = now
+
+    def add_time(self, phase, seconds):
+        """
+        Books a separately measured duration to a phase.
+        """
+        self.seconds[phase] += seconds
+        self.laps[phase] += 1
+
+    def count(self, event, number=1):
+        """
+        Args:
+            event (str): Name of the counter.
+            number (int): How much to add.
+        """
+        self.counters[event] += number
+
+    def merge(self, other):
+        """
+        Adds the measurements of another profiler, e.g. one sent back by a worker process.
+
+        Args:
+            other (Profiler or dict): The profiler or its to_dict() form.
+        """
+        if isinstance(other, Profiler):
+            other = other.to_dict()
+        for phase, values in other["phases"].items():
+            self.seconds[phase] += values["seconds"]
+            self.laps[phase] += values["laps"]
+        self.counters.update(other["counters"])
+        return self
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: Plain JSON form with the seconds and laps per phase and all counters.
+        """
+        return {
+            "phases": {phase: {"seconds": self.seconds[phase], "laps": self.laps[phase]} for phase in self.seconds},
+            "counters": dict(self.counters),
+        }
+
+    def dump_json(self, path):
+        """
+        Writes the to_dict() form to a JSON file.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def summary_table(self):
+        """
+        Returns:
+            pd.DataFrame: Seconds, share of the measured time and number of laps
+            per phase, followed by the counters.
+        """
+        import pandas as pd
+
+        total = sum(self.seconds.values())
+        ordered = [phase for phase in PHASES if phase in self.seconds]
+        ordered += sorted(phase for phase in self.seconds if phase not in PHASES)
+        rows = {}
+        for phase in ordered:
+            share = f"{self.seconds[phase] / total * 100:.1f}%" if total else "-"
+            rows[phase] = {"seconds": round(self.seconds[phase], 4), "share": share, "count": self.laps[phase]}
+        for event in sorted(self.counters):
+            rows[event] = {"seconds": "", "share": "", "count": self.counters[event]}
+        return pd.DataFrame.from_dict(rows, orient="index", dtype=object)
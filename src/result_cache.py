@@ -0,0 +1,242 @@
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from src import wizard_logic
+from src.result_sink import CountingSink
+
+
+DEFAULT_CACHE_DIR = "cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def cache_key(playerlist, seed, chunk_size):
+    """
+    Hash of everything that decides the games of a seeded run.
+
+    The number of games is not part of the key: game i of a run always plays on
+    game_rng(seed, i), so a run of n games is the first n games of every longer run
+    with the same key, and a cached run can be extended. The chunk size is part of
+    it because the entries store one row per chunk.
+
+    Args:
+        playerlist (list): The players in seating order.
+        seed (int or list[int]): Root seed of the run.
+        chunk_size (int): Number of games per chunk.
+
+    Returns:
+        str: The hex digest.
+    """
+    text = json.dumps(_config(playerlist, seed, chunk_size), sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _config(playerlist, seed, chunk_size):
+    """
+    The effective configuration of a seeded run, as plain JSON.
+    """
+    config = {
+        "players": [[player.name, player.playing_style] for player in playerlist],
+        "seed": seed,
+        "chunk_size": chunk_size,
+        "engine_version": wizard_logic.ENGINE_VERSION,
+    }
+    # Only part of the key when set, so the keys of existing entries stay the same
+    if any(player.rollouts is not None for player in playerlist):
+        config["rollouts"] = [player.rollouts for player in playerlist]
+    if any(player.parameters is not None for player in playerlist):
+        config["parameters"] = [player.parameters for player in playerlist]
+    bid_table_digest = wizard_logic.bid_table_digest()
+    if bid_table_digest is not None:
+        config["bid_table"] = bid_table_digest
+    return config
+
+
+class ResultCache:
+    """
+    On-disk cache of seeded simulation results.
+
+    Every entry keeps the counts of each full chunk of a run
+    ([games, ties, wins per seat..., point sums per seat..., point squares per seat...]), so a request for
+    fewer games is answered from the cache, and a request for more games only
+    plays the missing chunks. The least recently used entries are evicted once the
+    cache grows beyond max_bytes.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            directory (str): Folder of the cache files.
+            max_bytes (int): Upper limit of the total size of the cache.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def play_games(self, number_of_games, playerlist, seed=42, workers=1,
+                   chunk_size=wizard_logic.DEFAULT_CHUNK_SIZE):
+        """
+        Same result as wizard_logic.play_games(number_of_games, playerlist, seed=seed,
+        chunk_size=chunk_size), but only the games that are not cached are simulated.
+
+        Args:
+            number_of_games (int): How many full games should be simulated.
+            playerlist (list): The list of players participating in the simulation.
+            seed (int or list[int]): Root seed of the run.
+            workers (int): Number of worker processes for the missing chunks.
+            chunk_size (int): Number of games per chunk.
+
+        Returns:
+            CountingSink: The counts of all requested games.
+        """
+        key = cache_key(playerlist, seed, chunk_size)
+        chunks = self._load(key)
+        number_of_players = len(playerlist)
+        full_chunks = number_of_games // chunk_size
+
+        # Play the full chunks that are missing and store them
+        missing = full_chunks - len(chunks)
+        if missing > 0:
+            tasks = wizard_logic.chunk_tasks(missing * chunk_size, playerlist, seed, chunk_size,
+                                             first_chunk=len(chunks))
+            new_chunks = [_chunk_counts(total_points) for total_points in wizard_logic.run_chunks(tasks, workers)]
+            chunks = np.vstack([chunks.reshape(-1, 2 + 3 * number_of_players)] + new_chunks)
+            self._store(key, chunks, playerlist, seed, chunk_size)
+
+        sink = CountingSink(number_of_players)
+        if full_chunks:
+            sink.merge(_sink_from_counts(chunks[:full_chunks].sum(axis=0), number_of_players))
+
+        # A trailing partial chunk is cheap and not cached
+        rest = number_of_games - full_chunks * chunk_size
+        if rest:
+            tasks = wizard_logic.chunk_tasks(rest, playerlist, seed, chunk_size, first_chunk=full_chunks)
+            for total_points in wizard_logic.run_chunks(tasks):
+                sink.add_games(total_points)
+
+        self._evict()
+        return sink
+
+    def entries(self):
+        """
+        Returns:
+            list[dict]: Key, configuration, cached games and size of every entry,
+            the most recently used first.
+        """
+        entries = []
+        for key in self._keys():
+            with open(self._path(key, ".json"), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            data_path = self._path(key, ".npy")
+            entry["key"] = key
+            entry["games"] = len(np.load(data_path, mmap_mode="r")) * entry["chunk_size"]
+            entry["bytes"] = os.path.getsize(data_path) + os.path.getsize(self._path(key, ".json"))
+            entry["last_used"] = os.path.getmtime(data_path)
+            entries.append(entry)
+        return sorted(entries, key=lambda entry: -entry["last_used"])
+
+    def clear(self):
+        """
+        Removes every entry.
+
+        Returns:
+            int: Number of removed entries.
+        """
+        keys = self._keys()
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def _path(self, key, extension):
+        return os.path.join(self.directory, key + extension)
+
+    def _keys(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return [name[:-4] for name in os.listdir(self.directory)
+                if name.endswith(".npy") and os.path.exists(self._path(name[:-4], ".json"))]
+
+    def _load(self, key):
+        """
+        Returns the cached chunk counts of a key (empty if there are none) and marks the entry as used.
+        """
+        data_path = self._path(key, ".npy")
+        if not os.path.exists(data_path) or not os.path.exists(self._path(key, ".json")):
+            return np.zeros((0, 0), dtype=np.int64)
+        os.utime(data_path)
+        return np.load(data_path)
+
+    def _store(self, key, chunks, playerlist, seed, chunk_size):
+        """
+        Writes an entry atomically, so an interrupted run never leaves a broken entry.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(key, ".json.tmp"), "w", encoding="utf-8") as f:
+            json.dump(_config(playerlist, seed, chunk_size), f)
+        with open(self._path(key, ".npy.tmp"), "wb") as f:
+            np.save(f, chunks)
+        os.replace(self._path(key, ".json.tmp"), self._path(key, ".json"))
+        os.replace(self._path(key, ".npy.tmp"), self._path(key, ".npy"))
+
+    def _remove(self, key):
+        for extension in (".npy", ".json"):
+            if os.path.exists(self._path(key, extension)):
+                os.remove(self._path(key, extension))
+
+    def _evict(self):
+        """
+        Removes the least recently used entries until the cache fits into max_bytes.
+        """
+        entries = self.entries()
+        total_bytes = sum(entry["bytes"] for entry in entries)
+        while entries and total_bytes > self.max_bytes:
+            entry = entries.pop()
+            self._remove(entry["key"])
+            total_bytes -= entry["bytes"]
+
+
+def _chunk_counts(total_points):
+    """
+    Compacts the (games, players) final points of a chunk into one row of counts.
+    """
+    sink = CountingSink(total_points.shape[1])
+    sink.add_games(total_points)
+    return np.array([[sink.games, sink.ties] + sink.wins + sink.point_sums + sink.point_squares], dtype=np.int64)
+
+
+def _sink_from_counts(counts, number_of_players):
+    """
+    Turns a row of counts back into a CountingSink.
+    """
+    counts = [int(value) for value in counts]
+    sink = CountingSink(number_of_players)
+    sink.games, sink.ties = counts[0], counts[1]
+    sink.wins = counts[2:2 + number_of_players]
+    sink.point_sums = counts[2 + number_of_players:2 + 2 * number_of_players]
+    sink.point_squares = counts[2 + 2 * number_of_players:]
+    return sink
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the cache of simulation results.")
+    parser.add_argument("command", choices=["list", "clear"])
+    parser.add_argument("--dir", default=DEFAULT_CACHE_DIR, help="Folder of the cache.")
+    args = parser.parse_args()
+
+    cache = ResultCache(args.dir)
+    if args.command == "clear":
+        print(f"Removed {cache.clear()} cache entries.")
+        return
+
+    entries = cache.entries()
+    for entry in entries:
+        players = ", ".join(f"{name} ({style})" for name, style in entry["players"])
+        print(f"{entry['key'][:16]}  {entry['games']:>10} games  {entry['bytes']:>8} bytes  "
+              f"seed={entry['seed']}  chunk_size={entry['chunk_size']}  v{entry['engine_version']}  {players}")
+    print(f"{len(entries)} entries, {sum(entry['bytes'] for entry in entries)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import os
+import numpy as np
+
+
+class ResultSink:
+    """
+    Receives the final points of every simulated game.
+
+    Subclasses override add_game (one game) and may override add_games
+    (a (games, players) block, e.g. sent back by a worker or the batch engine).
+    Sinks that set wants_rounds also get the bids, tricks made and points of every
+    round through add_rounds, before the final points of the same games.
+    """
+
+    wants_rounds = False
+
+    def add_game(self, total_points):
+        """
+        Args:
+            total_points (sequence[int]): The final points per player in seating order.
+        """
+        raise NotImplementedError
+
+    def add_games(self, total_points):
+        """
+        Args:
+            total_points (np.ndarray): The (games, players) final points.
+        """
+        for row in total_points.tolist():
+            self.add_game(row)
+
+    def add_rounds(self, data):
+        """
+        Args:
+            data (np.ndarray): The (games, rounds, players, 3) [bid, made, points]
+                ledger rows of finished games.
+        """
+
+    def close(self):
+        """Flushes everything that is still buffered."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CountingSink(ResultSink):
+    """
+    Keeps running counts of wins, ties, point totals and sums of squared points
+    with constant memory.
+
+    A tie (several players share the highest total) is counted as a win for the
+    first of them, like winner_of_the_game, and additionally in `ties`.
+    """
+
+    def __init__(self, number_of_players):
+        """
+        Args:
+            number_of_players (int): The number of seats.
+        """
+        self.games = 0
+        self.ties = 0
+        self.wins = [0] * number_of_players
+        self.point_sums = [0] * number_of_players
+        self.point_squares = [0] * number_of_players
+
+    def add_game(self, total_points):
+        total_points = list(total_points)
+        best = max(total_points)
+        self.games += 1
+        self.wins[total_points.index(best)] += 1
+        if total_points.count(best) > 1:
+            self.ties += 1
+        for seat, points in enumerate(total_points):
+            self.point_sums[seat] += int(points)
+            self.point_squares[seat] += int(points) ** 2
+
+    def add_games(self, total_points):
+        best = total_points.max(axis=1, keepdims=True)
+        winners = np.argmax(total_points, axis=1)
+        self.games += len(total_points)
+        self.ties += int(((total_points == best).sum(axis=1) > 1).sum())
+        for seat, count in enumerate(np.bincount(winners, minlength=len(self.wins)).tolist()):
+            self.wins[seat] += count
+        total_points = total_points.astype(np.int64)
+        for seat, points in enumerate(total_points.sum(axis=0).tolist()):
+            self.point_sums[seat] += points
+        for seat, squares in enumerate((total_points * total_points).sum(axis=0).tolist()):
+            self.point_squares[seat] += squares
+
+    def merge(self, other):
+        """
+        Adds the counts of another CountingSink (e.g. from a cache or another shard).
+
+        Args:
+            other (CountingSink): The counts to add.
+        """
+        self.games += other.games
+        self.ties += other.ties
+        self.wins = [a + b for a, b in zip(self.wins, other.wins)]
+        self.point_sums = [a + b for a, b in zip(self.point_sums, other.point_sums)]
+        self.point_squares = [a + b for a, b in zip(self.point_squares, other.point_squares)]
+        return self
+
+    def win_rates(self):
+        """
+        Returns:
+            list[float]: The share of games won per seat.
+        """
+        return [wins / self.games if self.games else 0.0 for wins in self.wins]
+
+    def mean_points(self):
+        """
+        Returns:
+            list[float]: The average final points per seat.
+        """
+        return [points / self.games if self.games else 0.0 for points in self.point_sums]
+
+    def point_variances(self):
+        """
+        Returns:
+            list[float]: The sample variance of the final points per seat.
+        """
+        if self.games < 2:
+            return [0.0] * len(self.point_sums)
+        return [(squares - sums * sums / self.games) / (self.games - 1)
+                for sums, squares in zip(self.point_sums, self.point_squares)]
+
+
+class GameLogSink(ResultSink):
+    """
+    Streams one CSV row per game (index, winner seat, points per seat) to an
+    append-only file. Rows are written in chunks, so everything up to the last
+    flushed chunk survives a crash.
+    """
+
+    def __init__(self, path, player_names, chunk_size=10_000, first_game_index=0):
+        """
+        Args:
+            path (str): The file to append to (created with a header if missing).
+            player_names (list[str]): The names of the players in seating order.
+            chunk_size (int): Number of rows buffered before they are written.
+            first_game_index (int): Index of the first game written by this sink.
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.next_game_index = first_game_index
+        self._rows = []
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "a", encoding="utf-8")
+        if new_file:
+            self._file.write(",".join(["game", "winner"] + list(player_names)) + "\n")
+            self._file.flush()
+
+    def add_game(self, total_points):
+        total_points = [int(points) for points in total_points]
+        winner = total_points.index(max(total_points))
+        self._rows.append(",".join(map(str, [self.next_game_index, winner] + total_points)))
+        self.next_game_index += 1
+        if len(self._rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Appends the buffered rows to the file."""
+        if self._rows:
+            self._file.write("\n".join(self._rows) + "\n")
+            self._rows = []
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+class MultiSink(ResultSink):
+    """Forwards every game to several sinks, e.g. counts plus an on-disk log."""
+
+    def __init__(self, *sinks):
+        self.sinks = sinks
+        self.wants_rounds = any(sink.wants_rounds for sink in sinks)
+
+    def add_rounds(self, data):
+        for sink in self.sinks:
+            if sink.wants_rounds:
+                sink.add_rounds(data)
+
+    def add_game(self, total_points):
+        for sink in self.sinks:
+            sink.add_game(total_points)
+
+    def add_games(self, total_points):
+        for sink in self.sinks:
+            sink.add_games(total_points)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
@@ -0,0 +1,100 @@
+import numpy as np
+
+
+# Positions of the three categories in the last axis of the ledger
+BID = 0
+MADE = 1
+POINTS = 2
+
+CATEGORIES = ["announced_tricks", "tricks_made", "points"]
+
+
+class ScoreLedger:
+    """
+    Preallocated score sheet for many games, backed by a single NumPy array.
+
+    The array has the shape (games, rounds, players, 3) where the last axis holds
+    [announced_tricks, tricks_made, points]. The game loop writes into it with plain
+    integer indexing; a pandas DataFrame is only built on request for display and export.
+    """
+
+    def __init__(self, number_of_games, number_of_rounds, player_names):
+        """
+        Args:
+            number_of_games (int): How many games the ledger has room for.
+            number_of_rounds (int): The number of rounds of each game.
+            player_names (list[str]): The names of the players in seating order.
+        """
+        self.player_names = list(player_names)
+        self.number_of_rounds = number_of_rounds
+        self.data = np.zeros((number_of_games, number_of_rounds, len(self.player_names), 3), dtype=np.int16)
+
+    @classmethod
+    def from_array(cls, data, player_names):
+        """
+        Wraps an existing (games, rounds, players, 3) array, e.g. one sent back by a worker.
+
+        Args:
+            data (np.ndarray): The score array.
+            player_names (list[str]): The names of the players in seating order.
+        """
+        ledger = cls(0, data.shape[1], player_names)
+        ledger.data = data
+        return ledger
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def game(self, game_index):
+        """
+        Returns the (rounds, players, 3) view of a single game.
+
+        Args:
+            game_index (int): The index of the game inside the ledger.
+        """
+        return self.data[game_index]
+
+    def total_points(self, game_index):
+        """
+        Sums up the points of every player over all rounds of one game.
+
+        Args:
+            game_index (int): The index of the game inside the ledger.
+
+        Returns:
+            np.ndarray: The total points per player in seating order.
+        """
+        return self.data[game_index, :, :, POINTS].sum(axis=0)
+
+    def all_total_points(self):
+        """
+        Returns the total points of every game as a (games, players) array.
+        """
+        return self.data[:, :, :, POINTS].sum(axis=1)
+
+    def winner_indices(self):
+        """
+        Returns the seat index of the winner of every game (first player wins a tie).
+        """
+        return np.argmax(self.all_total_points(), axis=1)
+
+    def to_dataframe(self, game_index=0):
+        """
+        Builds the classic MultiIndex points table (incl. the 'total' row) for one game.
+
+        Args:
+            game_index (int): The index of the game inside the ledger.
+
+        Returns:
+            pd.DataFrame: The same table the simulation used to keep in pandas.
+        """
+        from src.wizard_logic import create_points_table, add_points, calculate_total_points
+
+        table = create_points_table(self.player_names)
+        for round_index, round_scores in enumerate(self.data[game_index]):
+            round_data = {name: [int(value) for value in round_scores[seat]]
+                          for seat, name in enumerate(self.player_names)}
+            table = add_points(table, round_index + 1, round_data)
+        table = table.astype(int)
+        table, total_points = calculate_total_points(table)
+        return table
@@ -0,0 +1,214 @@
+import argparse
+import json
+import os
+
+from src import wizard_logic
+from src.player import Player
+from src.result_sink import CountingSink
+
+# Marks a partial-result file and the version of its layout
+PARTIAL_FORMAT = "wizard-partial-result"
+PARTIAL_VERSION = 1
+
+
+def parse_shard(text):
+    """
+    Reads a shard spec like "3/8" (shard 3 of 8, counted from 0).
+
+    Returns:
+        tuple[int, int]: (i, k)
+    """
+    try:
+        index, count = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard {text!r}, expected i/k") from None
+    if not 0 <= index < count:
+        raise ValueError(f"Invalid shard {text!r}, expected 0 <= i < k")
+    return index, count
+
+
+def run_config(playerlist, seed, number_of_games, chunk_size):
+    """
+    Everything that decides the games of a sharded run; shards can only be merged
+    if it is identical.
+    """
+    config = {
+        "players": [[player.name, player.playing_style] for player in playerlist],
+        "seed": seed,
+        "games": number_of_games,
+        "chunk_size": chunk_size,
+        "engine_version": wizard_logic.ENGINE_VERSION,
+    }
+    if any(player.rollouts is not None for player in playerlist):
+        config["rollouts"] = [player.rollouts for player in playerlist]
+    if any(player.parameters is not None for player in playerlist):
+        config["parameters"] = [player.parameters for player in playerlist]
+    bid_table_digest = wizard_logic.bid_table_digest()
+    if bid_table_digest is not None:
+        config["bid_table"] = bid_table_digest
+    return config
+
+
+def play_shard(number_of_games, playerlist, shard, seed=42, workers=1,
+               chunk_size=wizard_logic.DEFAULT_CHUNK_SIZE, path=None):
+    """
+    Plays one shard of a run and writes its partial-result file.
+
+    Args:
+        number_of_games (int): Number of games of the whole run.
+        playerlist (list): The players in seating order.
+        shard (tuple[int, int]): (i, k), see wizard_logic.shard_chunks.
+        seed (int): Root seed of the run.
+        workers (int): Number of worker processes on this machine.
+        chunk_size (int): Number of games per chunk.
+        path (str, optional): The partial-result file, defaults to reports/shards/shard_{i}_of_{k}.json.
+
+    Returns:
+        str: The path of the written file.
+    """
+    sink = wizard_logic.play_games(number_of_games, playerlist, workers=workers, seed=seed,
+                                   chunk_size=chunk_size, shard=shard)
+    if path is None:
+        path = f"reports/shards/shard_{shard[0]}_of_{shard[1]}.json"
+    write_partial(path, sink, run_config(playerlist, seed, number_of_games, chunk_size), shard)
+    return path
+
+
+def write_partial(path, sink, config, shard):
+    """
+    Writes the counts of a shard with the configuration of its run (atomically).
+
+    Args:
+        path (str): The partial-result file.
+        sink (CountingSink): The counts of the shard.
+        config (dict): The run configuration (see run_config).
+        shard (tuple[int, int]): (i, k)
+    """
+    partial = {
+        "format": PARTIAL_FORMAT,
+        "version": PARTIAL_VERSION,
+        "config": config,
+        "shard": list(shard),
+        "games": sink.games,
+        "ties": sink.ties,
+        "wins": sink.wins,
+        "point_sums": sink.point_sums,
+        "point_squares": sink.point_squares,
+    }
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(partial, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def read_partial(path):
+    """
+    Returns:
+        dict: The content of a partial-result file.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        partial = json.load(f)
+    if partial.get("format") != PARTIAL_FORMAT or partial.get("version") != PARTIAL_VERSION:
+        raise ValueError(f"{path} is not a partial-result file of version {PARTIAL_VERSION}")
+    return partial
+
+
+def merge_partials(paths):
+    """
+    Adds up the counts of several shards of the same run.
+
+    Args:
+        paths (list[str]): Partial-result files.
+
+    Returns:
+        tuple: (config, CountingSink, missing shard indices)
+
+    Raises:
+        ValueError: If the shards belong to different runs (players, seed, games,
+            chunk size, engine version or number of shards) or a shard appears twice.
+    """
+    if not paths:
+        raise ValueError("No partial-result files given")
+
+    partials = [read_partial(path) for path in paths]
+    config = partials[0]["config"]
+    count = partials[0]["shard"][1]
+    number_of_players = len(config["players"])
+    sink = CountingSink(number_of_players)
+    seen = {}
+    for path, partial in zip(paths, partials):
+        if partial["config"] != config or partial["shard"][1] != count:
+            raise ValueError(f"{path} belongs to a different run than {paths[0]}")
+        index = partial["shard"][0]
+        if index in seen:
+            raise ValueError(f"Shard {index}/{count} is in both {seen[index]} and {path}")
+        seen[index] = path
+
+        shard_sink = CountingSink(number_of_players)
+        shard_sink.games, shard_sink.ties = partial["games"], partial["ties"]
+        shard_sink.wins = partial["wins"]
+        shard_sink.point_sums = partial["point_sums"]
+        shard_sink.point_squares = partial["point_squares"]
+        sink.merge(shard_sink)
+
+    missing = [index for index in range(count) if index not in seen]
+    return config, sink, missing
+
+
+def merge_report(paths, output=None):
+    """
+    Merges shards and exports the winning_probabilities report of the combined games.
+
+    Args:
+        paths (list[str]): Partial-result files.
+        output (str, optional): Path of the report CSV.
+
+    Returns:
+        pd.DataFrame: The report.
+    """
+    config, sink, missing = merge_partials(paths)
+    if missing:
+        print(f"Missing shards {missing}, the report covers {sink.games} of {config['games']} games.")
+    playerlist = [Player(name, 0, [], playing_style=style) for name, style in config["players"]]
+    return wizard_logic.winning_probabilities(sink, sink.games, playerlist, seed=config["seed"], path=output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play shards of a run or merge their partial results.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Play one shard and write its partial-result file.")
+    run_parser.add_argument("shard", help="i/k: shard i (counted from 0) of k.")
+    run_parser.add_argument("-n", "--players", type=int, default=3)
+    run_parser.add_argument("-g", "--games", type=int, default=1000, help="Number of games of the whole run.")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("-w", "--workers", type=int, default=1)
+    run_parser.add_argument("--chunk-size", type=int, default=wizard_logic.DEFAULT_CHUNK_SIZE)
+    run_parser.add_argument("--config", default=wizard_logic.DEFAULT_CONFIG_PATH)
+    run_parser.add_argument("-o", "--output", help="The partial-result file.")
+
+    merge_parser = subparsers.add_parser("merge", help="Merge partial-result files into the final report.")
+    merge_parser.add_argument("partials", nargs="+", help="Partial-result files of the same run.")
+    merge_parser.add_argument("-o", "--output", help="Path of the report CSV.")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        playerlist = wizard_logic.load_player_from_config(args.config)[:args.players]
+        path = play_shard(args.games, playerlist, parse_shard(args.shard), seed=args.seed, workers=args.workers,
+                          chunk_size=args.chunk_size, path=args.output)
+        print(f"Shard {args.shard} written to {path}")
+        return 0
+
+    try:
+        report = merge_report(args.partials, args.output)
+    except ValueError as error:
+        print(f"Cannot merge: {error}")
+        return 1
+    print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,232 @@
+import copy
+import hashlib
+import itertools
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from src import wizard_logic
+from src.shards import run_config
+from src.result_sink import CountingSink
+
+
+DEFAULT_CHECKPOINT_DIR = "reports/sweep_checkpoints"
+
+
+def sweep_cells(player_counts=(3, 4, 5, 6), style_assignments=(("aggressive",),), seat_positions=None,
+                game_counts=(1000,)):
+    """
+    Builds the grid of a parameter sweep.
+
+    A style assignment lists the styles of the first players of the config, everyone
+    else plays "normal". The seat position is where the first of them sits.
+
+    Args:
+        player_counts (iterable[int]): Numbers of players (3-6).
+        style_assignments (iterable[tuple[str]]): Styles of the first players.
+        seat_positions (iterable[int], optional): Seats of the first player,
+            defaults to every seat of the table.
+        game_counts (iterable[int]): Numbers of games per cell.
+
+    Returns:
+        list[dict]: One dictionary per cell.
+    """
+    cells = []
+    for number_of_players, styles, games in itertools.product(player_counts, style_assignments, game_counts):
+        seats = range(number_of_players) if seat_positions is None else seat_positions
+        for seat in seats:
+            if seat < number_of_players and len(styles) <= number_of_players:
+                cells.append({"players": number_of_players, "styles": list(styles), "seat": seat, "games": games})
+    return cells
+
+
+def cell_key(cell, seed):
+    """
+    Stable identifier of a cell, used for its random stream and its checkpoint file.
+    """
+    text = json.dumps([cell["players"], cell["styles"], cell["seat"], cell["games"], seed])
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def cell_playerlist(cell, full_playerlist):
+    """
+    Seats the players of a cell: the first n players of the config with the assigned
+    styles, rotated so that the first player sits at the wanted seat.
+    """
+    playerlist = copy.deepcopy(full_playerlist[:cell["players"]])
+    for index, player in enumerate(playerlist):
+        player.playing_style = cell["styles"][index] if index < len(cell["styles"]) else "normal"
+    shift = (-cell["seat"]) % len(playerlist)
+    return playerlist[shift:] + playerlist[:shift]
+
+
+def run_sweep(cells, seed=42, workers=1, chunk_size=wizard_logic.DEFAULT_CHUNK_SIZE,
+              checkpoint_dir=DEFAULT_CHECKPOINT_DIR, filename="sweep_results", full_playerlist=None, path=None):
+    """
+    Runs every cell of a sweep on one shared process pool.
+
+    All cells are cut into chunks of chunk_size games and the chunks go into one queue,
+    largest cells first. Idle workers simply take the next chunk, so a large cell
+    never leaves the other workers waiting. A finished cell is written to its own
+    checkpoint file right away, together with the configuration it was played with.
+    Cells with a checkpoint of the same configuration are skipped on the next run, so
+    an interrupted sweep resumes where it stopped; a checkpoint of other players,
+    parameters, rollouts, bid table or engine version is played again.
+
+    Every cell plays on the stream of its cell key, so its result equals
+    play_games(games, players, seed=<cell stream>, chunk_size=chunk_size).
+
+    Args:
+        cells (list[dict]): The grid, see sweep_cells.
+        seed (int): Root seed of the sweep.
+        workers (int): Number of worker processes.
+        chunk_size (int): Number of games per task.
+        checkpoint_dir (str): Folder for the per-cell checkpoints.
+        filename (str): Name of the combined result table in 'reports' (without extension).
+        full_playerlist (list, optional): The players to choose from, defaults to the config.
+        path (str, optional): Full path of the result table, replaces the filename in 'reports'.
+
+    Returns:
+        pd.DataFrame: One row per cell and player.
+    """
+    if full_playerlist is None:
+        full_playerlist = wizard_logic.load_player_from_config()
+    os.makedirs(checkpoint_dir, exist_ok=True)
+
+    results = {}
+    todo = []
+    for cell in cells:
+        key = cell_key(cell, seed)
+        playerlist = cell_playerlist(cell, full_playerlist)
+        config = _cell_config(cell, playerlist, seed, chunk_size)
+        checkpoint_path = os.path.join(checkpoint_dir, f"cell_{key}.json")
+        checkpoint = None
+        if os.path.exists(checkpoint_path):
+            with open(checkpoint_path, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        # A checkpoint of other players, parameters, bid table or engine is stale and is played again
+        if checkpoint is not None and checkpoint.get("config") == config:
+            results[key] = checkpoint
+        else:
+            todo.append((key, cell, playerlist, config))
+
+    # Chunk tasks of all open cells, the largest cells first
+    tasks = []
+    sinks = {}
+    remaining = {}
+    for key, cell, playerlist, config in sorted(todo, key=lambda item: -item[1]["games"] * item[1]["players"]):
+        number_of_chunks = math.ceil(cell["games"] / chunk_size)
+        cell_tasks = wizard_logic.chunk_tasks(cell["games"], playerlist, [seed, int(key, 16)], chunk_size)
+        for chunk, task in enumerate(cell_tasks):
+            tasks.append((key, chunk, task))
+        sinks[key] = CountingSink(len(playerlist))
+        remaining[key] = {"chunks": {}, "count": number_of_chunks, "cell": cell, "playerlist": playerlist,
+                          "config": config}
+
+    def finish(key, chunk, total_points):
+        state = remaining[key]
+        state["chunks"][chunk] = total_points
+        if len(state["chunks"]) == state["count"]:
+            # Merge in chunk order, so the result does not depend on the scheduling
+            for index in range(state["count"]):
+                sinks[key].add_games(state["chunks"][index])
+            results[key] = _cell_result(state["cell"], state["playerlist"], sinks[key], state["config"])
+            checkpoint_path = os.path.join(checkpoint_dir, f"cell_{key}.json")
+            _write_checkpoint(checkpoint_path, results[key])
+            del remaining[key]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=wizard_logic._init_worker,
+                                 initargs=(wizard_logic.bid_table_directory(),)) as executor:
+            pending = {}
+            task_iterator = iter(tasks)
+            for key, chunk, task in itertools.islice(task_iterator, 4 * workers):
+                pending[executor.submit(wizard_logic._play_chunk, task)] = (key, chunk)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key, chunk = pending.pop(future)
+                    finish(key, chunk, future.result())
+                    for next_key, next_chunk, next_task in itertools.islice(task_iterator, 1):
+                        pending[executor.submit(wizard_logic._play_chunk, next_task)] = (next_key, next_chunk)
+    else:
+        saved_rng = wizard_logic.rng
+        try:
+            for key, chunk, task in tasks:
+                finish(key, chunk, wizard_logic._play_chunk(task))
+        finally:
+            wizard_logic.rng = saved_rng
+
+    table = sweep_table([results[cell_key(cell, seed)] for cell in cells])
+    wizard_logic.export_with_metadata(table, filename, seed=seed, path=path)
+    return table
+
+
+def _cell_config(cell, playerlist, seed, chunk_size):
+    """
+    Everything that decides the games of a cell (players, styles, parameters, rollouts,
+    bid table, engine version), as it reads back from a checkpoint.
+    """
+    config = run_config(playerlist, seed, cell["games"], chunk_size)
+    # The JSON round trip turns tuples into lists, so it compares equal to a loaded checkpoint
+    return json.loads(json.dumps(config))
+
+
+def _cell_result(cell, playerlist, sink, config):
+    """
+    Plain-JSON result of one finished cell, with the configuration it was played with.
+    """
+    return {
+        "cell": cell,
+        "config": config,
+        "ties": sink.ties,
+        "seats": [
+            {
+                "seat": seat,
+                "player": player.name,
+                "style": player.playing_style,
+                "wins": sink.wins[seat],
+                "win_rate": sink.wins[seat] / sink.games,
+                "mean_points": sink.point_sums[seat] / sink.games,
+            }
+            for seat, player in enumerate(playerlist)
+        ],
+    }
+
+
+def _write_checkpoint(path, data):
+    """
+    Writes a JSON file atomically, so an interrupted run never leaves a half-written checkpoint.
+    """
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(temporary_path, path)
+
+
+def sweep_table(cell_results):
+    """
+    Combines cell results into one long table.
+
+    Args:
+        cell_results (list[dict]): Results as stored in the checkpoints.
+
+    Returns:
+        pd.DataFrame: One row per cell and seat.
+    """
+    import pandas as pd
+
+    rows = []
+    for result in cell_results:
+        cell = result["cell"]
+        for seat in result["seats"]:
+            rows.append({
+                "player_count": cell["players"],
+                "styles": "/".join(cell["styles"]),
+                "first_player_seat": cell["seat"],
+                "games": cell["games"],
+                "ties": result["ties"],
+                **seat,
+            })
+    return pd.DataFrame(rows)
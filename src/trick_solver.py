@@ -0,0 +1,642 @@
+import argparse
+import math
+
+from src import wizard_logic
+from src.wizard_logic import permitted_cards_mask
+from src.deck import NO_SUIT, CARD_SUIT, CARD_VALUE, CARD_BITS, BEATS, BEATS_BITS, SUIT_MASKS, WIZARD_MASK, JESTER_MASK
+from src.score_ledger import ScoreLedger, BID, MADE
+
+# Positions with fewer tricks left are not stored in the transposition table
+TABLE_MIN_TRICKS = 2
+
+# Bit of the value 1 of every suit in a hand mask, the values 1 to 13 follow it
+_SUIT_SHIFTS = (2, 17, 32, 47)
+_VALUE_BITS = 8191
+
+
+class TrickSolver:
+    """
+    Exact open-hand solver for the tricks of one round.
+
+    All hands are visible. The focal player pursues one goal and all other players
+    work together against it, which turns the round into a two-sided game that
+    alpha-beta search solves exactly. The goals are
+    - the most tricks the focal player can be sure to take (maximize=True),
+    - the fewest tricks the focal player can be sure not to exceed (maximize=False),
+    - taking exactly a given number of tricks (can_make).
+    The legal moves and the trick winner follow permitted_cards_mask and the BEATS
+    table behind is_stronger.
+
+    The search is kept small by
+    - zero-window searches (MTD(f)) that narrow down the number of tricks,
+    - a transposition table at trick boundaries holding a lower and an upper bound,
+      kept for the lifetime of the solver, so all probes of solve and all calls of
+      can_make share it,
+    - rank-equivalence classes as keys: every search reports which cards won a
+      trick by their rank against a card of the same suit. Below the lowest such
+      card of a suit only the number of cards per hand matters, so an entry stores
+      the owners of the higher cards only and serves every position that agrees
+      with it there and in the suit lengths,
+    - quick tricks: the Wizards and Jesters of both sides bound the result before
+      any search (see _quick_tricks),
+    - equivalent cards: cards of one hand that are neighbours in their suit among
+      all cards still in play (or two Wizards, two Jesters) are only tried once,
+    - move ordering: the side that wants the focal player to win a trick tries
+      the cards that take the lead first, the other side the cards that don't.
+    """
+
+    def __init__(self, hands, trump_color, focal_seat, maximize=True):
+        """
+        Args:
+            hands (list[int]): Bitmask of every hand in seating order (equal sizes).
+            trump_color (int): The trump suit (NO_SUIT for none).
+            focal_seat (int): The player whose tricks are counted.
+            maximize (bool): Default goal of solve, True for the most tricks the focal
+                player can be sure to take, False for the fewest tricks they can be
+                sure not to exceed.
+        """
+        self.hands = tuple(hands)
+        self.trump_color = trump_color
+        self.focal_seat = focal_seat
+        self.maximize = maximize
+        self.number_of_players = len(hands)
+        # Per goal (most, fewest, exactly) the bounds of exact positions and of rank-equivalence
+        # classes. They live as long as the solver, so repeated calls build on each other.
+        self.tables = {goal: ({}, {}) for goal in (True, False, None)}
+        self.nodes = 0
+        # The goal of the running search: _goal is set while can_make runs (the searches
+        # then carry the tricks still needed), otherwise _maximize tells most from fewest
+        self._goal = None
+        self._maximize = maximize
+        self.positions, self.table = self.tables[maximize]
+
+    def solve(self, leader, guess=None, maximize=None):
+        """
+        Args:
+            leader (int): The seat that leads the first trick.
+            guess (int, optional): Expected result, a good guess saves searches.
+            maximize (bool, optional): Overrides the goal given to the constructor.
+
+        Returns:
+            int: The number of tricks the focal player takes with best play of both sides.
+        """
+        if maximize is None:
+            maximize = self.maximize
+        self._goal = None
+        self._maximize = maximize
+        self.positions, self.table = self.tables[maximize]
+        tricks = self.hands[0].bit_count()
+        if guess is None:
+            guess = tricks // self.number_of_players
+        # The search counts the tricks that are good for the focal player
+        value = guess if maximize else tricks - guess
+        lower, upper = 0, tricks
+        while lower < upper:
+            beta = value + 1 if value == lower else value
+            value = self._search(self.hands, leader, beta - 1, beta, 0)[0]
+            if value < beta:
+                upper = value
+            else:
+                lower = value
+        return value if maximize else tricks - value
+
+    def can_make(self, leader, tricks):
+        """
+        Positions already solved for the most or the fewest tricks on this solver
+        prune the search: the focal player cannot take exactly `tricks` if the other
+        players can hold them below it or push them above it.
+
+        Args:
+            leader (int): The seat that leads the first trick.
+            tricks (int): The number of tricks the focal player wants, usually the bid.
+
+        Returns:
+            bool: True if the focal player can take exactly this many tricks whatever
+            the other players do.
+        """
+        self._goal = True
+        self.positions, self.table = self.tables[None]
+        try:
+            return self._search(self.hands, leader, 0, 1, tricks)[0] == 1
+        finally:
+            self._goal = None
+
+    def _search(self, hands, leader, alpha, beta, needed):
+        """
+        Value of the position at the start of a trick: with can_make 1 if the focal
+        player takes exactly `needed` more tricks, otherwise the tricks it wants.
+
+        Returns:
+            tuple[int, int]: The value and the mask of the cards whose rank decided it.
+        """
+        remaining_tricks = hands[0].bit_count()
+        if self._goal is not None:
+            if needed < 0 or needed > remaining_tricks:
+                return 0, 0
+            if remaining_tricks == 0:
+                return 1, 0
+        elif remaining_tricks == 0:
+            return 0, 0
+        if remaining_tricks == 1:
+            return self._last_trick(hands, leader, needed)
+
+        # Sure tricks of both sides: the focal player takes between fewest and most
+        fewest, most = self._quick_tricks(hands, remaining_tricks)
+        if self._goal is not None:
+            if not fewest <= needed <= most:
+                return 0, 0
+            # The other players can hold the focal player below or push them above the goal
+            known_most = self.tables[True][0].get((hands, leader, 0))
+            if known_most is not None and known_most[1] < needed:
+                return 0, known_most[2]
+            known_fewest = self.tables[False][0].get((hands, leader, 0))
+            if known_fewest is not None and remaining_tricks - known_fewest[1] > needed:
+                return 0, known_fewest[2]
+        else:
+            if not self._maximize:
+                fewest, most = remaining_tricks - most, remaining_tricks - fewest
+            if fewest >= beta:
+                return fewest, 0
+            if most <= alpha:
+                return most, 0
+
+        position_key = (hands, leader, needed)
+        known = self.positions.get(position_key)
+        if known is not None:
+            lower, upper, rank_cards = known
+            if lower >= beta:
+                return lower, rank_cards
+            if upper <= alpha:
+                return upper, rank_cards
+
+        # Positions that agree in the owners of every card whose rank counted share the entry
+        in_play = _remaining_cards(hands)
+        key = _aggregate_key(hands, leader, needed)
+        ranks = _SuitRanks(hands, in_play)
+        entries = self.table.get(key)
+        if entries is not None:
+            for depths, patterns in entries.items():
+                bounds = patterns.get(ranks.pattern(depths))
+                if bounds is None:
+                    continue
+                lower, upper = bounds
+                if lower >= beta:
+                    return lower, ranks.depth_cards(depths)
+                if upper <= alpha:
+                    return upper, ranks.depth_cards(depths)
+        else:
+            entries = self.table[key] = {}
+
+        value, rank_cards = self._play(hands, leader, 0, 0, in_play, None, leader, NO_SUIT, alpha, beta, needed)
+
+        if known is None:
+            lower, upper = 0, remaining_tricks
+        else:
+            lower, upper = known[0], known[1]
+            rank_cards |= known[2]
+        if value <= alpha:
+            upper = min(upper, value)
+        elif value >= beta:
+            lower = max(lower, value)
+        else:
+            lower = upper = value
+        self.positions[position_key] = (lower, upper, rank_cards)
+        depths = ranks.depths(rank_cards)
+        entries.setdefault(depths, {})[ranks.pattern(depths)] = (lower, upper)
+        return value, rank_cards
+
+    def _last_trick(self, hands, leader, needed):
+        """
+        The last trick needs no search, every player holds a single card.
+        """
+        self.nodes += 1
+        number_of_players = self.number_of_players
+        trump_color = self.trump_color
+        best_card = hands[leader].bit_length() - 1
+        best_seat = leader
+        operating_color = CARD_SUIT[best_card]
+        trick_mask = hands[leader]
+        for position in range(1, number_of_players):
+            seat = (leader + position) % number_of_players
+            card = hands[seat].bit_length() - 1
+            trick_mask |= hands[seat]
+            if operating_color == NO_SUIT:
+                operating_color = CARD_SUIT[card]
+            if BEATS[card][best_card][operating_color][trump_color]:
+                best_card, best_seat = card, seat
+        focal_won = best_seat == self.focal_seat
+        if self._goal is not None:
+            value = int(focal_won == needed)
+        else:
+            value = int(focal_won == self._maximize)
+        return value, _contested(best_card, trick_mask)
+
+    def _quick_tricks(self, hands, remaining_tricks):
+        """
+        Bounds on the tricks of the focal player that hold however the cards are played.
+
+        A Wizard wins unless a Wizard was played before it in the trick, so every
+        Wizard of one side is a trick unless a Wizard of the other side spoils it, and
+        every Wizard spoils at most one. A Jester only wins a trick of nothing but
+        Jesters, which takes a Jester from every other player. Both depend on counts
+        only, not on ranks.
+
+        Returns:
+            tuple[int, int]: The fewest and the most tricks of the focal player.
+        """
+        focal_seat = self.focal_seat
+        focal_hand = hands[focal_seat]
+        focal_wizards = (focal_hand & WIZARD_MASK).bit_count()
+        other_wizards = 0
+        other_jesters = 0
+        most_other_wizards = 0
+        for seat, hand in enumerate(hands):
+            if seat != focal_seat:
+                wizards = (hand & WIZARD_MASK).bit_count()
+                other_wizards += wizards
+                most_other_wizards = max(most_other_wizards, wizards)
+                other_jesters += (hand & JESTER_MASK).bit_count()
+        fewest = max(0, focal_wizards - other_wizards)
+        # The Wizards of one other player fall into different tricks
+        most = remaining_tricks - max(0, most_other_wizards - focal_wizards)
+        focal_jesters = (focal_hand & JESTER_MASK).bit_count()
+        most = min(most, remaining_tricks - focal_jesters
+                   + min(focal_jesters, other_jesters // (self.number_of_players - 1)))
+        return fewest, max(most, fewest)
+
+    def _play(self, hands, leader, position, trick_mask, in_play, best_card, best_seat, operating_color, alpha, beta,
+              needed):
+        """
+        Value of the position inside a trick, `position` cards have been played.
+        in_play holds the cards of the hands and of the trick.
+
+        Returns:
+            tuple[int, int]: The value and the mask of the cards whose rank decided it.
+        """
+        self.nodes += 1
+        number_of_players = self.number_of_players
+
+        if position == number_of_players:
+            # Trick complete: the winner leads the next one
+            focal_won = best_seat == self.focal_seat
+            if self._goal is not None:
+                value, rank_cards = self._search(hands, best_seat, alpha, beta, needed - focal_won)
+            else:
+                won = focal_won == self._maximize
+                value, rank_cards = self._search(hands, best_seat, alpha - won, beta - won, 0)
+                value += won
+            return value, rank_cards | _contested(best_card, trick_mask)
+
+        seat = (leader + position) % number_of_players
+        hand = hands[seat]
+        legal = permitted_cards_mask(hand, operating_color)
+        trump_color = self.trump_color
+
+        # The focal player maximizes the value, everybody else minimizes it
+        is_max_node = seat == self.focal_seat
+        # Whether the focal player wants (more) tricks
+        wants_tricks = self._maximize if self._goal is None else needed > 0
+        if best_card is None:
+            beats_mask = legal & ~JESTER_MASK
+        else:
+            beats_mask = legal & BEATS_BITS[best_card][operating_color][trump_color]
+        if is_max_node or best_card is None:
+            wants_lead = wants_tricks
+        else:
+            # The opponents only need to take the lead when the focal player holds it and wants the trick
+            wants_lead = wants_tricks and best_seat == self.focal_seat
+        moves = _ordered_moves(legal, beats_mask, wants_lead, position == number_of_players - 1, in_play, hand)
+
+        best_value = -1 if is_max_node else math.inf
+        rank_cards = 0
+        for card, equivalents in moves:
+            next_operating_color = CARD_SUIT[card] if operating_color == NO_SUIT else operating_color
+            if best_card is None or BEATS[card][best_card][next_operating_color][trump_color]:
+                next_best_card, next_best_seat = card, seat
+            else:
+                next_best_card, next_best_seat = best_card, best_seat
+            next_hands = hands[:seat] + (hand ^ CARD_BITS[card],) + hands[seat + 1:]
+            value, child_cards = self._play(next_hands, leader, position + 1, trick_mask | CARD_BITS[card], in_play,
+                                            next_best_card, next_best_seat, next_operating_color, alpha, beta,
+                                            needed)
+            # The skipped equivalent cards stand for this one, if its rank counted theirs count too
+            if child_cards & equivalents:
+                child_cards |= equivalents
+            if is_max_node:
+                if value > best_value:
+                    best_value = value
+                alpha = max(alpha, value)
+            else:
+                if value < best_value:
+                    best_value = value
+                beta = min(beta, value)
+            if alpha >= beta:
+                # The cutoff only rests on this move
+                return best_value, child_cards
+            rank_cards |= child_cards
+        return best_value, rank_cards
+
+
+def _remaining_cards(hands):
+    remaining = 0
+    for hand in hands:
+        remaining |= hand
+    return remaining
+
+
+def _contested(card, trick_mask):
+    """
+    The card as a mask if it won the trick by its rank against a card of its own suit, else 0.
+    """
+    suit = CARD_SUIT[card]
+    if suit != NO_SUIT and trick_mask & SUIT_MASKS[suit] & ~CARD_BITS[card]:
+        return CARD_BITS[card]
+    return 0
+
+
+def _build_squeeze_table():
+    """
+    SQUEEZE[in_play][hand] moves the bits of `hand` that are set in `in_play` down
+    to the ranks among `in_play` (7-bit blocks).
+    """
+    table = []
+    for in_play in range(128):
+        ranks = [bit for bit in range(7) if in_play >> bit & 1]
+        table.append([sum(1 << rank for rank, bit in enumerate(ranks) if hand >> bit & 1) for hand in range(128)])
+    return table
+
+
+SQUEEZE = _build_squeeze_table()
+
+# HIGHEST_BITS[values] lists the set bits of a 13-bit value mask from the highest down
+HIGHEST_BITS = [[bit for bit in range(12, -1, -1) if values >> bit & 1] for values in range(_VALUE_BITS + 1)]
+
+
+class _SuitRanks:
+    """
+    The cards of a position per suit, renumbered by their rank among the cards
+    still in play. Computed per suit on first use, most patterns only need a few suits.
+    """
+
+    __slots__ = ("hands", "in_play", "suits")
+
+    def __init__(self, hands, in_play):
+        self.hands = hands
+        self.in_play = in_play
+        self.suits = [None] * len(_SUIT_SHIFTS)
+
+    def ranks(self, suit):
+        """
+        Returns:
+            tuple[int, list[int]]: The number of cards of the suit in play and the
+            relative ranks of every hand in it as bits.
+        """
+        suit_ranks = self.suits[suit]
+        if suit_ranks is None:
+            shift = _SUIT_SHIFTS[suit]
+            suit_in_play = self.in_play >> shift
+            low = suit_in_play & 127
+            high = suit_in_play >> 7 & 63
+            low_count = low.bit_count()
+            squeeze_low = SQUEEZE[low]
+            squeeze_high = SQUEEZE[high]
+            suit_ranks = self.suits[suit] = (
+                low_count + high.bit_count(),
+                [squeeze_low[hand >> shift & 127] | squeeze_high[hand >> shift + 7 & 63] << low_count
+                 for hand in self.hands])
+        return suit_ranks
+
+    def pattern(self, depths):
+        """
+        The owners of the `depths[suit]` highest cards in play of every suit.
+        """
+        pattern = []
+        for suit, depth in enumerate(depths):
+            if depth:
+                length, suit_ranks = self.ranks(suit)
+                shift = length - depth
+                for rank in suit_ranks:
+                    pattern.append(rank >> shift)
+        return tuple(pattern)
+
+    def depths(self, rank_cards):
+        """
+        Per suit the number of cards in play from the highest down to the lowest card of rank_cards.
+        """
+        depths = []
+        for shift in _SUIT_SHIFTS:
+            suit_cards = rank_cards >> shift & _VALUE_BITS
+            if suit_cards:
+                lowest = suit_cards & -suit_cards
+                depths.append((self.in_play >> shift & _VALUE_BITS & ~(lowest - 1)).bit_count())
+            else:
+                depths.append(0)
+        return tuple(depths)
+
+    def depth_cards(self, depths):
+        """
+        The inverse of depths: per suit the `depth`-th highest card in play as a mask.
+        """
+        rank_cards = 0
+        for shift, depth in zip(_SUIT_SHIFTS, depths):
+            if depth:
+                rank_cards |= 1 << (shift + HIGHEST_BITS[self.in_play >> shift & _VALUE_BITS][depth - 1])
+        return rank_cards
+
+
+def _aggregate_key(hands, leader, needed):
+    """
+    The part of a position every matching entry agrees in: leader, tricks still
+    needed and per hand the number of Wizards, Jesters and cards of every suit.
+    """
+    key = [leader, needed]
+    for hand in hands:
+        key.append((hand & WIZARD_MASK).bit_count() << 19 | (hand & JESTER_MASK).bit_count() << 16
+                   | (hand & SUIT_MASKS[0]).bit_count() << 12 | (hand & SUIT_MASKS[1]).bit_count() << 8
+                   | (hand & SUIT_MASKS[2]).bit_count() << 4 | (hand & SUIT_MASKS[3]).bit_count())
+    return tuple(key)
+
+
+def _ordered_moves(legal, beats_mask, wants_lead, cheapest, in_play, hand):
+    """
+    The legal cards without equivalent duplicates, the preferred ones first, each
+    with the mask of the suit cards it stands for (0 for Wizards and Jesters).
+    With `cheapest` the lowest card that takes the lead comes first (last to play).
+    """
+    moves = []
+    others = in_play & ~hand
+    previous = None
+    if legal & WIZARD_MASK:
+        # The lowest Wizard and the lowest Jester stand for all of them
+        wizards = legal & WIZARD_MASK
+        legal &= ~wizards | (wizards & -wizards)
+    if legal & JESTER_MASK:
+        jesters = legal & JESTER_MASK
+        legal &= ~jesters | (jesters & -jesters)
+    while legal:
+        card_bit = legal & -legal
+        legal ^= card_bit
+        card = card_bit.bit_length() - 1
+        # Same suit, next higher card of this hand and nobody else holds a card in between
+        if (previous is not None and CARD_SUIT[card] == CARD_SUIT[previous] != NO_SUIT
+                and not others & (card_bit - CARD_BITS[previous + 1])):
+            previous = card
+            moves[-1][1] |= card_bit
+            continue
+        previous = card
+        moves.append([card, card_bit if CARD_SUIT[card] != NO_SUIT else 0])
+
+    taking = [move for move in moves if beats_mask >> move[0] & 1]
+    not_taking = [move for move in moves if not beats_mask >> move[0] & 1]
+
+    def value_of(move):
+        return CARD_VALUE[move[0]]
+
+    if wants_lead:
+        return sorted(taking, key=value_of, reverse=not cheapest) + sorted(not_taking, key=value_of)
+    return sorted(not_taking, key=value_of, reverse=True) + sorted(taking, key=value_of)
+
+
+def solve_round(hands, trump_color, leader, bids=None):
+    """
+    Open-hand guarantees for every player of a dealt round.
+
+    Every value is a worst case: all other players play together against the
+    player. "at_least" and "at_most" come from opposite coalitions (one holds the
+    player down, the other pushes tricks onto them), so they are no range and
+    at_most is often above at_least. A player can only be sure of their exact bid if
+    at_most <= bid <= at_least, so the bid is only searched then.
+
+    Args:
+        hands (list[int]): Bitmask of every hand in seating order.
+        trump_color (int): The trump suit (NO_SUIT for none).
+        leader (int): The seat that leads the first trick.
+        bids (list[int], optional): The bid of every seat.
+
+    Returns:
+        list[dict]: Per seat "at_least", the most tricks the player can be sure to
+        take, "at_most", the fewest tricks the player can be sure not to exceed, and
+        with bids "bid_securable", whether the player can be sure to take exactly
+        their bid.
+    """
+    results = []
+    for seat in range(len(hands)):
+        # One solver per seat, so the search for the bid reuses both guarantees' tables
+        solver = TrickSolver(hands, trump_color, seat)
+        result = {
+            "at_least": solver.solve(leader, maximize=True),
+            "at_most": solver.solve(leader, maximize=False),
+        }
+        if bids is not None:
+            bid = bids[seat]
+            result["bid_securable"] = (result["at_most"] <= bid <= result["at_least"]
+                                       and solver.can_make(leader, bid))
+        results.append(result)
+    return results
+
+
+def annotate_games(number_of_games, playerlist, seed=42, max_cards=6):
+    """
+    Plays games with the heuristic and compares every round (up to max_cards cards
+    per player) with open-hand play against a coalition of the other players.
+
+    Game g is game g of play_games with the same seed (see game_rng).
+
+    Args:
+        number_of_games (int): Number of games.
+        playerlist (list): The players in seating order.
+        seed (int): Root seed.
+        max_cards (int): Rounds with more cards per player are not solved. The search
+            grows by a factor of three to four per card: with 3 players a round of
+            8 cards takes about a second, 9 cards 3-15 seconds and 10 cards half a
+            minute to a few minutes. Rounds beyond about 10 cards, and so the full
+            20-card rounds, are out of reach.
+
+    Returns:
+        list[dict]: One row per solved round and player with the bid, the tricks made,
+        the guarantees of solve_round and whether the bid could have been secured.
+    """
+    number_of_players = len(playerlist)
+    number_of_rounds = wizard_logic.number_of_rounds_to_be_played(number_of_players)
+    ledger = ScoreLedger(1, number_of_rounds, [player.name for player in playerlist])
+    rows = []
+
+    simulation = wizard_logic.Simulation(bid_table=wizard_logic.bid_table)
+    for game in range(number_of_games):
+        simulation.rng = wizard_logic.game_rng(seed, game)
+        # Later rounds are not solved, and every game has its own stream, so they are skipped
+        for current_round in range(1, min(max_cards, number_of_rounds) + 1):
+            # The same steps as start_game, with a look at the hands before they are played
+            cards = simulation.shuffle_cards()
+            remaining_cards = wizard_logic.distribute_cards(cards, current_round, playerlist)
+            trump_color = simulation.choose_trump(remaining_cards, current_round, playerlist)
+            hands = [player.hand_mask for player in playerlist]
+            simulation.play_round(current_round, trump_color, ledger, number_of_rounds, playerlist, 0)
+
+            leader = ((current_round % number_of_players) - 1) % number_of_players
+            bids = ledger.data[0, current_round - 1, :, BID].astype(int).tolist()
+            for seat, solved in enumerate(solve_round(hands, trump_color, leader, bids)):
+                rows.append({
+                    "game": game,
+                    "round": current_round,
+                    "seat": seat,
+                    "player": playerlist[seat].name,
+                    "style": playerlist[seat].playing_style,
+                    "bid": bids[seat],
+                    "made": int(ledger.data[0, current_round - 1, seat, MADE]),
+                    "at_least": solved["at_least"],
+                    "at_most": solved["at_most"],
+                    "bid_securable": solved["bid_securable"],
+                })
+    return rows
+
+
+def gap_report(rows):
+    """
+    Summarizes annotate_games per player.
+
+    Returns:
+        pd.DataFrame: Share of bids made, share of bids that could have been secured,
+        share of rounds where a securable bid was missed (the gap to optimal play)
+        and the mean tricks made next to the mean guarantees.
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(rows)
+    df["bid_made"] = df["bid"] == df["made"]
+    df["missed_securable"] = df["bid_securable"] & ~df["bid_made"]
+    summary = df.groupby(["player", "style"]).agg(
+        rounds=("bid", "size"),
+        bid_made=("bid_made", "mean"),
+        bid_securable=("bid_securable", "mean"),
+        missed_securable=("missed_securable", "mean"),
+        made=("made", "mean"),
+        at_least=("at_least", "mean"),
+        at_most=("at_most", "mean"),
+    )
+    return summary.round(3)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the heuristic with open-hand play against a coalition.")
+    parser.add_argument("-n", "--players", type=int, default=3, help="Number of players (3-6).")
+    parser.add_argument("-g", "--games", type=int, default=20)
+    parser.add_argument("--max-cards", type=int, default=6,
+                        help="Solve the rounds up to this many cards (3 players: seconds per round up to 9 "
+                             "cards, up to a few minutes at 10; larger rounds are out of reach).")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--config", default=wizard_logic.DEFAULT_CONFIG_PATH, help="JSON file with the player profiles.")
+    parser.add_argument("-o", "--output", help="CSV file for the annotation of every round.")
+    args = parser.parse_args(argv)
+
+    playerlist = wizard_logic.load_player_from_config(args.config)[:args.players]
+    rows = annotate_games(args.games, playerlist, seed=args.seed, max_cards=args.max_cards)
+    if args.output:
+        import pandas as pd
+
+        pd.DataFrame(rows).to_csv(args.output, index=False)
+    print(gap_report(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import argparse
+import copy
+import math
+
+import numpy as np
+
+from src import wizard_logic
+from src.result_sink import CountingSink
+
+# Searched bidding parameters and their ranges; parameters with integer bounds stay integers
+TUNING_SPACE = {
+    "wizard_probability": (0.8, 1.0),
+    "jester_probability": (0.0, 0.15),
+    "trump_factor": (0.5, 1.0),
+    "early_round_limit": (2, 8),
+    "high_trump_value": (8, 12),
+    "opponent_malus": (0.5, 0.95),
+    "late_round_limit": (3, 8),
+    "low_card_value": (5, 10),
+    "rounding_offset": (0.3, 0.9),
+}
+
+
+def sample_candidates(number_of_candidates, rng, style="aggressive", space=TUNING_SPACE):
+    """
+    Draws parameter sets uniformly from the tuning space.
+
+    Args:
+        number_of_candidates (int): Number of parameter sets.
+        rng (np.random.Generator): The random number generator.
+        style (str): The style whose defaults fill the parameters outside the space.
+        space (dict): Ranges per parameter.
+
+    Returns:
+        list[dict]: Complete parameter sets (see wizard_logic.style_parameters).
+    """
+    candidates = []
+    for _ in range(number_of_candidates):
+        overrides = {}
+        for name, (low, high) in space.items():
+            if isinstance(low, int) and isinstance(high, int):
+                overrides[name] = int(rng.integers(low, high + 1))
+            else:
+                overrides[name] = round(float(rng.uniform(low, high)), 3)
+        candidates.append(wizard_logic.style_parameters(style, overrides))
+    return candidates
+
+
+def _rung_games(number_of_candidates, budget, chunk_size):
+    """
+    Games per candidate in the first rung, a multiple of chunk_size, so that all
+    rungs fit into the budget. Every rung doubles the games of the survivors and the
+    control, but the games of earlier rungs are kept, so rung r >= 1 only plays
+    first_games * 2 ** (r - 1) new games per candidate.
+
+    Raises:
+        ValueError: If the budget does not cover one chunk per unit.
+    """
+    rungs = math.ceil(math.log2(number_of_candidates)) + 1
+    units = number_of_candidates + 1
+    units += sum((math.ceil(number_of_candidates / 2 ** rung) + 1) * 2 ** (rung - 1) for rung in range(1, rungs))
+    if budget < units * chunk_size:
+        raise ValueError(f"A budget of {budget} games is too small for {number_of_candidates} candidates, "
+                         f"it needs at least {units * chunk_size} ({units} chunks of {chunk_size} games)")
+    return budget // units // chunk_size * chunk_size, rungs
+
+
+def tune(number_of_players, number_of_candidates=16, budget=20000, seed=42, workers=1, style="aggressive",
+         chunk_size=50, config_path=wizard_logic.DEFAULT_CONFIG_PATH):
+    """
+    Searches the bidding parameters of one player with successive halving.
+
+    Every rung plays all remaining candidates on the same games (common random
+    numbers: game i of every candidate is dealt from game_rng(seed, i)), keeps the
+    better half by the win rate of the tuned player and doubles their games; games
+    of earlier rungs are kept, so only the new games are played. The default
+    parameters play every rung as the control.
+
+    Args:
+        number_of_players (int): Number of players (3-6), the first players of the config.
+        number_of_candidates (int): Number of sampled parameter sets in the first rung.
+        budget (int): Upper limit of the games played in total.
+        seed (int): Root seed of the games and the candidates.
+        workers (int): Number of worker processes.
+        style (str): The style that is tuned; the first player of this style is the tuned one.
+        chunk_size (int): Number of games per chunk.
+        config_path (str): The player profiles.
+
+    Returns:
+        dict: The best parameters with their games, wins and points, the same for the
+        control, and the total number of games played.
+
+    Raises:
+        ValueError: If there is no player of the style or the budget is too small.
+    """
+    playerlist = wizard_logic.load_player_from_config(config_path)[:number_of_players]
+    seat = next((seat for seat, player in enumerate(playerlist) if player.playing_style == style), None)
+    if seat is None:
+        raise ValueError(f"No {style} player among the first {number_of_players} players of {config_path}")
+
+    default = wizard_logic.style_parameters(style)
+    candidates = [default] + sample_candidates(number_of_candidates, np.random.default_rng([seed, number_of_players]),
+                                               style)
+    sinks = [CountingSink(number_of_players) for _ in candidates]
+    first_games, rungs = _rung_games(number_of_candidates, budget, chunk_size)
+
+    alive = list(range(1, len(candidates)))
+    played = 0
+    games = 0
+    for rung in range(rungs):
+        target = first_games * 2 ** rung
+        tasks = []
+        for index in [0] + alive:
+            seating = copy.deepcopy(playerlist)
+            seating[seat].parameters = candidates[index]
+            tasks.extend((index, task) for task in
+                         wizard_logic.chunk_tasks(target - games, seating, seed, chunk_size, games // chunk_size))
+        results = wizard_logic.run_chunks((task for _, task in tasks), workers)
+        for (index, _), total_points in zip(tasks, results):
+            sinks[index].add_games(total_points)
+            played += len(total_points)
+        games = target
+
+        # Keep the better half, the win rate first and the mean points on a tie
+        alive.sort(key=lambda index: (-sinks[index].wins[seat], -sinks[index].point_sums[seat]))
+        if len(alive) == 1:
+            break
+        alive = alive[:math.ceil(len(alive) / 2)]
+
+    def summary(index):
+        sink = sinks[index]
+        return {
+            "parameters": candidates[index],
+            "games": sink.games,
+            "win_rate": sink.wins[seat] / sink.games,
+            "mean_points": sink.point_sums[seat] / sink.games,
+        }
+
+    return {
+        "players": number_of_players,
+        "player": playerlist[seat].name,
+        "best": summary(alive[0]),
+        "default": summary(0),
+        "candidates": number_of_candidates,
+        "games_played": played,
+    }
+
+
+def tuning_report(results):
+    """
+    Returns:
+        pd.DataFrame: One row per player count with the best parameters, their win
+        rate and mean points next to those of the defaults on the same games.
+    """
+    import pandas as pd
+
+    rows = []
+    for result in results:
+        row = {
+            "player": result["player"],
+            "games": result["best"]["games"],
+            "win_rate": result["best"]["win_rate"],
+            "default_win_rate": result["default"]["win_rate"],
+            "mean_points": result["best"]["mean_points"],
+            "default_mean_points": result["default"]["mean_points"],
+            "candidates": result["candidates"],
+            "games_played": result["games_played"],
+        }
+        row.update({name: result["best"]["parameters"][name] for name in TUNING_SPACE})
+        rows.append(row)
+    return pd.DataFrame(rows, index=pd.Index([result["players"] for result in results], name="players"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tune the bidding parameters of a style with successive halving.")
+    parser.add_argument("-n", "--players", type=int, nargs="+", default=[3, 4, 5, 6])
+    parser.add_argument("-c", "--candidates", type=int, default=16, help="Parameter sets in the first rung.")
+    parser.add_argument("-b", "--budget", type=int, default=20000, help="Games per player count.")
+    parser.add_argument("--style", default="aggressive")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-w", "--workers", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=50)
+    parser.add_argument("--config", default=wizard_logic.DEFAULT_CONFIG_PATH)
+    parser.add_argument("-o", "--output", help="Path of the report CSV.")
+    args = parser.parse_args(argv)
+
+    results = []
+    for number_of_players in args.players:
+        result = tune(number_of_players, args.candidates, args.budget, args.seed, args.workers, args.style,
+                      args.chunk_size, args.config)
+        print(f"{number_of_players} players: win rate {result['best']['win_rate']:.3f} "
+              f"(defaults {result['default']['win_rate']:.3f}) after {result['games_played']} games")
+        results.append(result)
+
+    report = tuning_report(results)
+    wizard_logic.export_with_metadata(report, "bidding_tuning", seed=args.seed, path=args.output)
+    print(report.T)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,227 @@
-from src.card import Card
+from __future__ import annotations
+
 from src.player import Player
+from src.score_ledger import ScoreLedger, BID, MADE, POINTS
+from src.result_sink import CountingSink
+from src.profiling import Profiler
+from src.card_tracker import CardTracker
+from src.deck import (colors, NO_SUIT, WIZARD, JESTER, DECK, CARD_SUIT, CARD_VALUE, BEATS,
+                      CARD_BITS, SUIT_MASKS, WIZARD_MASK, JESTER_MASK, BEATS_BITS)
+import copy
 import json
 import numpy as np
-import pandas as pd
 import datetime
 import math
 import os
+import time
+from collections import Counter, deque
+from typing import TYPE_CHECKING
 
-# Prevent columns from being abbreviated with "..." (AI)
-pd.set_option('display.max_columns', None)
-# Allow a very wide display in the terminal (AI)
-pd.set_option('display.width', 5000)
-# Center the headers over the data (AI)
-pd.set_option('display.colheader_justify', 'center')
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 rng = np.random.default_rng(seed=42)  # Random number generator with seed
 
-colors = ["red", "green", "blue", "yellow"]
+# Number of games each worker task simulates
+DEFAULT_CHUNK_SIZE = 100
+
+# Bump whenever a change alters the results for a given seed (invalidates cached results)
+ENGINE_VERSION = 4
+
+# Reusable buffer for shuffle_cards, so no new deck array is allocated per round
+_deck_buffer = DECK.copy()
+
+DEFAULT_CONFIG_PATH = "configs/players.json"
+
+# Playing styles that read the CardTracker of the round; rounds without them build none
+TRACKING_STYLES = frozenset({"monte_carlo"})
+
+# pandas module once _pandas() has imported it
+_pd = None
+
+# BidTable used for bidding, None to always compute the bids (see use_bid_table)
+bid_table = None
+
+# Active Profiler, None while profiling is disabled (see enable_profiling)
+profiler = None
+
+# Constants of the bidding heuristic (hand_win_probability, bid_from_probability) and
+# the trump choice, per playing style. Other styles (e.g. "monte_carlo") bid like "normal".
+DEFAULT_STYLE_PARAMETERS = {
+    "normal": {
+        "wizard_probability": 0.95,     # chance of a Wizard to win a trick
+        "jester_probability": 0.05,     # chance of a Jester to win a trick
+        "trump_factor": 0.8,            # trump chance = value / 13 * trump_factor
+        "early_round_limit": 5,         # trumps get early_trump_bonus before this round
+        "early_trump_bonus": 0.1,
+        "high_trump_value": 10,         # trumps above this value get high_trump_bonus
+        "high_trump_bonus": 0.15,
+        "opponent_malus": 0.75,         # color card chance shrinks by this factor per opponent
+        "late_round_limit": 5,          # after this round color cards below low_card_value
+        "low_card_value": 8,            # count only low_card_factor times
+        "low_card_factor": 0.5,
+        "first_round_threshold": 0.4,   # round 1: bid 1 above this chance
+        "rounding_offset": None,        # bid = floor(chance + offset), None: round half to even
+        "trump_choice": "least",        # a Wizard as trump card: "most" or "least" frequent color
+    },
+}
+DEFAULT_STYLE_PARAMETERS["aggressive"] = dict(DEFAULT_STYLE_PARAMETERS["normal"], rounding_offset=0.7,
+                                              trump_choice="most")
+
+
+def style_parameters(playing_style, overrides=None):
+    """
+    The bidding parameters of a playing style.
+
+    Args:
+        playing_style (str): The style, styles without own parameters use "normal".
+        overrides (dict, optional): Parameters that replace the defaults.
+
+    Returns:
+        dict: All parameters.
 
-winner_list = []
+    Raises:
+        ValueError: If an override is not a known parameter.
+    """
+    parameters = dict(DEFAULT_STYLE_PARAMETERS.get(playing_style, DEFAULT_STYLE_PARAMETERS["normal"]))
+    if overrides:
+        unknown = set(overrides) - set(parameters)
+        if unknown:
+            raise ValueError(f"Unknown bidding parameters: {', '.join(sorted(unknown))}")
+        parameters.update(overrides)
+    return parameters
+
+
+def _parameters_of(player):
+    """
+    The bidding parameters of a player: its own or the defaults of its style.
+    """
+    if player.parameters is not None:
+        return player.parameters
+    return DEFAULT_STYLE_PARAMETERS.get(player.playing_style, DEFAULT_STYLE_PARAMETERS["normal"])
 
-def load_player_from_config():
+def enable_profiling():
+    """
+    Starts collecting phase timings and event counts in this process and in the
+    worker processes of play_games.
+
+    Returns:
+        Profiler: The profiler that receives all measurements.
+    """
+    global profiler
+    profiler = Profiler()
+    return profiler
+
+
+def disable_profiling():
+    """
+    Stops profiling.
+
+    Returns:
+        Profiler or None: The profiler that was active.
+    """
+    global profiler
+    finished, profiler = profiler, None
+    return finished
+
+
+def use_bid_table(directory):
+    """
+    Looks up the bids in a precomputed table (see src/bid_table.py) in this process
+    and in the worker processes of play_games. Hands that are not in the table are
+    still evaluated with evaluate_cards. A table built with the default bid function
+    only repeats evaluate_cards, so the games do not look it up (see active_bid_table).
+
+    Args:
+        directory (str or None): Folder of the table, None switches the table off.
+
+    Returns:
+        BidTable or None: The loaded table.
+    """
+    global bid_table
+    if directory is None:
+        bid_table = None
+    else:
+        from src.bid_table import BidTable
+
+        bid_table = BidTable(directory)
+    return bid_table
+
+
+def active_bid_table(table):
+    """
+    Returns:
+        BidTable or None: The table if its bids differ from evaluate_cards, else None.
+    """
+    if table is None or table.reproduces_heuristic:
+        return None
+    return table
+
+
+def bid_table_directory():
+    """
+    Returns:
+        str or None: Folder of the table of use_bid_table, for the initializer of worker pools.
+    """
+    return None if bid_table is None else bid_table.directory
+
+
+def bid_table_digest():
+    """
+    Returns:
+        str or None: Content digest of the table of use_bid_table if it changes any bid,
+        for the configurations of cached and sharded runs.
+    """
+    table = active_bid_table(bid_table)
+    return None if table is None else table.digest
+
+
+def _pandas():
+    """
+    Imports pandas on first use. Simulations never build a DataFrame, so short
+    runs and worker processes don't pay for the import.
+    """
+    global _pd
+    if _pd is None:
+        import pandas
+
+        # Prevent columns from being abbreviated with "..." (AI)
+        pandas.set_option('display.max_columns', None)
+        # Allow a very wide display in the terminal (AI)
+        pandas.set_option('display.width', 5000)
+        # Center the headers over the data (AI)
+        pandas.set_option('display.colheader_justify', 'center')
+        _pd = pandas
+    return _pd
+
+
+def load_player_from_config(path=DEFAULT_CONFIG_PATH):
     """
     Loads player configurations from a JSON file and initializes Player objects.
+
+    Args:
+        path (str): The JSON file with the player profiles.
     """
     #AI
     # Open the passive text file
-    with open("configs/players.json", "r", encoding="utf-8") as f:
+    with open(path, "r", encoding="utf-8") as f:
         data = json.load(f)  # Macht aus dem Text ein Dictionary
 
+    # Optional bidding parameters per style, e.g. {"aggressive": {"rounding_offset": 0.6}}
+    styles = data.get("styles", {})
+
     # Build actual Python objects from the data
     player_objects = []
     for s in data["player"]:
         # Instantiate the Player class
         new_player = Player(s["name"], 0, [], playing_style=s["playing_style"])
+        # Optional rollout budget per move of the "monte_carlo" style
+        new_player.rollouts = s.get("rollouts")
+        # Parameters of the style in the config, then of the player itself
+        overrides = dict(styles.get(s["playing_style"], {}), **s.get("parameters", {}))
+        if overrides:
+            new_player.parameters = style_parameters(s["playing_style"], overrides)
         player_objects.append(new_player)
 
     return player_objects
@@ -43,16 +230,9 @@ def load_player_from_config():
 
 def shuffle_cards():
     """
-    Generates a full Wizard deck including Wizards and Jesters, then shuffles it.
+    Simulation.shuffle_cards on the module-wide simulation (module rng and deck buffer).
     """
-    cards = []
-    for color in colors:
-        cards.append(Card("", 14))   # wizard
-        cards.append(Card("", 0))    # jester
-        for value in range(13):
-            cards.append(Card(color, value + 1))
-    rng.shuffle(cards)
-    return cards
+    return _module_simulation.shuffle_cards()
 
 
 def number_of_rounds_to_be_played(number_of_playerss):
@@ -73,6 +253,7 @@ def create_points_table(player_names: list[str]) -> pd.DataFrame:
         player_names (list[str]): A list of player names to be used as the top-level column index.
     """
     #AI
+    pd = _pandas()
     # Create a MultiIndex (Hierarchical index) for columns: Player -> Category
     columns = pd.MultiIndex.from_product([player_names, ["announced_tricks", "tricks_made", "points"]],
                                          names=['player', 'category'])
@@ -124,17 +305,18 @@ def calculate_total_points(table: pd.DataFrame) -> pd.DataFrame:
 
 
 
-def winner_of_the_game(total_row):
+def winner_of_the_game(total_points, playerlist):
     """
     Identifies the player with the highest total points.
 
     Args:
-        total_row (pd.Series): A Series containing the final point totals for each player.
+        total_points (np.ndarray): The final point totals for each player in seating order.
+        playerlist (list): A list of Player objects in seating order.
     """
     #AI
-    winner = total_row.idxmax()
-    points = total_row.max()
-    winner_list.append(winner)
+    winner_index = int(np.argmax(total_points))  # first player wins a tie, like idxmax
+    winner = playerlist[winner_index].name
+    points = int(total_points[winner_index])
     return winner, points
 
 
@@ -149,482 +331,351 @@ def print_table(table: pd.DataFrame):
 
 
 
-def play_round(current_round, trump_color, table, number_of_rounds, playerlist):
+def play_round(current_round, trump_color, ledger, number_of_rounds, playerlist, game_index=0, sink=None,
+               trick_winners=None):
     """
-    Executes a full round of the game.
-
-    Args:
-        current_round (int): The number of the current round being played.
-        trump_color (str): The color that is trump for this round.
-        table (pd.DataFrame): The current points table to be updated.
-        number_of_rounds (int): The total number of rounds in the game.
-        playerlist (list): A list of Player objects participating in the round.
-
-    Returns:
-        pd.DataFrame: The updated points table after the round ends.
+    Simulation.play_round on the module-wide simulation (module bid table and profiler).
     """
+    return _module_simulation.play_round(current_round, trump_color, ledger, number_of_rounds, playerlist,
+                                         game_index, sink, trick_winners)
 
-    round_data = {}
-
-    #Bidding Phase
-    for player in playerlist:
-        #print("-----")
-        #print(f"player: {player.name}")
-
-        #print(f"cards on hand ({len(player.cards_in_hand)}): {player.cards_in_hand}")
-        #print("-----")
-
-
-        number_of_announced_tricks = evaluate_cards(player.cards_in_hand, trump_color, playerlist, current_round, player.playing_style)
-        #print(f" -> number of announced tricks: {number_of_announced_tricks}")
-
-        round_data[player.name] = [
-            number_of_announced_tricks, 0, 0
-        ]
-        # Preliminary save of bids so play_trick can access them
-        table = add_points(table, current_round, round_data)
-
-
-    trick_winner = []
-
-    number_of_tricks_in_round = {player.name: 0 for player in playerlist}
-
-    # Calculate who starts the round.
-    starting_player_index = (current_round % len(playerlist)) - 1
-
-    for i in range(current_round):
-        # Play individual trick
-        winner = play_trick(playerlist, starting_player_index, trump_color, current_round, table, number_of_tricks_in_round)
-
-        trick_winner.append(winner)
-        number_of_tricks_in_round[winner] += 1
-
-        # Winner of the last trick starts the next one
-        trick_winner_last_round = next(                                      #AI
-            (player for player in playerlist if player.name == winner))
-        starting_player_index = playerlist.index(trick_winner_last_round)
-
-
-    for player in playerlist:
-        # Evaluate how many tricks were actually made vs announced
-        number_of_tricks_made = number_of_made_tricks(player, trick_winner)
-        number_of_announced_tricks_alt = round_data[player.name][0]
-        round_data[player.name] = [number_of_announced_tricks_alt, number_of_tricks_made, 0]
-
-    # Calculate and save points
-    for player, data in round_data.items():
-        number_of_announced_tricks = data[0]
-        number_of_tricks_made = data[1]
-
-        # Scoring logic: 20 base points + 10 per trick if correct, else -10 per difference
-        if number_of_announced_tricks == number_of_tricks_made:
-            points = 20 + number_of_tricks_made * 10
-        else:
-            points = (abs(number_of_announced_tricks - number_of_tricks_made)) * (-10)
-
-        round_data[player] = [number_of_announced_tricks, number_of_tricks_made, points]
-
-    # Fill table and output results
-    table = add_points(table, current_round, round_data)
-    table = table.fillna(0).astype(int)
-
-    # Add total sum if it was the final round
-    if current_round == number_of_rounds:
-        table, total_points = calculate_total_points(table)
-        #print("\n FInAL SCORE OF THE GAME (incl. total) ")
-        print_table(table)
-        winner, points = winner_of_the_game(total_points)
-        #print(f" -> winner is: {winner} with {points} points.")
-    #else:
-        #print("\n-----------")
-        #print(f"RESULTS AFTER ROUND {current_round}")
-        #print("-----------")
-        #print_table(table)
 
-    return table
-
-
-def start_game(starting_round, playerlist):
+def start_game(starting_round, playerlist, ledger=None, game_index=0, sink=None):
     """
-    Main loop to control the Wizard game from a specific starting round to the end.
-
-    Args:
-        starting_round (int): The round number to begin with (usually 1).
-        playerlist (list): A list of Player objects participating in the game.
+    Simulation.start_game on the module-wide simulation (module rng, bid table and profiler).
     """
-    # Calculate the total number of rounds based on player count
-    round_number = number_of_rounds_to_be_played(len(playerlist))
-    player_names_str = [player.name for player in playerlist]
-
-    # Initialize the score tracking table
-    table = create_points_table(player_names_str)
-
-    #print("\n===========================================")
-    #print(f" START WIZARD GAME WITH {round_number} rounds")
-    #print("===========================================")
-
-    for current_round in range(starting_round, round_number + 1):
-        #print(f"\n====================== round {current_round} ======================")
-
-        # Prepare the deck for the new round
-        cards = shuffle_cards()
-
-        # Deal cards to players and determine trump color
-        remaining_cards = distribute_cards(cards, current_round, playerlist)
-        trump_color = choose_trump(remaining_cards, current_round, playerlist)
-
-        #print(f" starting player: {playerlist[current_round % len(playerlist) - 1]}")
-        #print(f" Trumpcolor: {trump_color} | {current_round} cards per player")
-
-        # Execute the trick-taking phase and update scores
-        table = play_round(current_round, trump_color, table, round_number, playerlist)
-
-
-    #print("\n Game is over.")
-
+    return _module_simulation.start_game(starting_round, playerlist, ledger, game_index, sink)
 
 
 def distribute_cards(cards, number_of_cards, playerlist):
     """
     Distributes the specified number of cards to each player from the deck.
 
+    Dealing one card at a time in turn gives every player every n-th card from
+    the top, so each hand is taken as one slice instead of popping card by card.
+
     Args:
-        cards (list): The list of Card objects currently in the deck.
+        cards (list): The card ids currently in the deck.
         number_of_cards (int): How many cards each player should receive this round.
         playerlist (list): The list of Player objects receiving the cards.
 
     Returns:
         list: The remaining cards in the deck after distribution.
     """
-    for i in range(number_of_cards):
-        for player in playerlist:
-            top_card = cards.pop(0)
-            player.cards_in_hand.append(top_card)
+    number_of_players = len(playerlist)
+    dealt = number_of_cards * number_of_players
+    for seat, player in enumerate(playerlist):
+        player.cards_in_hand.extend(cards[seat:dealt:number_of_players])
+        index_hand(player)
+    del cards[:dealt]
 
     return cards
 
-def choose_trump(remaining_cards, current_round, playerlist):
+def index_hand(player):
     """
-    Determines the trump color for the current round based on the deck's top card.
+    Builds the bitmask view of a player's hand that play_trick works with.
 
-    Args:
-        remaining_cards (list): The cards left in the deck after dealing.
-        current_round (int): The current round number (used to find the starting player).
-        playerlist (list): The list of players in the game.
+    Besides the mask, the cards are ordered by value once per round. The sorts are
+    stable, so cards of equal value keep their order in the hand, and the first card
+    of an order that is still in a mask is exactly what min()/max() with key=value
+    would pick from the hand.
 
-    Returns:
-        str or None: The trump color (e.g., 'red', 'blue'), or None if no trump exists.
+    Args:
+        player (Player): The player whose cards_in_hand were just dealt.
     """
-    if remaining_cards:
-        trump_card = remaining_cards[0]  # Reveal top card
-    else:
-        return None
-
-    if trump_card.color in colors:
-        trump_color = trump_card.color
-    # Jester case: No trump color for this round
-    elif trump_card.value == 0:
-        trump_color = None
-    # Wizard case: The starting player chooses the trump suit
-    elif trump_card.value == 14:
-        frequencies = {color: 0 for color in colors}       #AI
-        # Identify the player who gets to choose
-        starting_player = playerlist[(current_round % len(playerlist)) - 1]
+    hand = player.cards_in_hand
+    player.hand_mask = sum(CARD_BITS[card] for card in hand)
+    player.lowest_first = sorted(hand, key=CARD_VALUE.__getitem__)
+    player.highest_first = sorted(hand, key=CARD_VALUE.__getitem__, reverse=True)
 
-        # Analyze the player's hand to make a strategic choice.
-        for card in starting_player.cards_in_hand:
-            color = card.color
-            if color in colors:
-               frequencies[color] = frequencies.get(color,0) + 1   #AI
 
-        # Fallback: If no standard colors are in hand (only Wizards/Jesters)
-        if all(count == 0 for count in frequencies.values()):
-            # Select a random color to avoid logic errors
-            trump_color = rng.choice(colors)
-
-        # Logic for choosing the replacement trump suit based on playing style
-        elif starting_player.playing_style == "aggressive":
-            # Aggressive players choose their most frequent color
-            trump_color = max(frequencies, key=frequencies.get)   #AI
-
-            # Select color with lowest frequency for a defensive approach
-        else: trump_color = min(frequencies, key=frequencies.get) #AI
-
-    return trump_color
+def choose_trump(remaining_cards, current_round, playerlist):
+    """
+    Simulation.choose_trump on the module-wide simulation (module rng).
+    """
+    return _module_simulation.choose_trump(remaining_cards, current_round, playerlist)
 
 
-def evaluate_cards(cards, trump_color, playerlist, current_round, playing_style):
+def evaluate_cards(cards, trump_color, playerlist, current_round, playing_style, parameters=None):
     """
     Estimates the number of tricks a player is likely to win based on their hand.
 
     Args:
-        cards (list): List of Card objects in the player's hand.
-        trump_color (str or None): The color that is trump for this round.
+        cards (list): The card ids in the player's hand.
+        trump_color (int): The suit that is trump for this round (NO_SUIT for none).
         playerlist (list): List of all players (used to determine player count).
         current_round (int): The current round number
         playing_style (str): The AI style ("aggressive" or "normal").
+        parameters (dict, optional): Bidding parameters, defaults to those of the style.
 
     Returns:
         int: The predicted number of tricks (bidded tricks).
     """
-    number_of_players = len(playerlist)
+    if parameters is None:
+        parameters = DEFAULT_STYLE_PARAMETERS.get(playing_style, DEFAULT_STYLE_PARAMETERS["normal"])
+    total_prob = hand_win_probability(cards, trump_color, len(playerlist), current_round, parameters)
+    return bid_from_probability(total_prob, current_round, len(cards), playing_style, parameters)
+
+
+def hand_win_probability(cards, trump_color, number_of_players, current_round, parameters=None):
+    """
+    Adds up the estimated chances of every card in a hand to win a trick.
+
+    Args:
+        cards (list): The card ids in the player's hand.
+        trump_color (int): The suit that is trump for this round (NO_SUIT for none).
+        number_of_players (int): Number of players at the table.
+        current_round (int): The current round number
+        parameters (dict, optional): Bidding parameters, defaults to those of "normal"
+            (the chances are the same for every default style).
+
+    Returns:
+        float: The expected number of tricks, summed in hand order.
+    """
+    if parameters is None:
+        parameters = DEFAULT_STYLE_PARAMETERS["normal"]
+    # Read once per hand instead of once per card
+    wizard_probability = parameters["wizard_probability"]
+    jester_probability = parameters["jester_probability"]
+    trump_factor = parameters["trump_factor"]
+    early_trump_bonus = parameters["early_trump_bonus"] if current_round < parameters["early_round_limit"] else 0
+    high_trump_value = parameters["high_trump_value"]
+    high_trump_bonus = parameters["high_trump_bonus"]
+    player_malus = parameters["opponent_malus"] ** (number_of_players - 1)
+    late_round = current_round > parameters["late_round_limit"]
+    low_card_value = parameters["low_card_value"]
+    low_card_factor = parameters["low_card_factor"]
+
     #AI
     total_prob = 0
-
     for card in cards:
         prob = 0  # Probability of this specific card winning a trick
+        value = CARD_VALUE[card]
 
         # Wizards (Value 14) are highly likely to win
-        if card.value == 14:
-            prob = 0.95
+        if value == WIZARD:
+            prob = wizard_probability
 
         # Jesters (Value 0) are very unlikely to win
-        elif card.value == 0:
-            prob = 0.05
+        elif value == JESTER:
+            prob = jester_probability
 
         # Trump cards
-        elif card.color == trump_color:
+        elif CARD_SUIT[card] == trump_color:
             # Value relative to the highest possible card (13)
-            prob = (card.value / 13) * 0.8
+            prob = (value / 13) * trump_factor
 
             # In early rounds, trump cards are more powerful
-            if current_round < 5:
-                prob += 0.1
-            if card.value > 10: prob += 0.15
+            prob += early_trump_bonus
+            if value > high_trump_value: prob += high_trump_bonus
 
         # Standard color cards
         else:
             # Probability decreases as the number of players increases (risk of being trumped)
-            basis_prob = (card.value / 13)
+            basis_prob = (value / 13)
             # Risk scaling: chance of a normal card winning drops with more opponents
-            player_malus = 0.75 ** (number_of_players - 1)
             prob = basis_prob * player_malus
 
             # Low cards become less valuable in later rounds with more cards in play
-            if current_round > 5 and card.value < 8:
-                prob *= 0.5
+            if late_round and value < low_card_value:
+                prob *= low_card_factor
 
         total_prob += prob
 
+    return total_prob
+
+
+def bid_from_probability(total_prob, current_round, number_of_cards, playing_style, parameters=None):
+    """
+    Turns the expected number of tricks into a bid.
+
+    Args:
+        total_prob (float): The expected number of tricks, see hand_win_probability.
+        current_round (int): The current round number
+        number_of_cards (int): The number of cards in the hand.
+        playing_style (str): The AI style ("aggressive" or "normal").
+        parameters (dict, optional): Bidding parameters, defaults to those of the style.
 
+    Returns:
+        int: The predicted number of tricks (bidded tricks).
+    """
+    if parameters is None:
+        parameters = DEFAULT_STYLE_PARAMETERS.get(playing_style, DEFAULT_STYLE_PARAMETERS["normal"])
 
     # Special case: In round 1, ensure a bid of 1 if the card is strong enough
-    if current_round == 1 and total_prob > 0.4:
+    if current_round == 1 and total_prob > parameters["first_round_threshold"]:
         return 1
 
     # Apply personality-based bidding
-    if playing_style == "aggressive":
+    if parameters["rounding_offset"] is not None:
         # Aggressive players round up more easily (biased towards higher bids)
-        number_of_tricks = math.floor(total_prob + 0.7)
+        number_of_tricks = math.floor(total_prob + parameters["rounding_offset"])
     else:
         # Basic rounding
         number_of_tricks = round(total_prob)
 
     # Cannot bid more tricks than cards held
-    return min(number_of_tricks, len(cards))
+    return min(number_of_tricks, number_of_cards)
 
 
-def play_trick(playerlist, starting_player_index, trump_color, current_round, table, number_of_tricks_in_round):
+def play_trick(playerlist, starting_player_index, trump_color, current_round, announced_tricks, number_of_tricks_in_round,
+               tracker=None):
     """
-    Simulates a single trick where every player plays one card.
-
-    Args:
-        playerlist (list): List of all Player objects.
-        starting_player_index (int): Index of the player who leads the trick.
-        trump_color (str or None): The current trump color.
-        current_round (int): The current round number.
-        table (pd.DataFrame): The points table (used to check bids).
-        number_of_tricks_in_round (dict): Track of how many tricks each player has already won.
-
-    Returns:
-        str: The name of the player who won the trick.
+    Simulation.play_trick on the module-wide simulation (module profiler).
     """
-    trick_cards = {}
-    operating_color = ""
-    current_winning_card = None
-    winner = None
-
-    for i in range(len(playerlist)):
-        # Determine who is the current active player (handling turn rotation)
-        active_player = playerlist[(starting_player_index + i) % len(playerlist)]
-        #print(active_player)
-
-        # Retrieve bid data from the table
-        planned_tricks = table.loc[current_round, (active_player.name, 'announced_tricks')]
-
-        # Track won tricks locally to decide strategy
-        current_made_tricks = number_of_tricks_in_round[active_player.name]
+    return _module_simulation.play_trick(playerlist, starting_player_index, trump_color, current_round,
+                                         announced_tricks, number_of_tricks_in_round, tracker)
 
-        # Strategic decision: Does the player want to win this trick?
-        wants_trick = current_made_tricks < planned_tricks
-
-        # Find all valid moves based on Wizard rules
-        possible_cards = permitted_cards_for_move(active_player.cards_in_hand, operating_color)
-
-        # Select the best card to play based on strategy and game state
-        played_card = (choose_smart_card
-                         (possible_cards,
-                          current_winning_card,
-                          trick_cards,
-                          operating_color,
-                          trump_color,
-                          playerlist,
-                          wants_trick,
-                          playing_style=active_player.playing_style))
-
-        # Set the led color (operating color) if it hasn't been set yet
-        if operating_color == "" and played_card.color != "":
-            operating_color = played_card.color
-
-        # Evaluate if the newly played card takes the lead
-        if current_winning_card is None or is_stronger(played_card, current_winning_card, operating_color, trump_color):
-            current_winning_card = played_card
-            winner = active_player.name
-
-        # Remove card from hand and record it in the current tric
-        active_player.cards_in_hand.remove(played_card)
-        trick_cards[active_player.name] = played_card
 
+def choose_smart_card(cards, highest_trick_card, trick_cards, operating_color, trump_color, playerlist, wants_trick=True, playing_style="normal"):
+    """
+    Decides which card to play based on the current trick state and player strategy.
 
+    List interface of choose_smart_card_mask for callers that hold the legal cards
+    as a list, e.g. from permitted_cards_for_move.
 
-    #print(f"The trick: {trick_cards}")
-    #print(f"winner of the trick is: {winner} with {current_winning_card}")
+    Args:
+        cards (list): Valid card ids available in the player's hand.
+        highest_trick_card (int or None): The card currently leading the trick.
+        trick_cards (dict): Dictionary of cards already played in this trick {player_name: card id}.
+        operating_color (int): The suit that must be followed (NO_SUIT if none was led yet).
+        trump_color (int): The trump suit for the round (NO_SUIT for none).
+        playerlist (list): List of all players.
+        wants_trick (bool): Strategy flag; True if the player aims to win the trick.
+        playing_style (str): The AI personality ("aggressive" or "normal").
 
-    return winner
+    Returns:
+        int: The strategically chosen card to play.
+    """
+    hand = Player(None, 0, list(cards), playing_style)
+    index_hand(hand)
+    return choose_smart_card_mask(hand, hand.hand_mask, highest_trick_card, len(trick_cards),
+                                  operating_color, trump_color, len(playerlist), wants_trick)
 
 
-def choose_smart_card(cards, highest_trick_card, trick_cards, operating_color, trump_color, playerlist, wants_trick=True, playing_style="normal"):
+def choose_smart_card_mask(player, cards, highest_trick_card, number_of_cards_in_trick, operating_color,
+                           trump_color, number_of_players, wants_trick=True, tracker=None):
     """
-    Decides which card to play based on the current trick state and player strategy.
+    Decides which card to play, with the hand and the legal cards as bitmasks.
+
+    The winner/loser split and the trump, Wizard and color filters are bitwise
+    operations on precomputed masks. A "lowest" or "highest" card is the first card
+    of player.lowest_first / player.highest_first that is in the mask, which picks
+    the same card as min()/max() over the hand in its dealt order.
 
     Args:
-        cards (list): Valid cards available in the player's hand.
-        highest_trick_card (Card or None): The card currently leading the trick.
-        trick_cards (dict): Dictionary of cards already played in this trick {player_name: Card}.
-        operating_color (str): The color that must be followed (led color).
-        trump_color (str or None): The trump color for the round.
-        playerlist (list): List of all players.
+        player (Player): The active player (hand orders and playing style, see index_hand).
+        cards (int): Bitmask of the valid cards.
+        highest_trick_card (int or None): The card currently leading the trick.
+        number_of_cards_in_trick (int): How many cards were already played in this trick.
+        operating_color (int): The suit that must be followed (NO_SUIT if none was led yet).
+        trump_color (int): The trump suit for the round (NO_SUIT for none).
+        number_of_players (int): Number of players at the table.
         wants_trick (bool): Strategy flag; True if the player aims to win the trick.
-        playing_style (str): The AI personality ("aggressive" or "normal").
+        tracker (CardTracker, optional): Cards played and voids shown earlier in the round
+            (see src/card_tracker.py). Needed by the "monte_carlo" style, the other
+            styles decide from the trick alone; play_round only builds it when a
+            seat plays one of TRACKING_STYLES.
 
     Returns:
-        Card: The strategically chosen card to play.
+        int: The strategically chosen card to play.
     """
-    #AI
-    winner_cards = []
-    loser_cards = []
+    if player.playing_style == "monte_carlo" and tracker is not None:
+        # Imported here, the other styles never need NumPy rollouts
+        from src.monte_carlo import choose_card_monte_carlo
 
+        return choose_card_monte_carlo(player, cards, tracker)
+
+    #AI
     # 1. Categorize cards into those that can win the trick and those that cannot
-    for card in cards:
+    if highest_trick_card is None:
         # If the trick is empty, any card except a Jester is a potential winner
-        if highest_trick_card is None:
-            if card.value > 0:
-                winner_cards.append(card)
-            else:
-                loser_cards.append(card)
+        winner_cards = cards & ~JESTER_MASK
+    else:
         # Check against the currently leading card
-        elif is_stronger(card, highest_trick_card, operating_color, trump_color):
-            winner_cards.append(card)
-        else:
-            loser_cards.append(card)
+        winner_cards = cards & BEATS_BITS[highest_trick_card][operating_color][trump_color]
+    loser_cards = cards & ~winner_cards
+
+    lowest_first = player.lowest_first
+    highest_first = player.highest_first
 
     # 2. Apply Strategy
     if wants_trick:
         if winner_cards:
-            if playing_style == "aggressive":
+            if player.playing_style == "aggressive":
                 # AGGRESSIVE: If leading, prefer playing a high trump card
-                if not trick_cards:
-                    trump_cards = [card for card in winner_cards if card.color == trump_color]
+                if number_of_cards_in_trick == 0 and trump_color != NO_SUIT:
+                    trump_cards = winner_cards & SUIT_MASKS[trump_color]
                     if trump_cards:
-                        return max(trump_cards, key=lambda card: card.value)
+                        return _first_in_mask(highest_first, trump_cards)
                 # Otherwise, play the HIGHEST winning card to secure the trick
-                return max(winner_cards, key=lambda card: card.value)
+                return _first_in_mask(highest_first, winner_cards)
             else:
                 # NORMAL: Play the lowest possible winning card (efficiency)
-                return min(winner_cards, key=lambda card: card.value)
+                return _first_in_mask(lowest_first, winner_cards)
         else:
             # Cannot win: Discard a low card (preferably not a trump or special card)
-            normal_color_cards = [card for card in loser_cards if
-                                  card.color != trump_color and card.value not in [0, 14]]
+            normal_color_cards = loser_cards & ~SUIT_MASKS[trump_color] & ~SUIT_MASKS[NO_SUIT]
             if normal_color_cards:
-                return min(normal_color_cards, key=lambda card: card.value)
-            return min(cards, key=lambda card: card.value)
+                return _first_in_mask(lowest_first, normal_color_cards)
+            return _first_in_mask(lowest_first, cards)
 
     else:
         # Strategy: Does NOT want the trick
         if loser_cards:
             # Get rid of Wizards if they won't win (e.g., if a Wizard was already played)
-            wizards = [card for card in loser_cards if card.value == 14]
+            wizards = loser_cards & WIZARD_MASK
             if wizards:
-                return wizards[0]
+                return _first_in_mask(highest_first, wizards)
 
-            trump_cards = [card for card in loser_cards if card.color == trump_color]
-            if trump_cards:
-                # Discard the highest trump card that currently doesn't win
-                return max(trump_cards, key=lambda card: card.value)
+            if trump_color != NO_SUIT:
+                trump_cards = loser_cards & SUIT_MASKS[trump_color]
+                if trump_cards:
+                    # Discard the highest trump card that currently doesn't win
+                    return _first_in_mask(highest_first, trump_cards)
 
             # Otherwise, discard the highest losing card
-            return max(loser_cards, key=lambda card: card.value)
+            return _first_in_mask(highest_first, loser_cards)
         else:
             # Forced to win? Check if opponents are still to play
-            number_of_cards_in_trick = len(trick_cards)
-            still_players_left = number_of_cards_in_trick < (len(playerlist) - 1)
+            still_players_left = number_of_cards_in_trick < (number_of_players - 1)
 
             if still_players_left:
                 # Play low and hope someone else takes the trick
-                return min(cards, key=lambda card: card.value)
+                return _first_in_mask(lowest_first, cards)
             else:
                 # Last player and must win: Play the highest card to "clear" it
-                return max(cards, key=lambda card: card.value)
+                return _first_in_mask(highest_first, cards)
+
+
+def _first_in_mask(order, mask):
+    """
+    Returns the first card of an order whose bit is set in the mask.
+    """
+    for card in order:
+        if CARD_BITS[card] & mask:
+            return card
 
 
 def is_stronger(new_card, best_card_so_far, operating_color, trump_color):
     """
     Compares two cards to determine if the new card beats the current leader.
-    Implements official Wizard rules.
+    Implements official Wizard rules through the precomputed table in src/deck.py:
+    the first Wizard wins, Jesters never take the lead, trump beats everything else
+    and the led color beats discards.
 
     Args:
-        new_card (Card): The card being played.
-        best_card_so_far (Card): The card currently winning the trick.
-        operating_color (str): The color led in this trick.
-        trump_color (str or None): The trump color for the round.
+        new_card (int): The card being played.
+        best_card_so_far (int): The card currently winning the trick.
+        operating_color (int): The suit led in this trick (NO_SUIT if none yet).
+        trump_color (int): The trump suit for the round (NO_SUIT for none).
 
     Returns:
         bool: True if the new_card wins against the best_card_so_far.
     """
-    # 1. Wizard Rule: The first Wizard played in a trick always wins.
-    if best_card_so_far.value == 14:
-        return False
-
-    if new_card.value == 14:
-        return True
-
-    # 2. Jester Rule: A Jester (0) never beats a card already leading.
-    if new_card.value == 0:
-        return False
-
-    # 3. Trump Logic
-    # New card is trump, current leader is not
-    if new_card.color == trump_color and best_card_so_far.color != trump_color:
-        return True
-    # Both are trump: Higher value wins
-    if new_card.color == trump_color and best_card_so_far.color == trump_color:
-        return new_card.value > best_card_so_far.value
-
-    # 4. Led Color (Operating Color) Logic
-    # New card follows suit, leader is neither trump nor led color
-    if new_card.color == operating_color and best_card_so_far.color != operating_color:
-        return True
-    # Both follow suit: Higher value wins
-    if new_card.color == operating_color and best_card_so_far.color == operating_color:
-        return new_card.value > best_card_so_far.value
-
-    # 5. Default: Discards or lower values do not win
-    return False
-
-
-
-
+    if profiler is not None:
+        profiler.count("card_comparisons")
+    return BEATS[new_card][best_card_so_far][operating_color][trump_color]
 
 
 def permitted_cards_for_move(cards, operating_color):
@@ -632,29 +683,50 @@ def permitted_cards_for_move(cards, operating_color):
     Determines which cards are legally playable according to Wizard rules
 
     Args:
-        cards (list): The cards currently in the player's hand.
-        operating_color (str): The suit that was led in the current trick.
+        cards (list): The card ids currently in the player's hand.
+        operating_color (int): The suit that was led in the current trick (NO_SUIT if none).
 
     Returns:
         list: All cards that are allowed to be played.
     """
     # If no color has been led yet, all cards in hand are valid
-    if not operating_color:
+    if operating_color == NO_SUIT:
         return cards
 
     # Check if the player has any cards of the led suit.
-    operating_color_cards = [card for card in cards if card.color == operating_color]
+    operating_color_cards = [card for card in cards if CARD_SUIT[card] == operating_color]
 
     # If the player cannot follow suit, they can play any card (discarding or trumping)
     if not operating_color_cards:
         return cards
 
     # If they can follow suit, they must play either the suit or a special card
-    # Special cards are identified by having an  empty color string ""
-    permitted_cards = [card for card in cards if card.color == operating_color or card.color == ""]
+    # Special cards are identified by having no suit (NO_SUIT)
+    permitted_cards = [card for card in cards if CARD_SUIT[card] == operating_color or CARD_SUIT[card] == NO_SUIT]
     return permitted_cards
 
 
+def permitted_cards_mask(hand_mask, operating_color):
+    """
+    Bitmask version of permitted_cards_for_move.
+
+    Args:
+        hand_mask (int): Bitmask of the player's hand.
+        operating_color (int): The suit that was led in the current trick (NO_SUIT if none).
+
+    Returns:
+        int: Bitmask of the cards that are allowed to be played.
+    """
+    if operating_color == NO_SUIT:
+        return hand_mask
+
+    # Follow suit if possible, Wizards and Jesters are always allowed
+    operating_color_cards = hand_mask & SUIT_MASKS[operating_color]
+    if not operating_color_cards:
+        return hand_mask
+    return operating_color_cards | (hand_mask & SUIT_MASKS[NO_SUIT])
+
+
 
 def number_of_made_tricks(player, trick_winner):
     """
@@ -671,47 +743,690 @@ def number_of_made_tricks(player, trick_winner):
     return number_of_tricks_made
 
 
+class Simulation:
+    """
+    One independent simulation: it owns its random generator, deck buffer, players
+    (with their hands), bid table and profiler, and shares no state with other
+    simulations. Several simulations can run at the same time, e.g. on a thread pool.
+
+    The module functions (shuffle_cards, play_round, start_game, play_games, ...)
+    are thin wrappers around a module-wide simulation that uses the module rng,
+    bid_table and profiler and plays with the players it is given.
+    """
+
+    def __init__(self, playerlist=None, seed=42, bid_table=None, profiler=None):
+        """
+        Args:
+            playerlist (list, optional): The players in seating order. The simulation
+                plays with its own copies, the given players are not changed.
+            seed (int, optional): Seed of the generator for unseeded runs of play_games.
+            bid_table (BidTable, optional): Table for the bids (see src/bid_table.py).
+            profiler (Profiler, optional): Receives the measurements of this simulation.
+        """
+        self.playerlist = copy.deepcopy(playerlist) if playerlist is not None else []
+        self.rng = np.random.default_rng(seed)
+        self.deck = DECK.copy()
+        self.bid_table = bid_table
+        self.profiler = profiler
+
+    def shuffle_cards(self):
+        """
+        Shuffles the static Wizard deck including Wizards and Jesters.
+
+        The deck is reset and shuffled in place in one reusable buffer. Starting from
+        the sorted deck every time keeps the shuffles identical to shuffling a fresh copy.
+
+        Returns:
+            list: The card ids (0..59) in shuffled order, see src/deck.py for the encoding.
+        """
+        self.deck[:] = DECK
+        self.rng.shuffle(self.deck)
+        return self.deck.tolist()
+
+    def play_round(self, current_round, trump_color, ledger, number_of_rounds, playerlist, game_index=0, sink=None,
+                   trick_winners=None):
+        """
+        Executes a full round of the game.
+
+        Args:
+            current_round (int): The number of the current round being played.
+            trump_color (int): The suit index that is trump for this round (NO_SUIT for none).
+            ledger (ScoreLedger): The score ledger to be updated.
+            number_of_rounds (int): The total number of rounds in the game.
+            playerlist (list): A list of Player objects participating in the round.
+            game_index (int): The index of the current game inside the ledger.
+            sink (ResultSink, optional): Receives the final points after the last round.
+            trick_winners (list, optional): The seat of every trick winner is appended to it.
+
+        Returns:
+            ScoreLedger: The updated ledger after the round ends.
+        """
+        # View on the [announced_tricks, tricks_made, points] rows of this round
+        round_scores = ledger.data[game_index, current_round - 1]
+
+        #Bidding Phase
+        announced_tricks = []
+        table = active_bid_table(self.bid_table)
+        for player in playerlist:
+            #print("-----")
+            #print(f"player: {player.name}")
+
+            #print(f"cards on hand ({len(player.cards_in_hand)}): {player.cards_in_hand}")
+            #print("-----")
+
+
+            number_of_announced_tricks = None
+            # The table holds the bids of the default parameters
+            if table is not None and player.parameters is None:
+                # Every hand holds current_round cards, as the table expects
+                number_of_announced_tricks = table.lookup(player.hand_mask, trump_color, len(playerlist),
+                                                          player.playing_style)
+                if self.profiler is not None:
+                    self.profiler.count("bid_table_misses" if number_of_announced_tricks is None else "bid_table_hits")
+            if number_of_announced_tricks is None:
+                number_of_announced_tricks = evaluate_cards(player.cards_in_hand, trump_color, playerlist, current_round,
+                                                            player.playing_style, player.parameters)
+            #print(f" -> number of announced tricks: {number_of_announced_tricks}")
+
+            announced_tricks.append(number_of_announced_tricks)
+
+        if self.profiler is not None:
+            self.profiler.lap("bidding")
+
+        # Number of tricks each seat has won so far in this round
+        number_of_tricks_in_round = [0] * len(playerlist)
+        # Cards played and voids shown so far, only for strategies that count cards
+        tracker = None
+        if any(player.playing_style in TRACKING_STYLES for player in playerlist):
+            tracker = CardTracker(len(playerlist), trump_color, announced_tricks, number_of_tricks_in_round,
+                                  [player.playing_style for player in playerlist], stream_position(self.rng))
+
+        # Calculate who starts the round.
+        starting_player_index = (current_round % len(playerlist)) - 1
+
+        for i in range(current_round):
+            # Play individual trick, the winner of the trick starts the next one
+            starting_player_index = self.play_trick(playerlist, starting_player_index, trump_color, current_round,
+                                                    announced_tricks, number_of_tricks_in_round, tracker)
+            number_of_tricks_in_round[starting_player_index] += 1
+            if trick_winners is not None:
+                trick_winners.append(starting_player_index)
+
+        if self.profiler is not None:
+            self.profiler.lap("trick_play")
+            self.profiler.count("tricks", current_round)
+            self.profiler.count("cards_played", current_round * len(playerlist))
+
+        # Calculate and save points
+        for seat in range(len(playerlist)):
+            number_of_announced_tricks = announced_tricks[seat]
+            number_of_tricks_made = number_of_tricks_in_round[seat]
+
+            # Scoring logic: 20 base points + 10 per trick if correct, else -10 per difference
+            if number_of_announced_tricks == number_of_tricks_made:
+                points = 20 + number_of_tricks_made * 10
+            else:
+                points = (abs(number_of_announced_tricks - number_of_tricks_made)) * (-10)
+
+            round_scores[seat, BID] = number_of_announced_tricks
+            round_scores[seat, MADE] = number_of_tricks_made
+            round_scores[seat, POINTS] = points
+
+        # Report the final score if it was the final round
+        if current_round == number_of_rounds:
+            total_points = ledger.total_points(game_index)
+            if sink is not None:
+                if sink.wants_rounds:
+                    sink.add_rounds(ledger.data[game_index:game_index + 1])
+                sink.add_game(total_points.tolist())
+            #print("\n FInAL SCORE OF THE GAME (incl. total) ")
+            #print_table(ledger.to_dataframe(game_index))
+            #winner, points = winner_of_the_game(total_points, playerlist)
+            #print(f" -> winner is: {winner} with {points} points.")
+            if self.profiler is not None:
+                self.profiler.count("games")
+        #else:
+            #print("\n-----------")
+            #print(f"RESULTS AFTER ROUND {current_round}")
+            #print("-----------")
+            #print_table(ledger.to_dataframe(game_index))
+
+        if self.profiler is not None:
+            self.profiler.lap("scoring")
+            self.profiler.count("rounds")
+        return ledger
+
+    def start_game(self, starting_round, playerlist, ledger=None, game_index=0, sink=None):
+        """
+        Main loop to control the Wizard game from a specific starting round to the end.
+
+        Args:
+            starting_round (int): The round number to begin with (usually 1).
+            playerlist (list): A list of Player objects participating in the game.
+            ledger (ScoreLedger, optional): The ledger to write the scores into.
+                A ledger for a single game is created if none is given.
+            game_index (int): The index of this game inside the ledger.
+            sink (ResultSink, optional): Receives the final points of the game.
+
+        Returns:
+            ScoreLedger: The ledger holding the scores of the game.
+        """
+        # Calculate the total number of rounds based on player count
+        round_number = number_of_rounds_to_be_played(len(playerlist))
+
+        # Initialize the score tracking ledger
+        if ledger is None:
+            ledger = ScoreLedger(1, round_number, [player.name for player in playerlist])
+            game_index = 0
+
+        #print("\n===========================================")
+        #print(f" START WIZARD GAME WITH {round_number} rounds")
+        #print("===========================================")
+
+        for current_round in range(starting_round, round_number + 1):
+            #print(f"\n====================== round {current_round} ======================")
+
+            if self.profiler is not None:
+                self.profiler.start()
+
+            # Prepare the deck for the new round
+            cards = self.shuffle_cards()
+            if self.profiler is not None:
+                self.profiler.lap("shuffle")
+
+            # Deal cards to players and determine trump color
+            remaining_cards = distribute_cards(cards, current_round, playerlist)
+            if self.profiler is not None:
+                self.profiler.lap("deal")
+            trump_color = self.choose_trump(remaining_cards, current_round, playerlist)
+            if self.profiler is not None:
+                self.profiler.lap("trump")
+
+            #print(f" starting player: {playerlist[current_round % len(playerlist) - 1]}")
+            #print(f" Trumpcolor: {trump_color} | {current_round} cards per player")
+
+            # Execute the trick-taking phase and update scores
+            ledger = self.play_round(current_round, trump_color, ledger, round_number, playerlist, game_index, sink)
+
+
+        #print("\n Game is over.")
+        return ledger
+
+    def choose_trump(self, remaining_cards, current_round, playerlist):
+        """
+        Determines the trump color for the current round based on the deck's top card.
+
+        Args:
+            remaining_cards (list): The cards left in the deck after dealing.
+            current_round (int): The current round number (used to find the starting player).
+            playerlist (list): The list of players in the game.
+
+        Returns:
+            int: The trump suit index (see colors), or NO_SUIT if no trump exists.
+        """
+        if remaining_cards:
+            trump_card = remaining_cards[0]  # Reveal top card
+        else:
+            return NO_SUIT
+
+        if CARD_SUIT[trump_card] != NO_SUIT:
+            trump_color = CARD_SUIT[trump_card]
+        # Jester case: No trump color for this round
+        elif CARD_VALUE[trump_card] == JESTER:
+            trump_color = NO_SUIT
+        # Wizard case: The starting player chooses the trump suit
+        else:
+            if self.profiler is not None:
+                self.profiler.count("wizard_trump_choices")
+            frequencies = [0] * len(colors)
+            # Identify the player who gets to choose
+            starting_player = playerlist[(current_round % len(playerlist)) - 1]
+
+            # Analyze the player's hand to make a strategic choice.
+            for card in starting_player.cards_in_hand:
+                suit = CARD_SUIT[card]
+                if suit != NO_SUIT:
+                   frequencies[suit] += 1
+
+            # Fallback: If no standard colors are in hand (only Wizards/Jesters)
+            if not any(frequencies):
+                # Select a random color to avoid logic errors
+                if self.profiler is not None:
+                    self.profiler.count("random_trump_choices")
+                trump_color = int(self.rng.choice(len(colors)))
+
+            # Logic for choosing the replacement trump suit based on playing style
+            elif _parameters_of(starting_player)["trump_choice"] == "most":
+                # Aggressive players choose their most frequent color (first one on a tie)
+                trump_color = frequencies.index(max(frequencies))
+
+                # Select color with lowest frequency for a defensive approach
+            else: trump_color = frequencies.index(min(frequencies))
+
+        return trump_color
+
+    def play_trick(self, playerlist, starting_player_index, trump_color, current_round, announced_tricks,
+                   number_of_tricks_in_round, tracker=None):
+        """
+        Simulates a single trick where every player plays one card.
+
+        Args:
+            playerlist (list): List of all Player objects.
+            starting_player_index (int): Index of the player who leads the trick.
+            trump_color (int): The current trump suit (NO_SUIT for none).
+            current_round (int): The current round number.
+            announced_tricks (list): The bid of every player in seating order.
+            number_of_tricks_in_round (list): Track of how many tricks each seat has already won.
+            tracker (CardTracker, optional): Memory of the round, gets every played card.
+
+        Returns:
+            int: The seat index of the player who won the trick.
+        """
+        operating_color = NO_SUIT
+        current_winning_card = None
+        winner = None
+        number_of_players = len(playerlist)
+        if tracker is not None:
+            tracker.start_trick(starting_player_index % number_of_players)
+
+        for i in range(number_of_players):
+            # Determine who is the current active player (handling turn rotation)
+            seat = (starting_player_index + i) % number_of_players
+            active_player = playerlist[seat]
+            #print(active_player)
+
+            # Strategic decision: Does the player want to win this trick?
+            wants_trick = number_of_tricks_in_round[seat] < announced_tricks[seat]
+
+            # Find all valid moves based on Wizard rules
+            permitted_mask = permitted_cards_mask(active_player.hand_mask, operating_color)
+            if (self.profiler is not None and current_winning_card is not None
+                    and not (tracker is not None and active_player.playing_style == "monte_carlo")):
+                # The fixed rules look up the cards that beat the leading card once (BEATS_BITS);
+                # the lookups of Monte Carlo rollouts are not counted
+                self.profiler.count("card_comparisons")
+
+            # Select the best card to play based on strategy and game state
+            played_card = choose_smart_card_mask(active_player, permitted_mask, current_winning_card, i,
+                                                 operating_color, trump_color, number_of_players, wants_trick,
+                                                 tracker)
+            if tracker is not None:
+                tracker.record(seat, played_card, operating_color)
+
+            # Set the led color (operating color) if it hasn't been set yet
+            if operating_color == NO_SUIT:
+                operating_color = CARD_SUIT[played_card]
+
+            # Evaluate if the newly played card takes the lead (same lookup as is_stronger)
+            if current_winning_card is None or BEATS[played_card][current_winning_card][operating_color][trump_color]:
+                current_winning_card = played_card
+                winner = seat
+
+            # Remove card from hand
+            active_player.hand_mask ^= CARD_BITS[played_card]
+            active_player.cards_in_hand.remove(played_card)
+
+
+
+        if self.profiler is not None:
+            # One BEATS lookup per card after the first decides the trick winner
+            self.profiler.count("card_comparisons", number_of_players - 1)
+
+        #print(f"winner of the trick is: {winner} with {current_winning_card}")
+
+        return winner
+
+    def play_games(self, number_of_games, playerlist=None, workers=1, seed=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                   sink=None, shard=None):
+        """
+        Runs a simulation of multiple complete Wizard games.
+
+        Without a seed the games are played one after another on the generator of the simulation.
+        With a seed every game plays on its own stream game_rng(seed, game_index) and the
+        games are split into chunks that can run in separate processes. The result then
+        only depends on the seed, no matter how many workers or which chunk size are used.
+
+        The final points of every game go to the result sink, so the memory use does not
+        grow with the number of games.
+
+        With a shard (i, k) only the i-th of k disjoint slices of the games is played
+        (see shard_chunks), e.g. one slice per machine; the merged shards give the same
+        counts as the whole run.
+
+        Args:
+            number_of_games (int): How many full games should be simulated.
+            playerlist (list, optional): The players participating, defaults to the players of the simulation.
+                The games are played with copies, the given players are not changed.
+            workers (int): Number of worker processes. More than one enables the process pool.
+            seed (int or list[int], optional): Root seed (entropy of the SeedSequence) for the chunked mode.
+            chunk_size (int): Number of games per chunk in the chunked mode.
+            sink (ResultSink, optional): Receives the results. Defaults to a new CountingSink.
+            shard (tuple[int, int], optional): (i, k) plays only shard i (0 <= i < k) of k.
+
+        Returns:
+            ResultSink: The sink holding the results of this run.
+            """
+        # Own copies, so simulations that are given the same players never share their hands
+        playerlist = self.playerlist if playerlist is None else copy.deepcopy(playerlist)
+        if sink is None:
+            sink = CountingSink(len(playerlist))
+
+        if workers <= 1 and seed is None and shard is None:
+            # One single-game ledger is reused for every game
+            ledger = ScoreLedger(1, number_of_rounds_to_be_played(len(playerlist)),
+                                 [player.name for player in playerlist])
+            for i in range (number_of_games):
+                self.start_game(1, playerlist, ledger, 0, sink)
+            return sink
+
+        if seed is None:
+            seed = 42
+
+        first_chunk = 0
+        if shard is not None:
+            first_chunk, number_of_games = shard_chunks(number_of_games, shard, chunk_size)
+
+        # Merge the compact chunk results in chunk order
+        tasks = chunk_tasks(number_of_games, playerlist, seed, chunk_size, first_chunk)
+        if sink.wants_rounds:
+            # The sink also looks at every round, so the chunks send back their whole ledger
+            for data in self.run_chunks(tasks, workers, rounds=True):
+                sink.add_rounds(data)
+                sink.add_games(data[:, :, :, POINTS].sum(axis=1))
+            return sink
+        for total_points in self.run_chunks(tasks, workers):
+            sink.add_games(total_points)
+
+        return sink
+
+    def run_chunks(self, tasks, workers=1, rounds=False):
+        """
+        Plays chunk tasks, on a process pool if workers > 1, and yields their results in order.
+
+        Args:
+            tasks (iterable): Tasks as produced by chunk_tasks.
+            workers (int): Number of worker processes.
+            rounds (bool): Yield the whole (games, rounds, players, 3) ledger array of
+                every chunk instead of the final points.
+
+        Returns:
+            generator: The (games, players) final points of every chunk.
+        """
+        if workers > 1:
+            # Imported here, serial runs and the workers themselves never need them
+            from concurrent.futures import ProcessPoolExecutor
+            from functools import partial
+
+            bid_table_directory = None if self.bid_table is None else self.bid_table.directory
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(bid_table_directory,)) as executor:
+                if self.profiler is None:
+                    yield from _ordered_results(executor, partial(_play_chunk, rounds=rounds), tasks, 4 * workers)
+                else:
+                    # Workers profile on their own and send their measurements back
+                    function = partial(_play_chunk_profiled, rounds=rounds)
+                    for result, measurements in _ordered_results(executor, function, tasks, 4 * workers):
+                        self.profiler.merge(measurements)
+                        yield result
+            return
+
+        # Run the chunks in this process, but leave the generator of the simulation untouched
+        saved_rng = self.rng
+        try:
+            for task in tasks:
+                result = self.play_chunk(task, rounds)
+                self.rng = saved_rng
+                yield result
+        finally:
+            self.rng = saved_rng
+
+    def play_chunk(self, task, rounds=False):
+        """
+        Plays one chunk of games, each on its own random stream.
+
+        Args:
+            task (tuple): (number_of_games, seed, first_game, playerlist)
+            rounds (bool): Return the whole ledger array instead of the final points.
+
+        Returns:
+            np.ndarray: The (games, players) final points of the chunk, or with rounds
+            its (games, rounds, players, 3) ledger array.
+        """
+        number_of_games, seed, first_game, playerlist = task
+        playerlist = copy.deepcopy(playerlist)
+
+        ledger = ScoreLedger(number_of_games, number_of_rounds_to_be_played(len(playerlist)),
+                             [player.name for player in playerlist])
+        for i in range(number_of_games):
+            self.rng = game_rng(seed, first_game + i)
+            self.start_game(1, playerlist, ledger, i)
+
+        return ledger.data if rounds else ledger.all_total_points()
+
+
+class _ModuleSimulation(Simulation):
+    """
+    The simulation behind the module functions: its generator, bid table and
+    profiler are the module globals rng, bid_table and profiler, so code that sets
+    them (e.g. enable_profiling) keeps working.
+    """
+
+    def __init__(self):
+        self.playerlist = []
+        self.deck = _deck_buffer
+
+    @property
+    def rng(self):
+        return rng
+
+    @rng.setter
+    def rng(self, generator):
+        global rng
+        rng = generator
+
+    @property
+    def bid_table(self):
+        return bid_table
+
+    @property
+    def profiler(self):
+        return profiler
+
+
+_module_simulation = _ModuleSimulation()
+
+
+def game_rng(seed, game_index):
+    """
+    The random stream of a single game of a seeded run.
+
+    A counter-based Philox generator: the key is derived from the root seed and the
+    game index is the start of its counter, so the stream of any game is available in
+    O(1) without playing the games before it.
+
+    Args:
+        seed (int or list[int]): Root seed (entropy of a SeedSequence).
+        game_index (int): Index of the game in the run.
+
+    Returns:
+        np.random.Generator: The generator of this game.
+    """
+    key = np.random.SeedSequence(seed).generate_state(2, np.uint64)
+    # The game index sits in the highest counter word, every game has 2**192 draws to itself
+    return np.random.Generator(np.random.Philox(counter=[0, 0, 0, game_index], key=key))
+
+
+def stream_position(generator):
+    """
+    The position of a random stream, read without drawing from it.
+
+    With game_rng it holds the key of the root seed and the counter of the game, so it
+    differs between runs, games and rounds, but it is the same when a game is replayed.
+
+    Args:
+        generator (np.random.Generator): The generator of the game.
+
+    Returns:
+        list[int]: The words of the bit generator state.
+    """
+    state = generator.bit_generator.state["state"]
+    return [int(word) for value in state.values() for word in np.atleast_1d(value)]
+
+
+def replay_game(game_index, playerlist, seed=42):
+    """
+    Plays a single game of a seeded run again, e.g. game 734512 of play_games(..., seed=seed).
+
+    Args:
+        game_index (int): Index of the game in the run.
+        playerlist (list): The players in the same seating order as in the run.
+        seed (int or list[int]): Root seed of the run.
+
+    Returns:
+        ScoreLedger: The ledger of the game.
+    """
+    simulation = Simulation(bid_table=bid_table, profiler=profiler)
+    simulation.rng = game_rng(seed, game_index)
+    return simulation.start_game(1, playerlist)
+
+
+def play_games(number_of_games, playerlist, workers=1, seed=None, chunk_size=DEFAULT_CHUNK_SIZE, sink=None,
+               shard=None):
+    """
+    Simulation.play_games on the module-wide simulation: without a seed the games
+    play on the module rng, and the players of playerlist are used directly.
+    """
+    return _module_simulation.play_games(number_of_games, playerlist, workers, seed, chunk_size, sink, shard)
 
 
-def play_games(number_of_games, playerlist):
+def chunk_tasks(number_of_games, playerlist, seed, chunk_size=DEFAULT_CHUNK_SIZE, first_chunk=0):
     """
-    Runs a simulation of multiple complete Wizard games.
+    Splits games into chunks of consecutive game indices.
+
+    Every game plays on game_rng(seed, game_index), so any range of chunks can be
+    played separately and still gives the same games.
 
     Args:
-        number_of_games (int): How many full games should be simulated.
+        number_of_games (int): Number of games, starting at the first chunk.
         playerlist (list): The list of players participating in the simulation.
-        """
-    for i in range (number_of_games):
-        start_game(1, playerlist)
+        seed (int or list[int]): Root seed (entropy of the SeedSequence).
+        chunk_size (int): Number of games per chunk.
+        first_chunk (int): Index of the first chunk.
+
+    Returns:
+        generator: (number_of_games, seed, first_game, playerlist) tasks for _play_chunk.
+    """
+    for chunk in range(math.ceil(number_of_games / chunk_size)):
+        games = min(chunk_size, number_of_games - chunk * chunk_size)
+        yield games, seed, (first_chunk + chunk) * chunk_size, playerlist
+
+
+def shard_chunks(number_of_games, shard, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    The slice of a run that belongs to one shard: shard i of k gets the i-th of k
+    contiguous, nearly equal blocks of chunks.
+
+    Args:
+        number_of_games (int): Number of games of the whole run.
+        shard (tuple[int, int]): (i, k) with 0 <= i < k.
+        chunk_size (int): Number of games per chunk.
+
+    Returns:
+        tuple: (first_chunk, number_of_games) of the shard, as chunk_tasks expects them.
+    """
+    index, count = shard
+    if not 0 <= index < count:
+        raise ValueError(f"Invalid shard {index}/{count}, expected 0 <= i < k")
+    number_of_chunks = math.ceil(number_of_games / chunk_size)
+    first_chunk = index * number_of_chunks // count
+    last_chunk = (index + 1) * number_of_chunks // count
+    first_game = first_chunk * chunk_size
+    return first_chunk, min(last_chunk * chunk_size, number_of_games) - first_game
+
+
+def run_chunks(tasks, workers=1, rounds=False):
+    """
+    Simulation.run_chunks on the module-wide simulation (module bid table and profiler).
+    """
+    return _module_simulation.run_chunks(tasks, workers, rounds)
+
+
+def _init_worker(bid_table_directory):
+    """
+    Sets up a worker process like its parent (it may not have inherited the state).
+    """
+    use_bid_table(bid_table_directory)
+
+
+def _ordered_results(executor, function, tasks, max_pending):
+    """
+    Like executor.map, but only keeps a bounded number of tasks in flight,
+    so very long runs don't queue millions of futures at once.
+    """
+    pending = deque()
+    for task in tasks:
+        pending.append(executor.submit(function, task))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _play_chunk(task, rounds=False):
+    """
+    Simulation.play_chunk on the module-wide simulation (runs inside a worker process).
+    """
+    return _module_simulation.play_chunk(task, rounds)
+
+
+def _play_chunk_profiled(task, rounds=False):
+    """
+    Like _play_chunk, but also returns the profile of the chunk (runs inside a worker process).
+
+    Returns:
+        tuple: The (games, players) final points and the Profiler.to_dict() measurements.
+    """
+    enable_profiling()
+    try:
+        return _play_chunk(task, rounds), profiler.to_dict()
+    finally:
+        disable_profiling()
 
 
-def winning_probabilities(winner_list, number_of_games, playerlist):
+def winning_probabilities(results, number_of_games, playerlist, seed=42, path=None):
     """
     Calculates the win rate for each player and exports the results.
 
     Args:
-        winner_list (list): List containing the names of the winners of all simulated games.
+        results (CountingSink or list): The counts returned by play_games, or a list
+            containing the names of the winners of all simulated games.
         number_of_games (int): Total number of games played.
         playerlist (list): List of all participating players.
+        seed (int or list[int], optional): The seed written into the report header.
+        path (str, optional): Where the report is saved, defaults to reports/last_simulation.csv.
 
     Returns:
         pd.DataFrame: A DataFrame showing win rates as formatted percentages.
     """
-    probabilities = {player.name: winner_list.count(player.name) / number_of_games for player in playerlist}
+    if isinstance(results, CountingSink):
+        wins = dict(zip((player.name for player in playerlist), results.wins))
+    else:
+        wins = Counter(results)
+    probabilities = {player.name: wins.get(player.name, 0) / number_of_games for player in playerlist}
 
-    df = pd.DataFrame(probabilities, index=["winningchance"])
+    df = _pandas().DataFrame(probabilities, index=["winningchance"])
 
     # Convert values to formatted percentage strings for console display
     df_percent= df.map(lambda x: f"{x * 100:.1f}%")
 
     # Export results to CSV with simulation metadata.
-    export_with_metadata(df_percent, "last_simulation", seed=42)
+    export_with_metadata(df_percent, "last_simulation", seed=seed, path=path)
 
     return df_percent
 
 
 
-def export_with_metadata(df, filename, seed=42):
+def export_with_metadata(df, filename, seed=42, path=None):
     """
     Saves a DataFrame to a CSV file in the 'reports' folder with a custom metadata header.
 
@@ -719,9 +1434,17 @@ def export_with_metadata(df, filename, seed=42):
         df (pd.DataFrame): The data to be saved.
         filename (str): The desired filename (without extension).
         seed (int): The random seed used for the simulation to ensure reproducibility.
+        path (str, optional): Full path of the CSV file, replaces reports/{filename}.csv.
     """
+    start_time = time.perf_counter()
+
+    if path is None:
+        path = f"reports/{filename}.csv"
+
     # Create the reports directory if it does not exist
-    os.makedirs("reports", exist_ok=True) #erstelltOrdner reports falls er fehlt
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True) #erstelltOrdner reports falls er fehlt
 
     # Creates the fitting timestamp
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -735,11 +1458,12 @@ def export_with_metadata(df, filename, seed=42):
         "#"
     ]
 
-    path = f"reports/{filename}.csv"
-
     # Write the header first, then append the DataFrame as CSV
     with open(path, 'w', encoding='utf-8') as f:
         f.write("\n".join(header) + "\n")
         df.to_csv(f, index=True)
 
+    if profiler is not None:
+        profiler.add_time("export", time.perf_counter() - start_time)
+
     print(f" Results successfully saved under: {path}")
\ No newline at end of file
@@ -0,0 +1,73 @@
+import copy
+
+import numpy as np
+import pytest
+
+from src import wizard_logic
+from src.batch_engine import engine_equivalence, play_round_batch, shuffle_cards_batch, SUIT, VALUE
+from src.deck import NO_SUIT, WIZARD, DECK_SIZE
+
+
+# Games per engine of the equivalence test, and the p-value below which the engines count as different.
+# The seed is fixed, so the test is deterministic; the threshold only decides how far off a result may be.
+EQUIVALENCE_GAMES = 2000
+MIN_P_VALUE = 0.01
+
+
+class _DeckSimulation(wizard_logic.Simulation):
+    """
+    Simulation that plays given decks instead of shuffling, one per round.
+    """
+
+    def __init__(self, decks):
+        super().__init__()
+        self.decks = iter(decks)
+
+    def shuffle_cards(self):
+        return list(next(self.decks))
+
+
+def _needs_random_trump(deck, current_round, number_of_players):
+    """
+    True if the trump card is a Wizard and the starting player holds no colored card,
+    the only case in which the engines draw a random trump (from different streams).
+    """
+    dealt = current_round * number_of_players
+    if dealt >= DECK_SIZE or VALUE[deck[dealt]] != WIZARD:
+        return False
+    starting_player = ((current_round % number_of_players) - 1) % number_of_players
+    hand = deck[starting_player:dealt:number_of_players]
+    return bool((SUIT[hand] == NO_SUIT).all())
+
+
+@pytest.mark.parametrize("number_of_players", [3, 4, 5, 6])
+def test_engines_agree_in_distribution(number_of_players):
+    playerlist = wizard_logic.load_player_from_config()[:number_of_players]
+    result = engine_equivalence(EQUIVALENCE_GAMES, playerlist, seed=2024)
+    assert result["p_value"] > MIN_P_VALUE, result
+
+
+@pytest.mark.parametrize("number_of_players", [3, 4, 5, 6])
+def test_engines_play_the_same_decks_alike(number_of_players):
+    playerlist = wizard_logic.load_player_from_config()[:number_of_players]
+    aggressive = np.array([player.playing_style == "aggressive" for player in playerlist])
+    number_of_games = 200
+    number_of_rounds = wizard_logic.number_of_rounds_to_be_played(number_of_players)
+    rng = np.random.default_rng(number_of_players)
+    decks = [shuffle_cards_batch(number_of_games, rng) for _ in range(number_of_rounds)]
+
+    batch_points = np.zeros((number_of_games, number_of_players), dtype=np.int64)
+    for current_round, round_decks in enumerate(decks, start=1):
+        batch_points += play_round_batch(round_decks, current_round, aggressive, rng)
+
+    compared = 0
+    for game in range(number_of_games):
+        game_decks = [round_decks[game] for round_decks in decks]
+        if any(_needs_random_trump(deck, current_round, number_of_players)
+               for current_round, deck in enumerate(game_decks, start=1)):
+            continue
+        simulation = _DeckSimulation(game_decks)
+        ledger = simulation.start_game(1, copy.deepcopy(playerlist))
+        assert list(ledger.total_points(0)) == batch_points[game].tolist(), f"game {game}"
+        compared += 1
+    assert compared > number_of_games * 0.9